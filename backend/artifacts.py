@@ -0,0 +1,111 @@
+import io
+from collections.abc import Mapping
+from contextlib import contextmanager
+import numpy as np
+
+# Type MIME des matrices stockées dans GridFS (format .npz compressé)
+ARRAY_CONTENT_TYPE = "application/x-npz"
+
+
+@contextmanager
+def upload_stream(fs, filename, content_type=None, **kwargs):
+    """
+    Ouvre un fichier GridFS en écriture, rempli par blocs.
+
+    Chaque bloc (chunk_size, 255 Ko par défaut) est envoyé à MongoDB dès
+    qu'il est complet : le contenu n'est jamais entièrement en mémoire.
+    En cas d'erreur pendant l'écriture, les blocs déjà envoyés sont
+    supprimés.
+
+    Yields:
+        GridIn: Le fichier à remplir (write) ; son identifiant est GridIn._id
+    """
+    target = fs.new_file(filename=filename, content_type=content_type, **kwargs)
+    try:
+        yield target
+    except BaseException:
+        target.abort()
+        raise
+    target.close()
+
+
+def save_array(fs, array, filename):
+    """
+    Stocke une matrice NumPy compressée dans GridFS.
+
+    Args:
+        fs: L'instance GridFS
+        array: La matrice à stocker (DataFrame, Series, liste ou ndarray)
+        filename: Le nom du fichier GridFS
+
+    Returns:
+        ObjectId: L'identifiant du fichier GridFS
+    """
+    if hasattr(array, "to_numpy"):
+        array = array.to_numpy()
+    buffer = io.BytesIO()
+    np.savez_compressed(buffer, data=np.asarray(array))
+    buffer.seek(0)
+    return fs.put(buffer, filename=filename, content_type=ARRAY_CONTENT_TYPE)
+
+
+def load_array(fs, file_id):
+    """Charge une matrice stockée par save_array."""
+    buffer = io.BytesIO(fs.get(file_id).read())
+    # allow_pickle : les colonnes non numériques sont stockées en dtype object
+    with np.load(buffer, allow_pickle=True) as archive:
+        return archive["data"]
+
+
+def save_arrays(fs, arrays, prefix):
+    """Stocke plusieurs matrices et retourne leurs références {nom: file_id}."""
+    return {
+        name: save_array(fs, array, f"{prefix}_{name}.npz")
+        for name, array in arrays.items()
+        if array is not None
+    }
+
+
+def delete_arrays(fs, train_parameters):
+    """Supprime de GridFS les matrices référencées par des train_parameters."""
+    if not train_parameters:
+        return
+    for file_id in train_parameters.get("arrays", {}).values():
+        try:
+            fs.delete(file_id)
+        except Exception as e:
+            print(f"Erreur lors de la suppression de la matrice {file_id}: {str(e)}")
+
+
+class LazyArrays(Mapping):
+    """
+    Vue en lecture seule sur les train_parameters d'un projet.
+
+    Les matrices référencées dans train_parameters["arrays"] ne sont lues
+    dans GridFS qu'au premier accès, puis conservées pour la requête.
+    Les anciens projets, dont les matrices sont stockées en listes dans le
+    document, restent lisibles de la même façon.
+    """
+
+    def __init__(self, fs, train_parameters):
+        self._fs = fs
+        self._params = train_parameters or {}
+        self._refs = self._params.get("arrays", {})
+        self._loaded = {}
+
+    def __getitem__(self, key):
+        if key in self._refs:
+            if key not in self._loaded:
+                self._loaded[key] = load_array(self._fs, self._refs[key])
+            return self._loaded[key]
+        return self._params[key]
+
+    def __iter__(self):
+        yield from self._params
+        yield from (key for key in self._refs if key not in self._params)
+
+    def __len__(self):
+        return len(set(self._params) | set(self._refs))
+
+    def __contains__(self, key):
+        return key in self._refs or key in self._params
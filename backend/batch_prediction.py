@@ -0,0 +1,55 @@
+import io
+import pandas as pd
+import unsupervised_models
+
+
+def expected_columns(params, learning_type):
+    """Colonnes brutes attendues par le modèle, dans l'ordre de l'entraînement."""
+    if learning_type == "supervised":
+        # Anciens modèles sans prétraitement sérialisé : colonnes d'entraînement
+        return list(params.get("input_columns") or params.get("X_train_columns") or [])
+    return list(params.get("X_columns") or [])
+
+
+def predict_chunk(model, chunk, learning_type, params):
+    """
+    Prédit un bloc de lignes avec le modèle d'un projet.
+
+    Args:
+        model: Le modèle entraîné
+        chunk: Le DataFrame du bloc, projeté sur les colonnes attendues
+        learning_type: "supervised" ou "unsupervised"
+        params: Les train_parameters du projet (LazyArrays)
+
+    Returns:
+        array: Les prédictions du bloc
+    """
+    # Le prétraitement ajusté à l'entraînement est appliqué par le modèle lui-même
+    if learning_type == "unsupervised":
+        return unsupervised_models.predict_cluster(
+            model, chunk, params=params
+        )
+    return model.predict(chunk)
+
+
+def stream_predictions(model, chunks, learning_type, params):
+    """
+    Génère la réponse CSV d'une prédiction par lots, un bloc à la fois.
+
+    Seul le bloc courant est gardé en mémoire, quelle que soit la taille
+    du fichier d'entrée.
+
+    Yields:
+        str: L'en-tête puis les prédictions de chaque bloc au format CSV
+    """
+    yield "row,prediction\n"
+    offset = 0
+    for chunk in chunks:
+        predictions = predict_chunk(model, chunk, learning_type, params)
+        out = pd.DataFrame(
+            {"row": range(offset, offset + len(chunk)), "prediction": predictions}
+        )
+        buffer = io.StringIO()
+        out.to_csv(buffer, header=False, index=False)
+        offset += len(chunk)
+        yield buffer.getvalue()
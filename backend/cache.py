@@ -0,0 +1,67 @@
+import threading
+from collections import OrderedDict
+
+
+class LRUCache:
+    """Cache LRU borné par un budget mémoire, partagé par tout le processus.
+
+    Args:
+        max_bytes: Budget mémoire total (en octets) des entrées conservées
+        sizeof: Fonction retournant la taille (en octets) d'une valeur
+    """
+
+    def __init__(self, max_bytes, sizeof):
+        self.max_bytes = max_bytes
+        self.sizeof = sizeof
+        self.current_bytes = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            if key not in self._entries:
+                return default
+            # Marquer l'entrée comme la plus récemment utilisée
+            self._entries.move_to_end(key)
+            return self._entries[key][0]
+
+    def put(self, key, value):
+        size = self.sizeof(value)
+        with self._lock:
+            self._pop(key)
+            # Une valeur plus grande que le budget n'est jamais conservée
+            if size > self.max_bytes:
+                return
+            self._entries[key] = (value, size)
+            self.current_bytes += size
+            # Éviction des entrées les moins récemment utilisées
+            while self.current_bytes > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._pop(oldest)
+
+    def invalidate(self, key):
+        with self._lock:
+            self._pop(key)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.current_bytes = 0
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._entries
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
+
+    def _pop(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.current_bytes -= entry[1]
+
+
+def dataframe_nbytes(df):
+    """Taille mémoire réelle d'un DataFrame (chaînes comprises)."""
+    return int(df.memory_usage(deep=True).sum())
@@ -0,0 +1,200 @@
+import hashlib
+from datetime import datetime, timedelta
+from bson.binary import Binary
+from pymongo import ASCENDING
+
+# Statuts d'un upload par morceaux
+UPLOADING = "uploading"
+COMPLETE = "complete"
+
+# Taille des blocs GridFS (valeur par défaut de pymongo) et taille d'un morceau envoyé par le client
+GRIDFS_CHUNK_SIZE = 255 * 1024
+UPLOAD_CHUNK_SIZE = 32 * GRIDFS_CHUNK_SIZE
+# Un upload inactif depuis ce délai est supprimé, avec ses blocs déjà reçus
+UPLOAD_EXPIRY = timedelta(hours=24)
+
+
+class UploadError(ValueError):
+    """Morceau ou finalisation refusés (décalage, taille ou checksum invalides)."""
+
+
+def combined_checksum(chunk_checksums):
+    """
+    Checksum final d'un upload : SHA-256 de la concaténation des SHA-256 des morceaux.
+
+    Le client le calcule morceau par morceau, sans relire le fichier entier,
+    et le serveur le vérifie à la finalisation sans relire GridFS.
+    """
+    digest = hashlib.sha256()
+    for checksum in chunk_checksums:
+        digest.update(bytes.fromhex(checksum))
+    return digest.hexdigest()
+
+
+class UploadStore:
+    """
+    Uploads reprenables, écrits morceau par morceau directement dans GridFS.
+
+    Protocole :
+      1. init : le client annonce le nom et la taille du fichier et reçoit
+         un upload_id et la taille des morceaux (chunk_size).
+      2. append : chaque morceau est envoyé à son décalage (offset), avec
+         son SHA-256. Tous les morceaux font chunk_size octets sauf le
+         dernier. Après une coupure, status donne le nombre d'octets reçus
+         et l'envoi reprend à ce décalage.
+      3. finalize : le client envoie combined_checksum des morceaux ; le
+         fichier GridFS devient visible et son id est retourné.
+
+    Les morceaux sont découpés en blocs GridFS et écrits dans la collection
+    fs.chunks au fur et à mesure : la finalisation ne fait qu'ajouter le
+    document fs.files, sans recopier les données.
+
+    Args:
+        db: La base MongoDB (collections uploads, fs.files et fs.chunks)
+        max_bytes: La taille maximale d'un fichier
+    """
+
+    def __init__(self, db, max_bytes):
+        self.uploads = db["uploads"]
+        self.files = db["fs.files"]
+        self.chunks = db["fs.chunks"]
+        self.max_bytes = max_bytes
+
+    def ensure_indexes(self):
+        self.uploads.create_index([("user_id", ASCENDING), ("updated_at", ASCENDING)], name="user_id_updated_at")
+
+    def init(self, user_id, filename, size, content_type=None):
+        """Démarre un upload et retourne son document."""
+        self.purge_expired()
+        if size <= 0:
+            raise UploadError("Le fichier est vide.")
+        if size > self.max_bytes:
+            raise UploadError(f"Fichier trop volumineux (maximum {self.max_bytes} octets).")
+        now = datetime.utcnow()
+        upload = {
+            "user_id": user_id,
+            "filename": filename,
+            "content_type": content_type,
+            "size": size,
+            "chunk_size": UPLOAD_CHUNK_SIZE,
+            "received": 0,
+            "chunk_checksums": [],
+            "status": UPLOADING,
+            "file_id": None,
+            "created_at": now,
+            "updated_at": now,
+        }
+        upload["_id"] = self.uploads.insert_one(upload).inserted_id
+        return upload
+
+    def get(self, user_id, upload_id):
+        return self.uploads.find_one({"_id": upload_id, "user_id": user_id})
+
+    def append(self, upload, offset, stream, checksum):
+        """
+        Écrit un morceau reçu à la position offset.
+
+        Le morceau est lu par blocs GridFS depuis le flux de la requête et
+        son SHA-256 est calculé au passage ; en cas d'erreur, le nombre
+        d'octets reçus n'avance pas et le client renvoie le même morceau.
+
+        Returns:
+            int: Le nombre total d'octets reçus
+        """
+        if upload["status"] != UPLOADING:
+            raise UploadError("Upload déjà finalisé.")
+        chunk_size = upload["chunk_size"]
+        # Un morceau déjà accepté n'est jamais réécrit : son checksum est déjà enregistré
+        if offset != upload["received"]:
+            raise UploadError(f"Décalage invalide : {upload['received']} octets déjà reçus.")
+        if offset >= upload["size"]:
+            raise UploadError("Fichier déjà entièrement reçu.")
+        expected = min(chunk_size, upload["size"] - offset)
+
+        digest = hashlib.sha256()
+        length = 0
+        n = offset // GRIDFS_CHUNK_SIZE
+        while True:
+            block = stream.read(GRIDFS_CHUNK_SIZE)
+            if not block:
+                break
+            # Le flux peut rendre moins qu'un bloc complet : compléter avant l'écriture
+            while len(block) < GRIDFS_CHUNK_SIZE:
+                more = stream.read(GRIDFS_CHUNK_SIZE - len(block))
+                if not more:
+                    break
+                block += more
+            length += len(block)
+            if length > expected:
+                raise UploadError(f"Morceau trop long : {expected} octets attendus.")
+            digest.update(block)
+            self.chunks.replace_one(
+                {"files_id": upload["_id"], "n": n},
+                {"files_id": upload["_id"], "n": n, "data": Binary(block)},
+                upsert=True,
+            )
+            n += 1
+        if length != expected:
+            raise UploadError(f"Morceau incomplet : {length} octets reçus sur {expected}.")
+        if digest.hexdigest() != (checksum or "").lower():
+            raise UploadError("Checksum du morceau invalide.")
+
+        index = offset // chunk_size
+        result = self.uploads.find_one_and_update(
+            {"_id": upload["_id"], "status": UPLOADING, "received": offset},
+            {"$set": {
+                f"chunk_checksums.{index}": digest.hexdigest(),
+                "received": offset + length,
+                "updated_at": datetime.utcnow(),
+            }},
+            return_document=True,
+        )
+        if result is None:
+            raise UploadError("Upload finalisé ou morceau reçu en double.")
+        return result["received"]
+
+    def finalize(self, upload, checksum):
+        """Vérifie le checksum final et rend le fichier visible dans GridFS ; retourne son id."""
+        if upload["status"] == COMPLETE:
+            return upload["file_id"]
+        if upload["received"] != upload["size"]:
+            raise UploadError(f"Upload incomplet : {upload['received']} octets reçus sur {upload['size']}.")
+        if combined_checksum(upload["chunk_checksums"]) != (checksum or "").lower():
+            raise UploadError("Checksum du fichier invalide.")
+
+        # Le fichier GridFS réutilise l'id de l'upload : ses blocs sont déjà dans fs.chunks
+        self.files.insert_one({
+            "_id": upload["_id"],
+            "length": upload["size"],
+            "chunkSize": GRIDFS_CHUNK_SIZE,
+            "uploadDate": datetime.utcnow(),
+            "filename": upload["filename"],
+            "contentType": upload["content_type"],
+        })
+        self.uploads.update_one(
+            {"_id": upload["_id"]},
+            {"$set": {"status": COMPLETE, "file_id": upload["_id"], "updated_at": datetime.utcnow()}},
+        )
+        return upload["_id"]
+
+    def abort(self, upload):
+        """Supprime un upload non finalisé et ses blocs."""
+        if upload["status"] == UPLOADING:
+            self.chunks.delete_many({"files_id": upload["_id"]})
+        self.uploads.delete_one({"_id": upload["_id"]})
+
+    def consume(self, user_id, upload_id):
+        """Retourne l'id du fichier d'un upload finalisé et supprime le suivi de l'upload (ou None)."""
+        upload = self.uploads.find_one_and_delete(
+            {"_id": upload_id, "user_id": user_id, "status": COMPLETE}
+        )
+        return upload and upload["file_id"]
+
+    def purge_expired(self):
+        """Supprime les uploads inactifs depuis UPLOAD_EXPIRY, y compris les fichiers finalisés jamais utilisés."""
+        limit = datetime.utcnow() - UPLOAD_EXPIRY
+        for upload in self.uploads.find({"updated_at": {"$lt": limit}}, {"status": 1}):
+            if upload["status"] == COMPLETE:
+                self.files.delete_one({"_id": upload["_id"]})
+            self.chunks.delete_many({"files_id": upload["_id"]})
+            self.uploads.delete_one({"_id": upload["_id"]})
@@ -0,0 +1,266 @@
+import math
+from datetime import datetime
+import numpy as np
+import pandas as pd
+from pymongo import ASCENDING
+import dataset_store
+
+# Nombre de lignes lues à la fois pendant le profilage
+PROFILE_CHUNK_ROWS = 100000
+# Taille d'un niveau du sketch de quantiles (erreur de rang de l'ordre de 1 / QUANTILE_SKETCH_SIZE)
+QUANTILE_SKETCH_SIZE = 1024
+# Nombre de bits d'index HyperLogLog : 2 ** 14 registres, erreur relative ~0.8 %
+HLL_PRECISION = 14
+QUANTILES = {"25%": 0.25, "50%": 0.5, "75%": 0.75}
+
+
+class QuantileSketch:
+    """
+    Sketch de quantiles à mémoire bornée (compacteurs de type KLL).
+
+    Les valeurs sont ajoutées au niveau 0. Quand un niveau dépasse
+    QUANTILE_SKETCH_SIZE valeurs, il est trié et une valeur sur deux
+    (décalage tiré au hasard) monte au niveau suivant, où chaque valeur
+    compte double. La mémoire reste de l'ordre de k * log2(n / k) valeurs.
+    """
+
+    def __init__(self, k=QUANTILE_SKETCH_SIZE, random_state=42):
+        self.k = k
+        self.levels = [np.empty(0)]
+        self.rng = np.random.default_rng(random_state)
+
+    def update(self, values):
+        self.levels[0] = np.concatenate([self.levels[0], np.asarray(values, dtype=np.float64)])
+        # Un niveau compacté peut faire déborder le suivant, éventuellement créé à l'instant
+        level = 0
+        while level < len(self.levels):
+            if len(self.levels[level]) > self.k:
+                self.compact(level)
+            level += 1
+
+    def compact(self, level):
+        buffer = np.sort(self.levels[level])
+        # Nombre impair : la dernière valeur reste à ce niveau
+        even = len(buffer) - len(buffer) % 2
+        promoted = buffer[self.rng.integers(2):even:2]
+        self.levels[level] = buffer[even:]
+        if level + 1 == len(self.levels):
+            self.levels.append(np.empty(0))
+        self.levels[level + 1] = np.concatenate([self.levels[level + 1], promoted])
+
+    def quantile(self, q):
+        values = np.concatenate(self.levels)
+        if not len(values):
+            return None
+        weights = np.concatenate([np.full(len(buffer), 2.0 ** level) for level, buffer in enumerate(self.levels)])
+        order = np.argsort(values, kind="stable")
+        cumulative = np.cumsum(weights[order])
+        position = np.searchsorted(cumulative, q * cumulative[-1], side="left")
+        return float(values[order][min(position, len(values) - 1)])
+
+
+class HyperLogLog:
+    """Estimation du nombre de valeurs distinctes en 2 ** precision octets."""
+
+    def __init__(self, precision=HLL_PRECISION):
+        self.precision = precision
+        self.registers = np.zeros(2 ** precision, dtype=np.uint8)
+
+    def update(self, hashes):
+        """Ajoute des empreintes 64 bits (voir hash_values)."""
+        if not len(hashes):
+            return
+        index = (hashes >> np.uint64(64 - self.precision)).astype(np.int64)
+        # Rang = position du premier bit à 1 parmi les 32 bits suivant l'index (au plus 33)
+        rest = ((hashes << np.uint64(self.precision)) >> np.uint64(32)).astype(np.float64)
+        rank = np.full(len(hashes), 33, dtype=np.uint8)
+        nonzero = rest > 0
+        rank[nonzero] = (32 - np.floor(np.log2(rest[nonzero]))).astype(np.uint8)
+        np.maximum.at(self.registers, index, rank)
+
+    def count(self):
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / np.sum(np.exp2(-self.registers.astype(np.float64)))
+        zeros = int(np.count_nonzero(self.registers == 0))
+        # Petites cardinalités : comptage linéaire, plus précis
+        if estimate <= 2.5 * m and zeros:
+            estimate = m * math.log(m / zeros)
+        return int(round(estimate))
+
+
+def hash_values(series):
+    """Empreintes 64 bits des valeurs non nulles d'une colonne (stables d'un bloc à l'autre)."""
+    return pd.util.hash_pandas_object(series.dropna(), index=False).to_numpy(dtype=np.uint64)
+
+
+def is_numeric(dtype):
+    # Même sélection que select_dtypes(include=["number"]) : les booléens sont exclus
+    return pd.api.types.is_numeric_dtype(dtype) and not pd.api.types.is_bool_dtype(dtype)
+
+
+def common_dtype(left, right):
+    if left == right:
+        return left
+    if is_numeric(left) and is_numeric(right):
+        return np.result_type(left, right)
+    return np.dtype(object)
+
+
+class ColumnProfiler:
+    """
+    Statistiques d'une colonne calculées en une passe, bloc par bloc.
+
+    Moyenne et variance sont fusionnées entre blocs (formule de Chan),
+    les quantiles viennent d'un QuantileSketch et le nombre de valeurs
+    distinctes d'un HyperLogLog : la mémoire ne dépend pas du nombre de
+    lignes.
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self.dtype = None
+        self.count = 0
+        self.null_count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = None
+        self.max = None
+        self.sketch = QuantileSketch()
+        self.hll = HyperLogLog()
+
+    def update(self, series):
+        self.dtype = series.dtype if self.dtype is None else common_dtype(self.dtype, series.dtype)
+        nulls = int(series.isna().sum())
+        self.null_count += nulls
+        self.hll.update(hash_values(series))
+        if not is_numeric(series.dtype) or nulls == len(series):
+            self.count += len(series) - nulls
+            return
+        values = series.dropna().to_numpy(dtype=np.float64)
+        n, mean = len(values), float(values.mean())
+        m2 = float(((values - mean) ** 2).sum())
+        total = self.count + n
+        delta = mean - self.mean
+        self.mean += delta * n / total
+        self.m2 += m2 + delta * delta * self.count * n / total
+        self.count = total
+        self.min = float(values.min()) if self.min is None else min(self.min, float(values.min()))
+        self.max = float(values.max()) if self.max is None else max(self.max, float(values.max()))
+        self.sketch.update(values)
+
+    def result(self):
+        stats = {
+            "name": self.name,
+            "dtype": str(self.dtype),
+            "count": self.count,
+            "null_count": self.null_count,
+            "distinct": self.hll.count(),
+        }
+        if self.dtype is not None and is_numeric(self.dtype):
+            # Mêmes clés que DataFrame.describe() (écart-type corrigé, ddof=1)
+            stats["mean"] = self.mean if self.count else None
+            stats["std"] = math.sqrt(self.m2 / (self.count - 1)) if self.count > 1 else None
+            stats["min"] = self.min
+            for key, q in QUANTILES.items():
+                stats[key] = self.sketch.quantile(q)
+            stats["max"] = self.max
+        return stats
+
+
+def profile_chunks(chunks):
+    """
+    Profile un dataset lu bloc par bloc.
+
+    Args:
+        chunks: Un itérable de DataFrames ayant les mêmes colonnes
+
+    Returns:
+        tuple: (nombre de lignes, liste des statistiques par colonne dans l'ordre des colonnes)
+    """
+    profilers = None
+    n_rows = 0
+    for chunk in chunks:
+        if profilers is None:
+            profilers = [ColumnProfiler(str(column)) for column in chunk.columns]
+        for profiler, column in zip(profilers, chunk.columns):
+            profiler.update(chunk[column])
+        n_rows += len(chunk)
+    return n_rows, [profiler.result() for profiler in profilers or []]
+
+
+def frame_chunks(df, chunksize=PROFILE_CHUNK_ROWS):
+    for start in range(0, len(df), chunksize):
+        yield df.iloc[start:start + chunksize]
+
+
+def describe_stats(columns):
+    """Statistiques des colonnes numériques au format {colonne: describe()} attendu par /select_features."""
+    return {
+        column["name"]: {key: value for key, value in column.items() if key != "name"}
+        for column in columns
+        # Colonne numérique entièrement vide : pas de statistiques à afficher
+        if column.get("mean") is not None
+    }
+
+
+class ColumnProfileStore:
+    """
+    Profils de colonnes calculés une fois par dataset et enregistrés dans MongoDB.
+
+    Un profil est identifié par le dataset_file_id : un dataset prétraité
+    (nouveau fichier GridFS) a son propre profil, et les visites suivantes
+    de /select_features ne relisent pas les données.
+
+    Args:
+        collection: La collection MongoDB des profils
+        fs: L'instance GridFS
+    """
+
+    def __init__(self, collection, fs):
+        self.collection = collection
+        self.fs = fs
+
+    def ensure_indexes(self):
+        self.collection.create_index(
+            [("dataset_file_id", ASCENDING)], name="dataset_file_id", unique=True
+        )
+
+    def get(self, project, df=None):
+        """
+        Retourne le profil du dataset d'un projet, calculé au premier appel.
+
+        Args:
+            project: Le document du projet (dataset_file_id, parquet_file_id)
+            df: Le DataFrame du dataset s'il est déjà en mémoire (évite une relecture)
+
+        Returns:
+            dict: {"n_rows", "columns": [statistiques par colonne]}
+        """
+        dataset_file_id = project["dataset_file_id"]
+        doc = self.collection.find_one({"dataset_file_id": dataset_file_id}, {"_id": 0})
+        if doc is not None:
+            return doc
+
+        n_rows, columns = profile_chunks(self.chunks(project, df))
+        doc = {
+            "dataset_file_id": dataset_file_id,
+            "n_rows": n_rows,
+            "columns": columns,
+            "created_at": datetime.utcnow(),
+        }
+        self.collection.replace_one({"dataset_file_id": dataset_file_id}, doc, upsert=True)
+        return doc
+
+    def chunks(self, project, df=None):
+        if df is not None:
+            return frame_chunks(df)
+        parquet_file_id = project.get("parquet_file_id")
+        if parquet_file_id is not None:
+            columns = dataset_store.read_columns(self.fs.get(parquet_file_id), "parquet")
+            return dataset_store.iter_chunks(self.fs.get(parquet_file_id), "parquet", columns, PROFILE_CHUNK_ROWS)
+        return pd.read_csv(self.fs.get(project["dataset_file_id"]), chunksize=PROFILE_CHUNK_ROWS)
+
+    def delete_dataset(self, dataset_file_id):
+        """Supprime le profil d'un dataset (suppression du projet)."""
+        self.collection.delete_many({"dataset_file_id": dataset_file_id})
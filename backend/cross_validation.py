@@ -0,0 +1,158 @@
+import os
+import numpy as np
+from pymongo import ASCENDING
+from sklearn.base import clone
+from sklearn.model_selection import KFold, StratifiedKFold, cross_validate
+from artifacts import save_array, load_array
+
+# Nombre de processus utilisés pour évaluer les folds (-1 : tous les cœurs)
+CROSS_VALIDATION_JOBS = int(os.environ.get("CROSS_VALIDATION_JOBS", -1))
+MIN_FOLDS = 2
+MAX_FOLDS = 20
+
+# Métriques de model_evaluate et scorers scikit-learn correspondants
+CLASSIFICATION_SCORERS = {
+    "accuracy": "accuracy",
+    "precision": "precision_weighted",
+    "recall": "recall_weighted",
+    "f1_score": "f1_weighted",
+}
+REGRESSION_SCORERS = {
+    "mae": "neg_mean_absolute_error",
+    "mse": "neg_mean_squared_error",
+    "score": "r2",
+}
+
+
+def parse_cv_options(options):
+    """
+    Valide l'option de validation croisée saisie par l'utilisateur.
+
+    Args:
+        options: dict {"folds": int}, ou None
+
+    Returns:
+        dict: Les options normalisées, ou None si la validation croisée n'est pas demandée
+    """
+    if not options or not options.get("folds"):
+        return None
+    try:
+        folds = int(options["folds"])
+    except (TypeError, ValueError):
+        raise ValueError("folds doit être un entier")
+    if not MIN_FOLDS <= folds <= MAX_FOLDS:
+        raise ValueError(f"folds doit être compris entre {MIN_FOLDS} et {MAX_FOLDS}")
+    return {"folds": folds}
+
+
+def fold_assignments(y, n_folds, classification):
+    """Numéro de fold de chaque ligne (stratifié par classe pour la classification)."""
+    splitter = (
+        StratifiedKFold(n_splits=n_folds, shuffle=True, random_state=42)
+        if classification
+        else KFold(n_splits=n_folds, shuffle=True, random_state=42)
+    )
+    assignments = np.empty(len(y), dtype=np.int8)
+    for fold, (_, test_index) in enumerate(splitter.split(np.zeros(len(y)), y)):
+        assignments[test_index] = fold
+    return assignments
+
+
+class FoldCache:
+    """
+    Folds de validation croisée calculés une fois par dataset et colonne cible.
+
+    Le numéro de fold de chaque ligne est stocké dans GridFS (un octet par
+    ligne) et référencé dans une collection MongoDB : les réentraînements
+    sur le même dataset, dans le processus Flask comme dans les workers,
+    réutilisent les mêmes folds.
+
+    Args:
+        collection: La collection MongoDB des folds
+        fs: L'instance GridFS
+    """
+
+    def __init__(self, collection, fs):
+        self.collection = collection
+        self.fs = fs
+
+    def ensure_indexes(self):
+        self.collection.create_index(
+            [("dataset_file_id", ASCENDING), ("target_feature", ASCENDING), ("n_folds", ASCENDING)],
+            name="dataset_file_id_target_feature_n_folds",
+            unique=True,
+        )
+
+    def get(self, dataset_file_id, target_feature, y, n_folds, classification):
+        """Retourne les folds du dataset, calculés et enregistrés au premier appel."""
+        key = {"dataset_file_id": dataset_file_id, "target_feature": target_feature, "n_folds": n_folds}
+        doc = self.collection.find_one(key)
+        if doc is not None and doc["n_rows"] == len(y):
+            try:
+                return load_array(self.fs, doc["array_id"])
+            except Exception as e:
+                print(f"Folds en cache illisibles pour {dataset_file_id}: {str(e)}")
+
+        assignments = fold_assignments(y, n_folds, classification)
+        array_id = save_array(self.fs, assignments, f"{dataset_file_id}_{target_feature}_{n_folds}_folds.npz")
+        previous = self.collection.find_one_and_update(
+            key,
+            {"$set": {"n_rows": len(y), "array_id": array_id}},
+            upsert=True,
+        )
+        if previous is not None:
+            self.fs.delete(previous["array_id"])
+        return assignments
+
+    def delete_dataset(self, dataset_file_id):
+        """Supprime les folds d'un dataset (suppression du projet)."""
+        for doc in self.collection.find({"dataset_file_id": dataset_file_id}, {"array_id": 1}):
+            try:
+                self.fs.delete(doc["array_id"])
+            except Exception as e:
+                print(f"Erreur lors de la suppression des folds {doc['array_id']}: {str(e)}")
+        self.collection.delete_many({"dataset_file_id": dataset_file_id})
+
+
+def cross_validate_model(model, X, y, assignments, classification):
+    """
+    Évalue un modèle sur chacun des folds, en parallèle.
+
+    Le modèle est cloné (mêmes paramètres, y compris ceux du prétraitement)
+    puis réentraîné sur les données brutes de chaque fold : le prétraitement
+    est ajusté sans voir le fold de test.
+
+    Args:
+        model: Le modèle entraîné (estimateur ou Pipeline prétraitement + estimateur)
+        X: Les features brutes
+        y: La variable cible
+        assignments: Le numéro de fold de chaque ligne (voir FoldCache)
+        classification: True pour les métriques de classification
+
+    Returns:
+        dict: {"folds": k, métrique: {"mean", "std", "values"}} avec les métriques de model_evaluate
+    """
+    n_folds = int(assignments.max()) + 1
+    cv = [
+        (np.flatnonzero(assignments != fold), np.flatnonzero(assignments == fold))
+        for fold in range(n_folds)
+    ]
+    scorers = CLASSIFICATION_SCORERS if classification else REGRESSION_SCORERS
+    scores = cross_validate(
+        clone(model), X, y, cv=cv,
+        scoring=list(scorers.values()),
+        n_jobs=CROSS_VALIDATION_JOBS,
+        error_score="raise",
+    )
+    result = {"folds": n_folds}
+    for metric, scorer in scorers.items():
+        values = scores[f"test_{scorer}"]
+        # Les scorers d'erreur de scikit-learn sont négatifs
+        if scorer.startswith("neg_"):
+            values = -values
+        result[metric] = {
+            "mean": float(np.mean(values)),
+            "std": float(np.std(values)),
+            "values": [float(value) for value in values],
+        }
+    return result
@@ -0,0 +1,214 @@
+import io
+import shutil
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from artifacts import upload_stream
+from incremental import RowReservoir
+
+# Format colonnaire stocké à côté du fichier original dans GridFS
+PARQUET_CONTENT_TYPE = "application/vnd.apache.parquet"
+# Taille des blocs copiés vers GridFS et nombre de lignes sérialisées à la fois
+COPY_CHUNK_SIZE = 1024 * 1024
+CSV_WRITE_ROWS = 50000
+PARQUET_ROW_GROUP_ROWS = 100000
+# Aperçu : lignes affichées, lignes lues pour déterminer les types, octets lus au maximum
+PREVIEW_ROWS = 5
+PREVIEW_SAMPLE_ROWS = 1000
+PREVIEW_MAX_BYTES = 4 * 1024 * 1024
+
+
+def parse_dataset(source, filename):
+    """
+    Parse un fichier uploadé (CSV, Excel ou JSON) en DataFrame.
+
+    Args:
+        source: Le contenu brut du fichier, ou un fichier lisible (flux de l'upload)
+        filename: Le nom du fichier, utilisé pour déterminer le format
+
+    Returns:
+        DataFrame: Les données du fichier, ou None si le format n'est pas supporté
+    """
+    if isinstance(source, bytes):
+        source = io.BytesIO(source)
+    if filename.endswith(".csv"):
+        return pd.read_csv(source)
+    elif filename.endswith(".xlsx"):
+        return pd.read_excel(source)
+    elif filename.endswith(".json"):
+        return pd.read_json(source)
+    return None
+
+
+def store_file(fs, source, filename, content_type=None):
+    """Copie un fichier lisible (ex. le flux d'un upload) dans GridFS, bloc par bloc."""
+    with upload_stream(fs, filename, content_type) as target:
+        shutil.copyfileobj(source, target, COPY_CHUNK_SIZE)
+    return target._id
+
+
+def store_csv(fs, df, filename):
+    """Sérialise un DataFrame en CSV directement dans GridFS, CSV_WRITE_ROWS lignes à la fois."""
+    with upload_stream(fs, filename, "text/csv", encoding="utf-8") as target:
+        df.to_csv(target, index=False, chunksize=CSV_WRITE_ROWS)
+    return target._id
+
+
+def store_parquet(fs, df, filename):
+    """
+    Écrit la copie Parquet typée d'un DataFrame dans GridFS (une seule fois, à l'ingestion).
+
+    Le fichier est écrit par groupes de PARQUET_ROW_GROUP_ROWS lignes : seul
+    le groupe courant est converti au format Arrow. Les noms de colonnes
+    sont convertis en chaînes, comme après une relecture CSV.
+
+    Returns:
+        ObjectId: L'identifiant du fichier GridFS
+    """
+    df = df.rename(columns=str)
+    # Schéma commun à tous les groupes (un groupe sans valeur ne doit pas changer le type d'une colonne)
+    schema = pa.Schema.from_pandas(df, preserve_index=False)
+    with upload_stream(fs, filename, PARQUET_CONTENT_TYPE) as target:
+        with pq.ParquetWriter(target, schema) as writer:
+            for start in range(0, max(len(df), 1), PARQUET_ROW_GROUP_ROWS):
+                rows = df.iloc[start:start + PARQUET_ROW_GROUP_ROWS]
+                writer.write_table(pa.Table.from_pandas(rows, schema=schema, preserve_index=False))
+    return target._id
+
+
+def read_parquet(source, columns=None):
+    """
+    Lit un dataset Parquet en ne chargeant que les colonnes demandées.
+
+    Args:
+        source: Un fichier lisible et positionnable (ex. un fichier GridFS)
+        columns: Les colonnes à lire (toutes si None)
+
+    Returns:
+        DataFrame: Les données projetées sur les colonnes demandées
+    """
+    return pd.read_parquet(source, engine="pyarrow", columns=columns)
+
+
+def read_project_dataset(fs, project, columns=None):
+    """
+    Lit le dataset d'un projet depuis GridFS, sans passer par le cache.
+
+    La copie Parquet est utilisée si elle existe (avec projection sur
+    `columns`), sinon le fichier CSV original.
+
+    Args:
+        fs: L'instance GridFS
+        project: Le document du projet (dataset_file_id, parquet_file_id)
+        columns: Les colonnes à lire (toutes si None)
+
+    Returns:
+        DataFrame: Les données du projet
+    """
+    parquet_file_id = project.get("parquet_file_id")
+    if parquet_file_id is not None:
+        return read_parquet(fs.get(parquet_file_id), columns=columns)
+    df = pd.read_csv(fs.get(project["dataset_file_id"]))
+    return df if columns is None else df[columns]
+
+
+def iter_chunks(source, file_format, columns, chunksize):
+    """
+    Lit un fichier CSV ou Parquet par blocs de lignes, sans le charger en entier.
+
+    Args:
+        source: Un fichier lisible (upload, fichier GridFS...) ; positionnable pour le Parquet
+        file_format: "csv" ou "parquet"
+        columns: Les colonnes à lire, dans cet ordre
+        chunksize: Le nombre maximal de lignes par bloc
+
+    Yields:
+        DataFrame: Un bloc de lignes projeté sur `columns`
+    """
+    if file_format == "parquet":
+        parquet_file = pq.ParquetFile(source)
+        for batch in parquet_file.iter_batches(batch_size=chunksize, columns=columns):
+            yield batch.to_pandas()[columns]
+    else:
+        for chunk in pd.read_csv(source, usecols=columns, chunksize=chunksize):
+            yield chunk[columns]
+
+
+def read_columns(source, file_format):
+    """Retourne les noms de colonnes d'un fichier CSV ou Parquet (en-tête / schéma seulement)."""
+    if file_format == "parquet":
+        return list(pq.ParquetFile(source).schema_arrow.names)
+    # Seule la ligne d'en-tête est lue (pandas fermerait le fichier source)
+    header = pd.read_csv(io.BytesIO(source.readline()), nrows=0)
+    return [str(column) for column in header.columns]
+
+
+def read_prefix(source, max_bytes=PREVIEW_MAX_BYTES, partial=False):
+    """
+    Lit au plus max_bytes octets d'un fichier texte, coupés à la dernière ligne complète.
+
+    Args:
+        source: Un fichier lisible (upload, fichier GridFS...)
+        max_bytes: Le nombre maximal d'octets lus
+        partial: True si source n'est déjà qu'un début de fichier (la dernière ligne peut être coupée)
+
+    Returns:
+        tuple: (contenu en bytes, True si le fichier a été tronqué)
+    """
+    data = source.read(max_bytes + 1)
+    truncated = partial or len(data) > max_bytes
+    if truncated:
+        data = data[:max_bytes]
+        end = data.rfind(b"\n")
+        if end >= 0:
+            data = data[:end + 1]
+    return data, truncated
+
+
+def read_preview(source, filename, rows=PREVIEW_ROWS, sample_rows=PREVIEW_SAMPLE_ROWS,
+                 max_bytes=PREVIEW_MAX_BYTES, partial=False, sample=False):
+    """
+    Aperçu d'un fichier à coût borné, quelle que soit sa taille.
+
+    Pour un CSV, au plus max_bytes octets sont lus : les types des colonnes
+    sont déterminés sur les sample_rows premières lignes et les rows
+    premières lignes sont retournées. Avec sample=True, les lignes
+    retournées sont tirées uniformément (RowReservoir) dans ce début
+    de fichier plutôt que prises en tête. Les fichiers Excel sont lus avec
+    nrows ; les fichiers JSON (non découpables) sont lus en entier.
+
+    Args:
+        source: Un fichier lisible (upload, fichier GridFS...)
+        filename: Le nom du fichier, utilisé pour déterminer le format
+        partial: True si source n'est déjà qu'un début de fichier (voir read_prefix)
+        sample: True pour un échantillon représentatif au lieu des premières lignes
+
+    Returns:
+        dict: {"columns", "data", "dtypes", "sample_rows", "truncated"}, ou None si le format n'est pas supporté
+    """
+    truncated = False
+    if filename.endswith(".csv"):
+        data, truncated = read_prefix(source, max_bytes, partial)
+        head = pd.read_csv(io.BytesIO(data), nrows=sample_rows)
+        if sample:
+            reservoir = RowReservoir(max_rows=rows)
+            for chunk in pd.read_csv(io.BytesIO(data), chunksize=sample_rows):
+                reservoir.add(chunk)
+            shown = reservoir.frame
+        else:
+            shown = head.head(rows)
+    elif filename.endswith(".xlsx"):
+        head = pd.read_excel(source, nrows=sample_rows)
+        shown = head.sample(min(rows, len(head)), random_state=42).sort_index() if sample else head.head(rows)
+    elif filename.endswith(".json"):
+        head = pd.read_json(source).head(sample_rows)
+        shown = head.sample(min(rows, len(head)), random_state=42).sort_index() if sample else head.head(rows)
+    else:
+        return None
+    return {
+        "columns": head.columns.tolist(),
+        "data": shown.values.tolist(),
+        "dtypes": {str(column): str(dtype) for column, dtype in head.dtypes.items()},
+        "sample_rows": len(head),
+        "truncated": truncated,
+    }
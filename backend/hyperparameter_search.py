@@ -0,0 +1,269 @@
+import os
+import numpy as np
+from scipy.stats import loguniform, randint, uniform
+from sklearn.base import is_classifier
+from sklearn.experimental import enable_halving_search_cv  # noqa: F401
+from sklearn.model_selection import HalvingRandomSearchCV, RandomizedSearchCV
+from serialization import to_native
+
+# Stratégies de recherche proposées
+RANDOM = "random"
+HALVING = "halving"
+STRATEGIES = [RANDOM, HALVING]
+
+# Nombre de processus utilisés par une recherche (-1 : tous les cœurs)
+SEARCH_JOBS = int(os.environ.get("HYPERPARAMETER_SEARCH_JOBS", -1))
+# Nombre maximal de configurations évaluées par une recherche
+MAX_ITERATIONS = 200
+
+# Espaces de recherche par algorithme : listes (valeurs discrètes) ou distributions scipy
+SEARCH_SPACES = {
+    'Logistic Regression': {
+        'C': loguniform(1e-3, 1e3),
+        'class_weight': [None, 'balanced'],
+        'max_iter': [1000],
+    },
+    'SVC': {
+        'C': loguniform(1e-2, 1e3),
+        'gamma': loguniform(1e-4, 1e1),
+        'kernel': ['rbf', 'linear', 'poly'],
+    },
+    'Decision Tree Classifier': {
+        'max_depth': [None, 3, 5, 8, 12, 20],
+        'min_samples_split': randint(2, 20),
+        'min_samples_leaf': randint(1, 10),
+        'criterion': ['gini', 'entropy'],
+    },
+    'Random Forest Classifier': {
+        'n_estimators': randint(50, 400),
+        'max_depth': [None, 5, 10, 20],
+        'min_samples_leaf': randint(1, 8),
+        'max_features': ['sqrt', 'log2', None],
+    },
+    'Gradient Boosting Classifier': {
+        'n_estimators': randint(50, 400),
+        'learning_rate': loguniform(1e-2, 3e-1),
+        'max_depth': randint(2, 6),
+        'subsample': uniform(0.6, 0.4),
+    },
+    'KNeighbors Classifier': {
+        'n_neighbors': randint(1, 40),
+        'weights': ['uniform', 'distance'],
+        'p': [1, 2],
+    },
+    'Quadratic Discriminant Analysis': {
+        'reg_param': uniform(0.0, 1.0),
+    },
+    'Linear Discriminant Analysis': {
+        'solver': ['svd', 'lsqr'],
+    },
+    'AdaBoost Classifier': {
+        'n_estimators': randint(25, 300),
+        'learning_rate': loguniform(1e-2, 2.0),
+    },
+    'Bagging Classifier': {
+        'n_estimators': randint(10, 100),
+        'max_samples': uniform(0.5, 0.5),
+        'max_features': uniform(0.5, 0.5),
+    },
+    'Gaussian NB': {
+        'var_smoothing': loguniform(1e-11, 1e-5),
+    },
+    'SGD Classifier': {
+        'loss': ['hinge', 'log_loss', 'modified_huber'],
+        'penalty': ['l2', 'l1', 'elasticnet'],
+        'alpha': loguniform(1e-6, 1e-1),
+        'early_stopping': [True],
+    },
+    'MLP Classifier': {
+        'hidden_layer_sizes': [(50,), (100,), (100, 50), (200, 100)],
+        'alpha': loguniform(1e-6, 1e-1),
+        'learning_rate_init': loguniform(1e-4, 1e-1),
+        'early_stopping': [True],
+        'max_iter': [500],
+    },
+    'Linear Regression': {
+        'fit_intercept': [True, False],
+    },
+    'SVR': {
+        'C': loguniform(1e-2, 1e3),
+        'gamma': loguniform(1e-4, 1e1),
+        'epsilon': loguniform(1e-3, 1.0),
+        'kernel': ['rbf', 'linear'],
+    },
+    'Decision Tree Regressor': {
+        'max_depth': [None, 3, 5, 8, 12, 20],
+        'min_samples_split': randint(2, 20),
+        'min_samples_leaf': randint(1, 10),
+    },
+    'Ridge': {
+        'alpha': loguniform(1e-3, 1e3),
+    },
+    'Lasso': {
+        'alpha': loguniform(1e-4, 1e2),
+        'max_iter': [5000],
+    },
+    'Elastic Net': {
+        'alpha': loguniform(1e-4, 1e2),
+        'l1_ratio': uniform(0.05, 0.9),
+        'max_iter': [5000],
+    },
+    'SGD Regressor': {
+        'loss': ['squared_error', 'huber', 'epsilon_insensitive'],
+        'penalty': ['l2', 'l1', 'elasticnet'],
+        'alpha': loguniform(1e-6, 1e-1),
+        'early_stopping': [True],
+    },
+    'Random Forest Regressor': {
+        'n_estimators': randint(50, 400),
+        'max_depth': [None, 5, 10, 20],
+        'min_samples_leaf': randint(1, 8),
+        'max_features': ['sqrt', 'log2', 1.0],
+    },
+    'Gradient Boosting Regressor': {
+        'n_estimators': randint(50, 400),
+        'learning_rate': loguniform(1e-2, 3e-1),
+        'max_depth': randint(2, 6),
+        'subsample': uniform(0.6, 0.4),
+    },
+    'AdaBoost Regressor': {
+        'n_estimators': randint(25, 300),
+        'learning_rate': loguniform(1e-2, 2.0),
+        'loss': ['linear', 'square', 'exponential'],
+    },
+    'Bagging Regressor': {
+        'n_estimators': randint(10, 100),
+        'max_samples': uniform(0.5, 0.5),
+        'max_features': uniform(0.5, 0.5),
+    },
+    'MLP Regressor': {
+        'hidden_layer_sizes': [(50,), (100,), (100, 50), (200, 100)],
+        'alpha': loguniform(1e-6, 1e-1),
+        'learning_rate_init': loguniform(1e-4, 1e-1),
+        'early_stopping': [True],
+        'max_iter': [500],
+    },
+}
+
+
+def parse_search_options(options):
+    """
+    Valide les options de recherche saisies par l'utilisateur.
+
+    Args:
+        options: dict {"strategy": "random" | "halving", "n_iter": int, "cv": int}, ou None
+
+    Returns:
+        dict: Les options normalisées, ou None si aucune recherche n'est demandée
+    """
+    if not options or not options.get("strategy") or options.get("strategy") == "none":
+        return None
+    strategy = options["strategy"]
+    if strategy not in STRATEGIES:
+        raise ValueError(f"Stratégie de recherche {strategy} non valide")
+    try:
+        n_iter = int(options.get("n_iter", 20))
+        cv = int(options.get("cv", 3))
+    except (TypeError, ValueError):
+        raise ValueError("n_iter et cv doivent être des entiers")
+    if cv < 2:
+        raise ValueError("cv doit être au moins égal à 2")
+    return {"strategy": strategy, "n_iter": max(1, min(n_iter, MAX_ITERATIONS)), "cv": cv}
+
+
+def search_space(model_name, fixed_parameters=None):
+    """Espace de recherche d'un algorithme, sans les paramètres fixés par l'utilisateur."""
+    if model_name not in SEARCH_SPACES:
+        raise ValueError(f"Aucun espace de recherche pour le modèle {model_name}")
+    fixed_parameters = fixed_parameters or {}
+    return {
+        name: values
+        for name, values in SEARCH_SPACES[model_name].items()
+        if name not in fixed_parameters
+    }
+
+
+def native_params(params):
+    """Paramètres tirés des distributions scipy (types NumPy) convertis en types Python, pour MongoDB."""
+    return {name: to_native(value) for name, value in params.items()}
+
+
+def trial_history(cv_results):
+    """Convertit cv_results_ en liste d'essais, du meilleur au moins bon."""
+    trials = []
+    for i, params in enumerate(cv_results["params"]):
+        mean_score = cv_results["mean_test_score"][i]
+        trials.append({
+            "params": native_params(params),
+            # Configuration en erreur (paramètres incompatibles) : score NaN
+            "mean_score": None if np.isnan(mean_score) else float(mean_score),
+            "std_score": None if np.isnan(mean_score) else float(cv_results["std_test_score"][i]),
+            "fit_time": float(cv_results["mean_fit_time"][i]),
+            "rank": int(cv_results["rank_test_score"][i]),
+            # Successive halving : tour atteint et nombre de lignes utilisées
+            "iteration": int(cv_results["iter"][i]) if "iter" in cv_results else 0,
+            "n_resources": int(cv_results["n_resources"][i]) if "n_resources" in cv_results else None,
+        })
+    # Successive halving : les configurations gardées jusqu'aux derniers tours d'abord, les erreurs à la fin
+    trials.sort(key=lambda trial: (trial["mean_score"] is None, -trial["iteration"], trial["rank"]))
+    return trials
+
+
+def run_search(estimator, model_name, X, y, options, fixed_parameters=None, random_state=42):
+    """
+    Cherche les meilleurs hyperparamètres d'un estimateur par validation croisée.
+
+    La recherche aléatoire évalue n_iter configurations sur toutes les
+    données. Le successive halving évalue n_iter configurations sur un
+    petit échantillon, puis ne garde que le meilleur tiers à chaque tour
+    en triplant le nombre de lignes : les mauvaises configurations sont
+    abandonnées tôt. Les configurations sont évaluées en parallèle.
+
+    Args:
+        estimator: L'estimateur de base, avec les paramètres fixés par l'utilisateur
+        model_name: Le nom de l'algorithme (clé de SEARCH_SPACES)
+        X: Les features d'entraînement (prétraitées)
+        y: La variable cible d'entraînement
+        options: Les options retournées par parse_search_options
+        fixed_parameters: Les paramètres saisis par l'utilisateur, exclus de la recherche
+
+    Returns:
+        tuple: (meilleur estimateur réentraîné sur X, résumé de la recherche avec l'historique des essais)
+    """
+    space = search_space(model_name, fixed_parameters)
+    if not space:
+        raise ValueError("Tous les hyperparamètres recherchés sont déjà fixés")
+    common = {
+        "cv": options["cv"],
+        "random_state": random_state,
+        "n_jobs": SEARCH_JOBS,
+        "refit": True,
+        "error_score": np.nan,
+    }
+    if options["strategy"] == HALVING:
+        search = HalvingRandomSearchCV(
+            estimator,
+            space,
+            n_candidates=options["n_iter"],
+            factor=3,
+            # Taille du premier tour choisie pour que le dernier tour utilise tout l'ensemble d'entraînement
+            resource="n_samples",
+            min_resources="exhaust",
+            **common,
+        )
+    else:
+        search = RandomizedSearchCV(estimator, space, n_iter=options["n_iter"], **common)
+    search.fit(X, y)
+    best_params = native_params(search.best_params_)
+    # Mêmes valeurs en types natifs : get_params() du modèle reste enregistrable dans MongoDB
+    best_estimator = search.best_estimator_.set_params(**best_params)
+    summary = {
+        "strategy": options["strategy"],
+        "n_iter": options["n_iter"],
+        "cv": options["cv"],
+        "scoring": "accuracy" if is_classifier(estimator) else "r2",
+        "best_params": best_params,
+        "best_score": float(search.best_score_),
+        "trials": trial_history(search.cv_results_),
+    }
+    return best_estimator, summary
@@ -0,0 +1,85 @@
+import numpy as np
+import pandas as pd
+
+# Taille maximale des échantillons conservés en mémoire pendant un entraînement par blocs
+SAMPLE_MAX_ROWS = 50000
+
+
+class RowReservoir:
+    """
+    Échantillon uniforme de taille bornée des lignes d'un flux de DataFrames.
+
+    Échantillonnage par réservoir (algorithme R) : après n lignes vues,
+    chaque ligne a la même probabilité max_rows / n d'être conservée.
+    Les remplacements d'un bloc sont appliqués en une seule concaténation,
+    et frame rend les lignes dans leur ordre d'apparition dans le flux.
+
+    Args:
+        max_rows: Le nombre maximal de lignes conservées
+        seed: La graine du générateur aléatoire
+    """
+
+    def __init__(self, max_rows=SAMPLE_MAX_ROWS, seed=42):
+        self.max_rows = max_rows
+        self.rows_seen = 0
+        self._rng = np.random.default_rng(seed)
+        self._frame = None
+        # Position dans le flux de chaque ligne du réservoir
+        self._positions = np.empty(0, dtype=np.int64)
+        self._ordered = True
+
+    def add(self, chunk):
+        if len(chunk) == 0:
+            return
+        chunk = chunk.reset_index(drop=True)
+        index = np.arange(self.rows_seen, self.rows_seen + len(chunk))
+        if self._frame is None:
+            self._frame = chunk.iloc[:0].copy()
+
+        # Remplir d'abord le réservoir
+        fill = min(max(self.max_rows - len(self._frame), 0), len(chunk))
+        if fill:
+            self._frame = pd.concat([self._frame, chunk.iloc[:fill]], ignore_index=True)
+            self._positions = np.concatenate([self._positions, index[:fill]])
+
+        # Puis remplacer une ligne au hasard avec une probabilité max_rows / n
+        if fill < len(chunk):
+            slots = (self._rng.random(len(chunk) - fill) * (index[fill:] + 1)).astype(np.int64)
+            rows = np.flatnonzero(slots < self.max_rows)
+            slots = slots[rows]
+            # Plusieurs lignes du bloc peuvent viser la même case : la dernière l'emporte
+            _, last = np.unique(slots[::-1], return_index=True)
+            last = len(slots) - 1 - last
+            slots, rows = slots[last], rows[last] + fill
+            if len(rows):
+                kept = np.ones(len(self._frame), dtype=bool)
+                kept[slots] = False
+                self._frame = pd.concat([self._frame[kept], chunk.iloc[rows]], ignore_index=True)
+                self._positions = np.concatenate([self._positions[kept], index[rows]])
+                self._ordered = False
+        self.rows_seen += len(chunk)
+
+    @property
+    def frame(self):
+        """Les lignes échantillonnées, dans l'ordre du flux (DataFrame vide si aucune ligne n'a été vue)."""
+        if self._frame is None:
+            return pd.DataFrame()
+        if not self._ordered:
+            order = np.argsort(self._positions, kind="stable")
+            self._frame = self._frame.iloc[order].reset_index(drop=True)
+            self._positions = self._positions[order]
+            self._ordered = True
+        return self._frame
+
+
+def split_chunks(chunks, test_size=0.2, seed=42):
+    """
+    Sépare chaque bloc en lignes d'entraînement et de test, de façon reproductible.
+
+    Yields:
+        tuple: (bloc d'entraînement, bloc de test)
+    """
+    rng = np.random.default_rng(seed)
+    for chunk in chunks:
+        test_mask = rng.random(len(chunk)) < test_size
+        yield chunk[~test_mask], chunk[test_mask]
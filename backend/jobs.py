@@ -0,0 +1,319 @@
+import multiprocessing
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta
+from pymongo import MongoClient
+from gridfs import GridFS
+import dataset_store
+from training import train_project, training_columns, use_streaming, TRAINING_FIELDS
+from leaderboard import build_leaderboard
+from project_store import ProjectStore
+from visualizations import VisualizationStore, VISUALIZATION_FIELDS
+from serialization import convert_to_serializable
+
+# Statuts d'un job d'entraînement
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+CANCELLED = "cancelled"
+ACTIVE_STATUSES = [QUEUED, RUNNING]
+
+# Le processus Flask qui possède un job actif met à jour son heartbeat_at à cet intervalle (secondes)
+JOB_HEARTBEAT_SECONDS = 30
+# Un job actif sans heartbeat depuis ce délai a perdu son processus (redémarrage du serveur)
+JOB_STALE_AFTER = timedelta(seconds=4 * JOB_HEARTBEAT_SECONDS)
+INTERRUPTED_ERROR = "Job interrompu par un redémarrage du serveur."
+
+
+# Types de jobs
+TRAIN = "train"
+LEADERBOARD = "leaderboard"
+VISUALIZATIONS = "visualizations"
+
+
+class JobCancelled(Exception):
+    """Levée dans le worker quand l'annulation du job a été demandée."""
+
+
+def run_job(mongo_uri, db_name, job_id):
+    """
+    Exécute un job dans un processus du pool.
+
+    Le worker ouvre sa propre connexion MongoDB, lit le dataset depuis
+    GridFS et enregistre son avancement dans le document du job. Une
+    annulation est prise en compte entre deux étapes : le fit en cours ne
+    peut pas être interrompu, mais le modèle n'est alors pas enregistré.
+    """
+    client = MongoClient(mongo_uri)
+    db = client[db_name]
+    fs = GridFS(db)
+    jobs_collection = db["jobs"]
+    try:
+        job = jobs_collection.find_one_and_update(
+            {"_id": job_id, "status": QUEUED, "cancel_requested": False},
+            {"$set": {"status": RUNNING, "started_at": datetime.utcnow()}},
+        )
+        if job is None:
+            # Annulation demandée avant le démarrage du job
+            jobs_collection.update_one(
+                {"_id": job_id, "status": QUEUED},
+                {"$set": {"status": CANCELLED, "finished_at": datetime.utcnow()}},
+            )
+            return
+
+        def progress(stage, percent):
+            current = jobs_collection.find_one_and_update(
+                {"_id": job_id},
+                {"$set": {"stage": stage, "progress": percent}},
+                projection={"cancel_requested": 1},
+            )
+            if stage != "done" and current.get("cancel_requested"):
+                raise JobCancelled()
+
+        kind = job.get("kind", TRAIN)
+        project = ProjectStore(db["projects"]).get(
+            job["user_id"], job["project_name"],
+            VISUALIZATION_FIELDS if kind == VISUALIZATIONS else TRAINING_FIELDS,
+        )
+        progress("loading", 0)
+        if kind == VISUALIZATIONS:
+            result = VisualizationStore(db["visualizations"], fs).render_project(project, progress)
+        elif kind == LEADERBOARD:
+            result = run_leaderboard(db["projects"], fs, project, job.get("options") or {}, progress)
+        else:
+            if use_streaming(fs, project):
+                data = None
+            else:
+                data = dataset_store.read_project_dataset(fs, project, columns=training_columns(project))
+            result = train_project(db["projects"], fs, project, data, progress)
+        finish_job(jobs_collection, job_id, SUCCEEDED, result=convert_to_serializable(result))
+    except JobCancelled:
+        finish_job(jobs_collection, job_id, CANCELLED)
+    except ValueError as e:
+        finish_job(jobs_collection, job_id, FAILED, error=f"Training error: {str(e)}")
+    except Exception as e:
+        finish_job(jobs_collection, job_id, FAILED, error=f"Unexpected error: {str(e)}")
+    finally:
+        client.close()
+
+
+def run_leaderboard(projects_collection, fs, project, options, progress):
+    """Entraîne les algorithmes candidats d'un projet et enregistre leur classement."""
+    data = dataset_store.read_project_dataset(fs, project, columns=training_columns(project))
+    progress("fitting", 10)
+    leaderboard = build_leaderboard(
+        project,
+        data,
+        algorithms=options.get("algorithms"),
+        algorithm_parameters=options.get("algorithm_parameters"),
+        max_workers=options.get("max_workers", 2),
+        time_budget=options.get("time_budget", 300),
+        progress=lambda done, total: progress("fitting", 10 + int(85 * done / total)),
+    )
+    leaderboard = convert_to_serializable(leaderboard)
+    projects_collection.update_one(
+        {"user_id": project["user_id"], "project_name": project["project_name"]},
+        {"$set": {"leaderboard": leaderboard}},
+    )
+    progress("done", 100)
+    return leaderboard
+
+
+def finish_job(jobs_collection, job_id, status, result=None, error=None):
+    jobs_collection.update_one(
+        {"_id": job_id},
+        {"$set": {
+            "status": status,
+            "result": result,
+            "error": error,
+            "finished_at": datetime.utcnow(),
+        }}
+    )
+
+
+def serialize_job(job):
+    """Représentation JSON d'un job (sans le résultat)."""
+    return {
+        "job_id": str(job["_id"]),
+        "project_name": job["project_name"],
+        "kind": job.get("kind", TRAIN),
+        "status": job["status"],
+        "stage": job.get("stage"),
+        "progress": job.get("progress", 0),
+        "error": job.get("error"),
+        "created_at": job["created_at"].isoformat(),
+        "finished_at": job["finished_at"].isoformat() if job.get("finished_at") else None,
+    }
+
+
+class TrainingJobQueue:
+    """
+    File locale de jobs d'entraînement exécutés dans un pool de processus.
+
+    L'état des jobs est stocké dans MongoDB : il survit au rechargement de
+    la page et peut être consulté depuis n'importe quel worker Flask.
+
+    Args:
+        jobs_collection: La collection MongoDB des jobs
+        mongo_uri: L'URI MongoDB utilisée par les processus du pool
+        db_name: Le nom de la base de données
+        max_workers: Le nombre de processus d'entraînement
+        executor: Un executor à utiliser à la place du pool de processus
+    """
+
+    def __init__(self, jobs_collection, mongo_uri, db_name, max_workers=2, executor=None):
+        self.jobs_collection = jobs_collection
+        self.mongo_uri = mongo_uri
+        self.db_name = db_name
+        self.max_workers = max_workers
+        self._executor = executor
+        self._futures = {}
+        self._lock = threading.Lock()
+        self._heartbeat = None
+        self.recover()
+
+    @property
+    def executor(self):
+        # Pool créé au premier job ("spawn" : pas de connexion MongoDB héritée du parent)
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            return self._executor
+
+    def stale_filter(self):
+        """Jobs actifs dont le processus propriétaire ne donne plus signe de vie."""
+        return {
+            "status": {"$in": ACTIVE_STATUSES},
+            "$or": [
+                {"heartbeat_at": {"$lt": datetime.utcnow() - JOB_STALE_AFTER}},
+                {"heartbeat_at": {"$exists": False}},
+            ],
+        }
+
+    def recover(self):
+        """
+        Marque en échec les jobs actifs abandonnés par un processus arrêté.
+
+        Sans cela, un job en file ou en cours au moment d'un redémarrage
+        resterait actif indéfiniment : submit retournerait son id à chaque
+        nouvelle demande et le client l'attendrait sans fin.
+        """
+        result = self.jobs_collection.update_many(self.stale_filter(), {"$set": {
+            "status": FAILED,
+            "error": INTERRUPTED_ERROR,
+            "finished_at": datetime.utcnow(),
+        }})
+        if result.modified_count:
+            print(f"{result.modified_count} job(s) interrompu(s) marqué(s) en échec")
+
+    def _start_heartbeat(self):
+        with self._lock:
+            if self._heartbeat is None:
+                self._heartbeat = threading.Thread(target=self._beat, name="job-heartbeat", daemon=True)
+                self._heartbeat.start()
+
+    def _beat(self):
+        while True:
+            time.sleep(JOB_HEARTBEAT_SECONDS)
+            job_ids = list(self._futures)
+            if not job_ids:
+                continue
+            try:
+                self.jobs_collection.update_many(
+                    {"_id": {"$in": job_ids}, "status": {"$in": ACTIVE_STATUSES}},
+                    {"$set": {"heartbeat_at": datetime.utcnow()}},
+                )
+            except Exception as e:
+                print(f"Erreur lors de la mise à jour du heartbeat des jobs: {str(e)}")
+
+    def submit(self, user_id, project_name, kind=TRAIN, options=None):
+        """
+        Crée un job pour le projet et retourne son id (celui du job actif s'il en existe un).
+
+        Args:
+            kind: TRAIN (entraînement du modèle du projet), LEADERBOARD (classement d'algorithmes)
+                ou VISUALIZATIONS (graphiques du dernier prétraitement)
+            options: Les options du job (algorithmes, budget de temps... pour LEADERBOARD)
+        """
+        active = self.jobs_collection.find_one({
+            "user_id": user_id,
+            "project_name": project_name,
+            "kind": kind,
+            "status": {"$in": ACTIVE_STATUSES},
+        })
+        if active is not None:
+            if not self.is_stale(active):
+                return active["_id"]
+            # Job abandonné (redémarrage) : le clore et en créer un nouveau
+            self.recover()
+
+        job_id = self.jobs_collection.insert_one({
+            "user_id": user_id,
+            "project_name": project_name,
+            "kind": kind,
+            "options": options or {},
+            "status": QUEUED,
+            "stage": None,
+            "progress": 0,
+            "cancel_requested": False,
+            "created_at": datetime.utcnow(),
+            "heartbeat_at": datetime.utcnow(),
+        }).inserted_id
+        self._start_heartbeat()
+        future = self.executor.submit(run_job, self.mongo_uri, self.db_name, job_id)
+        self._futures[job_id] = future
+        future.add_done_callback(lambda f: self._on_done(job_id, f))
+        return job_id
+
+    def is_stale(self, job):
+        """True si le job est actif mais que son processus n'envoie plus de heartbeat."""
+        heartbeat_at = job.get("heartbeat_at")
+        if job["status"] not in ACTIVE_STATUSES or job["_id"] in self._futures:
+            return False
+        return heartbeat_at is None or heartbeat_at < datetime.utcnow() - JOB_STALE_AFTER
+
+    def cancel(self, job_id):
+        """
+        Demande l'annulation d'un job.
+
+        Un job encore en file est annulé immédiatement, de même qu'un job
+        actif qu'aucun processus ne fait plus avancer (pas de future local
+        et plus de heartbeat). Un job en cours dans un processus vivant
+        s'arrête à sa prochaine étape (voir run_job).
+        """
+        job = self.jobs_collection.find_one_and_update(
+            {"_id": job_id, "status": {"$in": ACTIVE_STATUSES}},
+            {"$set": {"cancel_requested": True}},
+        )
+        if job is None:
+            return
+        future = self._futures.get(job_id)
+        if future is not None:
+            if future.cancel():
+                finish_job(self.jobs_collection, job_id, CANCELLED)
+        elif self.is_stale(job):
+            self.jobs_collection.update_one(
+                {"_id": job_id, "status": {"$in": ACTIVE_STATUSES}},
+                {"$set": {"status": CANCELLED, "finished_at": datetime.utcnow()}},
+            )
+
+    def _on_done(self, job_id, future):
+        self._futures.pop(job_id, None)
+        if future.cancelled():
+            return
+        error = future.exception()
+        if error is not None:
+            # Processus du pool interrompu avant d'avoir pu enregistrer le statut
+            self.jobs_collection.update_one(
+                {"_id": job_id, "status": {"$in": ACTIVE_STATUSES}},
+                {"$set": {
+                    "status": FAILED,
+                    "error": f"Unexpected error: {str(error)}",
+                    "finished_at": datetime.utcnow(),
+                }}
+            )
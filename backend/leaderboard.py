@@ -0,0 +1,243 @@
+import os
+import time
+import shutil
+import tempfile
+import multiprocessing
+from multiprocessing.connection import wait
+import joblib as jb
+import pandas as pd
+from sklearn.model_selection import train_test_split
+import supervised_models
+
+# Statuts d'un algorithme candidat
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+TIMEOUT = "timeout"
+
+# Métrique de classement par type de modèle : (nom, plus grand est meilleur)
+RANKING_METRICS = {
+    "classification": ("f1_score", True),
+    "regression": ("mse", False),
+}
+
+SPLIT_ARRAYS = ["X_train", "X_test", "y_train", "y_test"]
+# Délai accordé à un worker pour démarrer (imports, lecture du découpage) avant le début du budget
+STARTUP_TIMEOUT = 120
+
+
+def save_split(directory, split):
+    """
+    Écrit les ensembles d'entraînement et de test dans un répertoire, un fichier par matrice.
+
+    Les matrices sont relues par les workers avec load_split en mémoire
+    partagée (mmap) : le jeu de données n'est ni copié ni sérialisé une
+    fois par worker.
+    """
+    for name in SPLIT_ARRAYS:
+        jb.dump(split[name].to_numpy(), os.path.join(directory, f"{name}.joblib"))
+    jb.dump(
+        {"X_columns": split["X_train"].columns.tolist(), "y_name": split["y_train"].name},
+        os.path.join(directory, "columns.joblib"),
+    )
+
+
+def load_split(directory):
+    """Relit en lecture seule (mmap) les matrices écrites par save_split."""
+    # Les colonnes de dtype object ne peuvent pas être projetées en mémoire : joblib les charge normalement
+    arrays = {
+        name: jb.load(os.path.join(directory, f"{name}.joblib"), mmap_mode="r")
+        for name in SPLIT_ARRAYS
+    }
+    columns = jb.load(os.path.join(directory, "columns.joblib"))
+    return {
+        "X_train": pd.DataFrame(arrays["X_train"], columns=columns["X_columns"], copy=False),
+        "X_test": pd.DataFrame(arrays["X_test"], columns=columns["X_columns"], copy=False),
+        "y_train": pd.Series(arrays["y_train"], name=columns["y_name"], copy=False),
+        "y_test": pd.Series(arrays["y_test"], name=columns["y_name"], copy=False),
+        "X_train_columns": columns["X_columns"],
+        "X_test_columns": columns["X_columns"],
+    }
+
+
+def fit_candidate(split_dir, algo, algorithm_parameters, conn):
+    """
+    Entraîne et évalue un algorithme candidat dans un processus dédié.
+
+    Le worker signale le début du fit (le budget de temps démarre alors),
+    puis envoie le résultat (métriques de model_evaluate ou erreur) au
+    processus parent par conn.
+    """
+    try:
+        split = load_split(split_dir)
+        md = supervised_models.build_model(algo, algorithm_parameters)
+        conn.send({"algo": algo, "status": RUNNING})
+        start = time.perf_counter()
+        md.fit(split["X_train"], split["y_train"])
+        fit_time = time.perf_counter() - start
+        metrics = supervised_models.model_evaluate(dict(split, algo=algo), md)
+        conn.send({"algo": algo, "status": SUCCEEDED, "metrics": metrics, "fit_time": fit_time})
+    except Exception as e:
+        conn.send({"algo": algo, "status": FAILED, "error": str(e)})
+    finally:
+        conn.close()
+
+
+def run_candidates(split_dir, candidates, max_workers, time_budget, progress=None):
+    """
+    Entraîne les algorithmes candidats en parallèle, chacun avec un budget de temps.
+
+    Au plus max_workers processus tournent en même temps. Un candidat dont
+    le fit dépasse time_budget secondes est interrompu et classé en TIMEOUT.
+
+    Args:
+        split_dir: Le répertoire écrit par save_split
+        candidates: Liste de tuples (algorithme, paramètres)
+        max_workers: Le nombre maximal de processus simultanés
+        time_budget: Le temps maximal d'entraînement d'un candidat, en secondes
+        progress: Fonction optionnelle progress(done, total) appelée après chaque candidat
+
+    Returns:
+        list: Un résultat par candidat, dans l'ordre de fin d'exécution
+    """
+    context = multiprocessing.get_context("spawn")
+    pending = list(candidates)
+    running = {}
+    results = []
+
+    def finish(receiver, result):
+        process = running.pop(receiver)[0]
+        process.join(1)
+        if process.is_alive():
+            process.terminate()
+        receiver.close()
+        results.append(result)
+        if progress is not None:
+            progress(len(results), len(candidates))
+
+    try:
+        while pending or running:
+            while pending and len(running) < max_workers:
+                algo, algorithm_parameters = pending.pop(0)
+                receiver, sender = context.Pipe(duplex=False)
+                process = context.Process(
+                    target=fit_candidate, args=(split_dir, algo, algorithm_parameters, sender)
+                )
+                process.start()
+                sender.close()
+                running[receiver] = (process, algo, time.monotonic() + STARTUP_TIMEOUT)
+
+            next_deadline = min(deadline for _, _, deadline in running.values())
+            for receiver in wait(list(running), timeout=max(0, next_deadline - time.monotonic())):
+                algo = running[receiver][1]
+                try:
+                    result = receiver.recv()
+                except EOFError:
+                    # Processus terminé sans résultat (mémoire insuffisante, crash natif...)
+                    process = running[receiver][0]
+                    process.join(1)
+                    exitcode = process.exitcode
+                    result = {"algo": algo, "status": FAILED, "error": f"Processus interrompu (code {exitcode})"}
+                if result["status"] == RUNNING:
+                    running[receiver] = (running[receiver][0], algo, time.monotonic() + time_budget)
+                    continue
+                finish(receiver, result)
+
+            now = time.monotonic()
+            for receiver, (process, algo, deadline) in list(running.items()):
+                if deadline <= now:
+                    process.terminate()
+                    finish(receiver, {
+                        "algo": algo,
+                        "status": TIMEOUT,
+                        "error": f"Budget de temps dépassé ({time_budget} s)",
+                    })
+    finally:
+        # Annulation ou erreur : ne laisser aucun entraînement orphelin
+        for process, _, _ in running.values():
+            process.terminate()
+    return results
+
+
+def rank(results, model_type):
+    """Trie les résultats du meilleur au moins bon ; les candidats en échec sont placés à la fin."""
+    metric, higher_is_better = RANKING_METRICS[model_type]
+    succeeded = [result for result in results if result["status"] == SUCCEEDED]
+    succeeded.sort(key=lambda result: result["metrics"][metric], reverse=higher_is_better)
+    others = sorted(
+        (result for result in results if result["status"] != SUCCEEDED),
+        key=lambda result: result["algo"],
+    )
+    for position, result in enumerate(succeeded, start=1):
+        result["rank"] = position
+    for result in others:
+        result["rank"] = None
+    return succeeded + others
+
+
+def build_leaderboard(project, data, algorithms=None, algorithm_parameters=None,
+                      max_workers=2, time_budget=300, progress=None):
+    """
+    Entraîne plusieurs algorithmes sur un même découpage train/test et les classe.
+
+    Le prétraitement du projet est appliqué une seule fois, puis le
+    découpage est écrit sur disque et partagé par tous les workers.
+
+    Args:
+        project: Le document du projet (model_type, features, prétraitement...)
+        data: Le DataFrame du dataset, projeté sur training_columns(project)
+        algorithms: Les algorithmes à comparer (tous ceux du model_type si None)
+        algorithm_parameters: Paramètres optionnels par algorithme {algo: {param: valeur}}
+        max_workers: Le nombre de processus d'entraînement simultanés
+        time_budget: Le temps maximal d'entraînement d'un algorithme, en secondes
+        progress: Fonction optionnelle progress(done, total)
+
+    Returns:
+        dict: Le classement (metric, entries) au format JSON
+    """
+    model_type = project.get("model_type")
+    if project.get("learning_type") != "supervised" or model_type not in RANKING_METRICS:
+        raise ValueError("Le classement n'est disponible que pour la classification et la régression.")
+    target_feature = project.get("target_feature")
+    if not target_feature:
+        raise ValueError("Target feature not selected.")
+
+    compatible = supervised_models.candidate_algorithms(model_type)
+    algorithms = algorithms or compatible
+    unknown = [algo for algo in algorithms if algo not in compatible]
+    if unknown:
+        raise ValueError(f"Algorithmes incompatibles avec {model_type} : {', '.join(unknown)}")
+    algorithm_parameters = algorithm_parameters or {}
+
+    selected_features = project.get("selected_features")
+    X = data[selected_features] if selected_features else data.drop(columns=[target_feature])
+    y = data[target_feature]
+    X_processed, y_processed, _ = supervised_models.preprocess_data(
+        X, y, project.get("enable_preprocessing"), project.get("preprocessing_options")
+    )
+    # Même découpage que model_train : les scores sont comparables à un entraînement simple
+    X_train, X_test, y_train, y_test = train_test_split(
+        X_processed, y_processed, test_size=0.2, random_state=42
+    )
+
+    split_dir = tempfile.mkdtemp(prefix="leaderboard_")
+    try:
+        save_split(split_dir, {"X_train": X_train, "X_test": X_test, "y_train": y_train, "y_test": y_test})
+        results = run_candidates(
+            split_dir,
+            [(algo, algorithm_parameters.get(algo)) for algo in algorithms],
+            max_workers=max_workers,
+            time_budget=time_budget,
+            progress=progress,
+        )
+    finally:
+        shutil.rmtree(split_dir, ignore_errors=True)
+
+    metric, higher_is_better = RANKING_METRICS[model_type]
+    return {
+        "model_type": model_type,
+        "metric": metric,
+        "higher_is_better": higher_is_better,
+        "time_budget": time_budget,
+        "entries": rank(results, model_type),
+    }
@@ -0,0 +1,93 @@
+import io
+import os
+import gzip
+import shutil
+import tempfile
+import joblib as jb
+from artifacts import upload_stream
+
+# Type MIME des modèles enregistrés par save_model (fichier joblib compressé en gzip)
+MODEL_CONTENT_TYPE = "application/x-joblib-gzip"
+# Répertoire local des modèles décompressés, relus en mémoire partagée (mmap)
+MODEL_ARTIFACT_DIR = os.environ.get(
+    "MODEL_ARTIFACT_DIR", os.path.join(tempfile.gettempdir(), "automl_models")
+)
+COPY_BUFFER_SIZE = 1024 * 1024
+
+
+def save_model(fs, model, filename):
+    """
+    Enregistre un modèle dans GridFS au format joblib compressé.
+
+    Le modèle est d'abord écrit sans compression dans un fichier
+    temporaire : joblib y range chaque matrice NumPy dans un bloc
+    contigu, projetable en mémoire au chargement. Ce fichier est ensuite
+    compressé en gzip par blocs directement dans GridFS, sans jamais
+    être entièrement chargé en mémoire.
+
+    Args:
+        fs: L'instance GridFS
+        model: Le modèle entraîné (estimateur, Pipeline ou ClusterModel)
+        filename: Le nom du fichier GridFS
+
+    Returns:
+        ObjectId: L'identifiant du fichier GridFS
+    """
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "model.joblib")
+        jb.dump(model, path)
+        raw_bytes = os.path.getsize(path)
+        with open(path, "rb") as source, upload_stream(
+            fs, filename, MODEL_CONTENT_TYPE, metadata={"raw_bytes": raw_bytes}
+        ) as target:
+            with gzip.GzipFile(fileobj=target, mode="wb", compresslevel=6) as compressed:
+                shutil.copyfileobj(source, compressed, COPY_BUFFER_SIZE)
+        return target._id
+
+
+def local_path(model_id):
+    return os.path.join(MODEL_ARTIFACT_DIR, f"{model_id}.joblib")
+
+
+def load_model(fs, model_id):
+    """
+    Charge un modèle enregistré dans GridFS.
+
+    Les modèles enregistrés par save_model sont décompressés une fois dans
+    MODEL_ARTIFACT_DIR puis chargés avec mmap_mode="r" : leurs matrices
+    restent dans le cache de pages du système et ne sont lues qu'à
+    l'utilisation. Les anciens modèles (pickle ou joblib non compressé)
+    sont chargés entièrement en mémoire, comme avant.
+
+    Returns:
+        tuple: (modèle, taille décompressée en octets)
+    """
+    model_file = fs.get(model_id)
+    if model_file.content_type != MODEL_CONTENT_TYPE:
+        return jb.load(io.BytesIO(model_file.read())), model_file.length
+
+    path = local_path(model_id)
+    if not os.path.exists(path):
+        os.makedirs(MODEL_ARTIFACT_DIR, exist_ok=True)
+        # Écriture dans un fichier temporaire puis renommage : un lecteur concurrent ne voit jamais un fichier partiel
+        fd, partial = tempfile.mkstemp(dir=MODEL_ARTIFACT_DIR, suffix=".partial")
+        try:
+            with os.fdopen(fd, "wb") as target, gzip.GzipFile(fileobj=model_file, mode="rb") as source:
+                shutil.copyfileobj(source, target, COPY_BUFFER_SIZE)
+            os.replace(partial, path)
+        except Exception:
+            os.remove(partial)
+            raise
+    metadata = model_file.metadata or {}
+    return jb.load(path, mmap_mode="r"), metadata.get("raw_bytes", model_file.length)
+
+
+def discard_local_copy(model_id):
+    """Supprime la copie décompressée d'un modèle (réentraînement ou suppression du projet)."""
+    try:
+        os.remove(local_path(model_id))
+    except FileNotFoundError:
+        pass
+    except OSError as e:
+        # Windows : un fichier encore projeté en mémoire ne peut pas être supprimé
+        print(f"Copie locale du modèle {model_id} non supprimée: {str(e)}")
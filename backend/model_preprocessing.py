@@ -0,0 +1,103 @@
+import numpy as np
+import pandas as pd
+from sklearn.base import BaseEstimator, TransformerMixin, OneToOneFeatureMixin
+from sklearn.compose import ColumnTransformer
+from sklearn.feature_selection import SelectKBest, f_classif, f_regression
+from sklearn.impute import SimpleImputer
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import MinMaxScaler, StandardScaler, OneHotEncoder
+
+
+class IQRClipper(OneToOneFeatureMixin, TransformerMixin, BaseEstimator):
+    """Ramène les valeurs numériques aberrantes aux bornes [Q1 - 1.5*IQR, Q3 + 1.5*IQR] apprises au fit."""
+
+    def fit(self, X, y=None):
+        X = pd.DataFrame(X)
+        self.feature_names_in_ = np.asarray(X.columns, dtype=object)
+        self.n_features_in_ = X.shape[1]
+        numeric = X.select_dtypes(include=['number'])
+        q1 = numeric.quantile(0.25)
+        q3 = numeric.quantile(0.75)
+        iqr = q3 - q1
+        self.lower_ = q1 - 1.5 * iqr
+        self.upper_ = q3 + 1.5 * iqr
+        return self
+
+    def transform(self, X):
+        X = pd.DataFrame(X, columns=self.feature_names_in_).copy()
+        columns = list(self.lower_.index)
+        X[columns] = X[columns].clip(lower=self.lower_, upper=self.upper_, axis=1)
+        return X
+
+
+def fit_preprocessor(X, y=None, preprocessing_options=None):
+    """
+    Ajuste les étapes de prétraitement sélectionnées et les assemble en Pipeline.
+
+    Les étapes sont ajustées une à une, dans l'ordre historique de
+    preprocess_data : imputation, encodage, normalisation, standardisation,
+    outliers puis sélection de caractéristiques (si y est fourni). Le
+    Pipeline retourné ne fait plus que des transform : il est sérialisé
+    avec le modèle et rejoué à la prédiction.
+
+    Args:
+        X: Les features brutes (DataFrame)
+        y: La variable cible, pour la sélection de caractéristiques (optionnelle)
+        preprocessing_options: Liste des options de prétraitement sélectionnées
+
+    Returns:
+        tuple: (Pipeline ajusté ou None si aucune étape, features prétraitées)
+    """
+    preprocessing_options = preprocessing_options or []
+    numeric_cols = X.select_dtypes(include=['number']).columns.tolist()
+    categorical_cols = X.select_dtypes(exclude=['number']).columns.tolist()
+    steps = []
+    X_processed = X
+
+    def add_step(name, transformer):
+        nonlocal X_processed
+        transformer.set_output(transform='pandas')
+        X_processed = transformer.fit_transform(X_processed, y)
+        steps.append((name, transformer))
+
+    # Gestion des valeurs manquantes : médiane (numériques) et mode (catégorielles)
+    if 'missing_values' in preprocessing_options:
+        add_step('missing_values', ColumnTransformer(
+            [
+                ('numeric', SimpleImputer(strategy='median'), numeric_cols),
+                ('categorical', SimpleImputer(strategy='most_frequent'), categorical_cols),
+            ],
+            remainder='passthrough',
+            verbose_feature_names_out=False,
+        ))
+
+    # Encodage one-hot des variables catégorielles (première modalité supprimée, comme get_dummies)
+    if 'encode_categorical' in preprocessing_options and categorical_cols:
+        add_step('encode_categorical', ColumnTransformer(
+            [(
+                'onehot',
+                OneHotEncoder(drop='first', handle_unknown='ignore', sparse_output=False),
+                categorical_cols,
+            )],
+            remainder='passthrough',
+            verbose_feature_names_out=False,
+        ))
+
+    if 'normalize' in preprocessing_options:
+        add_step('normalize', MinMaxScaler())
+
+    if 'standardize' in preprocessing_options:
+        add_step('standardize', StandardScaler())
+
+    if 'outliers' in preprocessing_options:
+        add_step('outliers', IQRClipper())
+
+    # Sélection de caractéristiques (au maximum 10) si le jeu prétraité en compte plus de 5
+    if 'feature_selection' in preprocessing_options and y is not None and X_processed.shape[1] > 5:
+        k = min(10, X_processed.shape[1])
+        score_func = f_regression if np.issubdtype(y.dtype, np.number) else f_classif
+        add_step('feature_selection', SelectKBest(score_func, k=k))
+
+    if not steps:
+        return None, X
+    return Pipeline(steps), X_processed
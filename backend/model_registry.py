@@ -0,0 +1,49 @@
+import threading
+from cache import LRUCache
+from model_artifacts import load_model, discard_local_copy
+
+
+class ModelRegistry:
+    """
+    Cache des modèles désérialisés, indexé par model_id.
+
+    Un fichier modèle GridFS n'est jamais modifié : un nouvel entraînement
+    écrit un nouveau model_id. Le registre retient le model_id courant de
+    chaque projet et libère l'ancien modèle dès qu'un nouveau est demandé
+    ou que le projet est réentraîné / supprimé.
+
+    Args:
+        fs: L'instance GridFS
+        max_bytes: Budget mémoire (taille décompressée des modèles sérialisés)
+    """
+
+    def __init__(self, fs, max_bytes):
+        self.fs = fs
+        # Les entrées sont des tuples (modèle, taille décompressée du modèle)
+        self._cache = LRUCache(max_bytes, sizeof=lambda entry: entry[1])
+        self._current = {}
+        self._lock = threading.Lock()
+
+    def load(self, user_id, project_name, model_id):
+        """Retourne le modèle model_id du projet, chargé depuis GridFS au premier appel."""
+        key = (user_id, project_name)
+        with self._lock:
+            previous = self._current.get(key)
+            self._current[key] = model_id
+        if previous is not None and previous != model_id:
+            self._cache.invalidate(previous)
+            discard_local_copy(previous)
+
+        entry = self._cache.get(model_id)
+        if entry is None:
+            entry = load_model(self.fs, model_id)
+            self._cache.put(model_id, entry)
+        return entry[0]
+
+    def invalidate(self, user_id, project_name):
+        """Libère le modèle en cache d'un projet (réentraînement ou suppression)."""
+        with self._lock:
+            model_id = self._current.pop((user_id, project_name), None)
+        if model_id is not None:
+            self._cache.invalidate(model_id)
+            discard_local_copy(model_id)
@@ -0,0 +1,198 @@
+import io
+import base64
+import numpy as np
+import matplotlib
+matplotlib.use("Agg")  # Utiliser le backend non interactif
+import matplotlib.pyplot as plt
+
+# Nombre de cellules de la grille (par axe) utilisée pour estimer la densité des nuages de points
+DENSITY_BINS = 64
+# Nombre minimal de points gardés par classe ou cluster (les petites classes restent visibles)
+MIN_POINTS_PER_LABEL = 20
+
+
+def lttb(y, budget):
+    """
+    Sous-échantillonne une courbe avec Largest-Triangle-Three-Buckets.
+
+    Les points sont répartis en budget - 2 intervalles consécutifs ; dans
+    chaque intervalle, le point gardé est celui qui forme le plus grand
+    triangle avec le point gardé précédent et la moyenne de l'intervalle
+    suivant. Les pics et les creux de la courbe sont conservés.
+
+    Args:
+        y: Les valeurs de la courbe, dans l'ordre des abscisses (x = position)
+        budget: Le nombre de points à garder
+
+    Returns:
+        ndarray: Les positions des points gardés, croissantes
+    """
+    y = np.asarray(y, dtype=np.float64)
+    n = len(y)
+    if n <= budget:
+        return np.arange(n)
+    if budget < 3:
+        return np.array([0, n - 1][:budget], dtype=np.int64)
+
+    x = np.arange(n, dtype=np.float64)
+    # Premier et dernier points toujours gardés ; au moins un point par intervalle puisque budget < n
+    edges = np.linspace(1, n - 1, budget - 1).astype(np.int64)
+    selected = np.empty(budget, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+    a = 0
+    for i in range(budget - 2):
+        start, end = edges[i], edges[i + 1]
+        if i + 2 < len(edges):
+            next_end = edges[i + 2]
+            avg_x, avg_y = x[end:next_end].mean(), y[end:next_end].mean()
+        else:
+            avg_x, avg_y = x[n - 1], y[n - 1]
+        area = np.abs(
+            (x[a] - avg_x) * (y[start:end] - y[a])
+            - (x[a] - x[start:end]) * (avg_y - y[a])
+        )
+        a = start + int(np.argmax(area))
+        selected[i + 1] = a
+    return selected
+
+
+def grid_cells(x, y, bins=DENSITY_BINS):
+    """Numéro de cellule d'une grille bins x bins couvrant le nuage de points."""
+    def axis_bins(values):
+        low, span = values.min(), np.ptp(values)
+        if not span:
+            return np.zeros(len(values), dtype=np.int64)
+        return np.minimum(((values - low) / span * bins).astype(np.int64), bins - 1)
+
+    return axis_bins(np.asarray(x, dtype=np.float64)) * bins + axis_bins(np.asarray(y, dtype=np.float64))
+
+
+def stratified_sample(x, y, labels, budget, random_state=42):
+    """
+    Sous-échantillonne un nuage de points étiqueté, par classe et selon la densité.
+
+    Chaque classe (ou cluster) garde une part du budget proportionnelle à
+    son effectif, et au moins MIN_POINTS_PER_LABEL points. Dans une classe,
+    un point est tiré avec une probabilité inversement proportionnelle à la
+    racine du nombre de points de sa cellule : les zones denses sont
+    allégées, les points isolés (frontières, outliers) restent visibles.
+
+    Args:
+        x, y: Les coordonnées des points
+        labels: La classe ou le cluster de chaque point
+        budget: Le nombre de points visé
+
+    Returns:
+        ndarray: Les positions des points gardés, croissantes
+    """
+    n = len(labels)
+    if n <= budget:
+        return np.arange(n)
+    rng = np.random.default_rng(random_state)
+    _, inverse, counts = np.unique(labels, return_inverse=True, return_counts=True)
+    quotas = np.maximum(budget * counts // n, np.minimum(counts, MIN_POINTS_PER_LABEL))
+
+    cells = inverse * DENSITY_BINS * DENSITY_BINS + grid_cells(x, y)
+    _, cell_inverse, cell_counts = np.unique(cells, return_inverse=True, return_counts=True)
+    weights = 1.0 / np.sqrt(cell_counts[cell_inverse])
+
+    selected = []
+    for label, quota in enumerate(quotas):
+        members = np.flatnonzero(inverse == label)
+        if quota >= len(members):
+            selected.append(members)
+            continue
+        p = weights[members]
+        selected.append(rng.choice(members, size=quota, replace=False, p=p / p.sum()))
+    return np.sort(np.concatenate(selected))
+
+
+def regression_points(y_test, predictions, budget):
+    """
+    Points de la courbe y_test / prédictions à afficher.
+
+    LTTB est appliqué à chacune des deux courbes (moitié du budget
+    chacune) ; les deux séries sont ensuite envoyées sur l'union des
+    positions gardées, pour rester comparables point à point.
+
+    Returns:
+        tuple: (colonnes {"index", "y_test", "predictions"}, nombre total de points)
+    """
+    y_test = np.asarray(y_test, dtype=np.float64).ravel()
+    predictions = np.asarray(predictions, dtype=np.float64).ravel()
+    half = max(budget // 2, 3)
+    index = np.union1d(lttb(y_test, half), lttb(predictions, half))
+    return {"index": index, "y_test": y_test[index], "predictions": predictions[index]}, len(y_test)
+
+
+def scatter_points(projection, labels, budget):
+    """
+    Points d'un nuage 2D étiqueté à afficher (voir stratified_sample).
+
+    Returns:
+        tuple: (colonnes {"x_pca_0", "x_pca_1", "labels"}, nombre total de points)
+    """
+    projection = np.asarray(projection)
+    labels = np.asarray(labels)
+    index = stratified_sample(projection[:, 0], projection[:, 1], labels, budget)
+    return {
+        "x_pca_0": projection[index, 0],
+        "x_pca_1": projection[index, 1],
+        "labels": labels[index],
+    }, len(labels)
+
+
+def encode_columns(columns):
+    """
+    Encode des colonnes numériques en binaire compact pour le client.
+
+    Les entiers sont envoyés en int32 et les réels en float32 (petit-boutiste),
+    encodés en base64 : 4 octets par valeur au lieu d'une vingtaine de
+    caractères en JSON.
+
+    Returns:
+        dict: {colonne: {"dtype": "int32" | "float32", "data": base64}}
+    """
+    encoded = {}
+    for name, values in columns.items():
+        values = np.asarray(values)
+        if np.issubdtype(values.dtype, np.integer) or np.issubdtype(values.dtype, np.bool_):
+            dtype, array = "int32", values.astype("<i4")
+        else:
+            dtype, array = "float32", values.astype("<f4")
+        encoded[name] = {
+            "dtype": dtype,
+            "data": base64.b64encode(np.ascontiguousarray(array).tobytes()).decode("ascii"),
+        }
+    return encoded
+
+
+def render_png(plot_type, columns, title, xlabel, ylabel):
+    """
+    Image statique d'un graphique de résultats (export), dessinée à partir des points échantillonnés.
+
+    Returns:
+        bytes: L'image PNG
+    """
+    plt.figure(figsize=(4, 3))
+    if plot_type == "regression":
+        plt.plot(columns["index"], columns["y_test"], label="y_test", color="blue")
+        plt.plot(columns["index"], columns["predictions"], label="y_pred", color="red")
+        plt.legend()
+        plt.grid(True)
+    else:
+        scatter = plt.scatter(
+            columns["x_pca_0"], columns["x_pca_1"], c=columns["labels"], cmap="viridis", marker="o"
+        )
+        # Ajouter une légende
+        legend1 = plt.legend(
+            *scatter.legend_elements(), title="Classes" if plot_type == "classification" else "Clusters"
+        )
+        plt.gca().add_artist(legend1)
+    plt.title(title)
+    plt.xlabel(xlabel)
+    plt.ylabel(ylabel)
+    buf = io.BytesIO()
+    plt.savefig(buf, format="png")
+    plt.close()
+    return buf.getvalue()
@@ -0,0 +1,685 @@
+import os
+import numpy as np
+import pandas as pd
+from sklearn.base import BaseEstimator, TransformerMixin
+from sklearn.decomposition import PCA
+from sklearn.ensemble import IsolationForest
+from sklearn.feature_selection import VarianceThreshold, SelectKBest, RFE, f_classif
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import PowerTransformer
+from sklearn.tree import DecisionTreeClassifier, DecisionTreeRegressor
+from sklearn.utils.multiclass import type_of_target
+
+# Étapes de /preprocessing/apply, dans leur ordre d'exécution
+STEPS = [
+    "normalization",
+    "standardization",
+    "missing_values",
+    "outliers",
+    "encoding",
+    "feature_selection",
+    "transformation",
+]
+
+# Nombre de processus utilisés par Isolation Forest (-1 : tous les cœurs)
+OUTLIER_JOBS = int(os.environ.get("OUTLIER_JOBS", -1))
+
+IMPUTATION_NAMES = {
+    "mean": "Moyenne",
+    "median": "Médiane",
+    "most_frequent": "Valeur la plus fréquente",
+}
+OUTLIER_METHOD_NAMES = {
+    "zscore": "Z-Score",
+    "iqr": "IQR (Écart interquartile)",
+    "isolation_forest": "Isolation Forest",
+}
+OUTLIER_TREATMENT_NAMES = {
+    "remove": "Suppression",
+    "cap": "Plafonnement",
+    "replace_mean": "Remplacement par la moyenne",
+    "replace_median": "Remplacement par la médiane",
+}
+ENCODING_NAMES = {
+    "onehot": "One-Hot Encoding",
+    "label": "Label Encoding",
+    "ordinal": "Ordinal Encoding",
+    "binary": "Binary Encoding",
+}
+FEATURE_SELECTION_NAMES = {
+    "variance": "Seuil de variance",
+    "kbest": "SelectKBest",
+    "rfe": "Élimination récursive",
+    "pca": "Analyse en composantes principales (PCA)",
+}
+TRANSFORMATION_NAMES = {
+    "log": "Logarithmique",
+    "sqrt": "Racine carrée",
+    "boxcox": "Box-Cox",
+    "yeo-johnson": "Yeo-Johnson",
+}
+
+
+def compile_plan(data):
+    """
+    Traduit les options de /preprocessing/apply en plan d'exécution ordonné.
+
+    Chaque étape du plan est un dict {"step", "kind", "columns", ...}. Les
+    étapes de kind "column" transforment des colonnes une à une, sans
+    changer les lignes : build_pipeline les fusionne en un seul passage.
+
+    Args:
+        data: Le JSON de la requête (preprocessing_methods et options de chaque méthode)
+
+    Returns:
+        list: Les étapes du plan, dans l'ordre de STEPS
+    """
+    methods = data.get("preprocessing_methods") or []
+    plan = []
+
+    if "normalization" in methods and data.get("normalization_columns"):
+        method = data.get("normalization_method")
+        if method not in ["minmax", "robust", "maxabs"]:
+            raise ValueError(f"Méthode de normalisation {method} non valide")
+        plan.append({
+            "step": "normalization", "kind": "column", "op": "scale",
+            "method": method, "columns": list(data["normalization_columns"]),
+        })
+
+    if "standardization" in methods and data.get("standardization_columns"):
+        plan.append({
+            "step": "standardization", "kind": "column", "op": "scale",
+            "method": "standard", "columns": list(data["standardization_columns"]),
+        })
+
+    if "missing_values" in methods and data.get("missing_values_columns"):
+        strategy = data.get("missing_values_strategy", "mean")
+        columns = list(data["missing_values_columns"])
+        if strategy == "drop":
+            plan.append({"step": "missing_values", "kind": "frame", "op": "drop_missing", "columns": columns})
+        elif strategy in ["mean", "median", "most_frequent", "constant"]:
+            plan.append({
+                "step": "missing_values", "kind": "column", "op": "impute", "strategy": strategy,
+                "fill_value": data.get("missing_values_constant_value", "0"), "columns": columns,
+            })
+        else:
+            raise ValueError(f"Stratégie de valeurs manquantes {strategy} non valide")
+
+    if "outliers" in methods and data.get("outliers_columns"):
+        method = data.get("outliers_method", "zscore")
+        treatment = data.get("outliers_treatment", "remove")
+        if method not in OUTLIER_METHOD_NAMES:
+            raise ValueError(f"Méthode de détection des outliers {method} non valide")
+        if treatment not in OUTLIER_TREATMENT_NAMES:
+            raise ValueError(f"Traitement des outliers {treatment} non valide")
+        # Suppression de lignes ou modèle ajusté sur la colonne : étape sur le DataFrame entier
+        kind = "frame" if treatment == "remove" or method == "isolation_forest" else "column"
+        plan.append({
+            "step": "outliers", "kind": kind, "op": "outliers", "method": method,
+            "treatment": treatment, "columns": list(data["outliers_columns"]),
+            "multivariate": method == "isolation_forest" and bool(data.get("outliers_multivariate")),
+        })
+
+    if "encoding" in methods and data.get("encoding_columns"):
+        method = data.get("encoding_method", "onehot")
+        if method not in ENCODING_NAMES:
+            raise ValueError(f"Méthode d'encodage {method} non valide")
+        plan.append({
+            "step": "encoding", "kind": "frame", "op": "encoding",
+            "method": method, "columns": list(data["encoding_columns"]),
+        })
+
+    if "feature_selection" in methods:
+        method = data.get("feature_selection_method", "variance")
+        if method not in FEATURE_SELECTION_NAMES:
+            raise ValueError(f"Méthode de sélection de caractéristiques {method} non valide")
+        plan.append({
+            "step": "feature_selection", "kind": "frame", "op": "feature_selection",
+            "method": method,
+            "n_components": int(data.get("feature_selection_n_components", 5)),
+            "columns": [],
+        })
+
+    if "transformation" in methods and data.get("transformation_columns"):
+        method = data.get("transformation_method", "log")
+        if method not in TRANSFORMATION_NAMES:
+            raise ValueError(f"Méthode de transformation {method} non valide")
+        plan.append({
+            "step": "transformation", "kind": "column", "op": "transform",
+            "method": method, "columns": list(data["transformation_columns"]),
+        })
+    return plan
+
+
+def build_pipeline(plan):
+    """
+    Assemble un plan en Pipeline scikit-learn non ajusté.
+
+    Les étapes "column" consécutives forment un seul ColumnOps : leurs
+    colonnes sont extraites une fois dans un bloc NumPy, transformées sur
+    place, puis réécrites une fois. Les autres étapes (suppression de
+    lignes, encodage, sélection de caractéristiques) sont des
+    transformateurs DataFrame -> DataFrame.
+    """
+    steps = []
+    group = []
+
+    def close_group():
+        if group:
+            name = "+".join(dict.fromkeys(operation["step"] for operation in group))
+            steps.append((name, ColumnOps(list(group))))
+            group.clear()
+
+    for operation in plan:
+        if operation["kind"] == "column":
+            group.append(operation)
+            continue
+        close_group()
+        if operation["op"] == "drop_missing":
+            steps.append((operation["step"], DropMissingRows(operation["columns"])))
+        elif operation["op"] == "outliers":
+            steps.append((operation["step"], OutlierFilter(
+                operation["method"], operation["treatment"], operation["columns"], operation["multivariate"]
+            )))
+        elif operation["op"] == "encoding":
+            steps.append((operation["step"], CategoricalEncoder(operation["method"], operation["columns"])))
+        elif operation["op"] == "feature_selection":
+            steps.append((operation["step"], FeatureSelector(operation["method"], operation["n_components"])))
+    close_group()
+    if not steps:
+        raise ValueError("Aucune méthode de prétraitement applicable.")
+    return Pipeline(steps)
+
+
+def applied_methods(pipeline):
+    """Résumé des méthodes appliquées par un Pipeline ajusté (format de preprocessing_results)."""
+    return [summary for _, step in pipeline.steps for summary in step.summaries_]
+
+
+def outlier_bounds(x, method):
+    """Bornes [basse, haute] par colonne : moyenne ± 3 écarts-types (zscore) ou Q1/Q3 ± 1.5 IQR."""
+    if method == "zscore":
+        mean = np.nanmean(x, axis=0)
+        std = np.nanstd(x, axis=0, ddof=1)
+        return mean - 3 * std, mean + 3 * std
+    q1, q3 = np.nanpercentile(x, [25, 75], axis=0)
+    iqr = q3 - q1
+    return q1 - 1.5 * iqr, q3 + 1.5 * iqr
+
+
+def replacement_values(x, treatment):
+    return np.nanmean(x, axis=0) if treatment == "replace_mean" else np.nanmedian(x, axis=0)
+
+
+def column_mode(x):
+    """Valeur la plus fréquente de chaque colonne (la plus petite en cas d'égalité, comme SimpleImputer)."""
+    return np.array([
+        pd.Series(x[:, i]).mode().iloc[0] if not np.isnan(x[:, i]).all() else np.nan
+        for i in range(x.shape[1])
+    ])
+
+
+def fit_scaling(x, method):
+    """Coefficients (a, b) de la mise à l'échelle x * a + b, calculés sans les valeurs manquantes."""
+    if method == "minmax":
+        low = np.nanmin(x, axis=0)
+        scale = np.nanmax(x, axis=0) - low
+    elif method == "robust":
+        low = np.nanmedian(x, axis=0)
+        q1, q3 = np.nanpercentile(x, [25, 75], axis=0)
+        scale = q3 - q1
+    elif method == "maxabs":
+        low = np.zeros(x.shape[1])
+        scale = np.nanmax(np.abs(x), axis=0)
+    else:
+        low = np.nanmean(x, axis=0)
+        scale = np.nanstd(x, axis=0)
+    # Colonne constante : pas de mise à l'échelle (comme scikit-learn)
+    scale = np.where(scale == 0, 1.0, scale)
+    a = 1.0 / scale
+    # Même arrondi que MinMaxScaler : le minimum devient exactement 0
+    return a, -low * a
+
+
+class ColumnOps(TransformerMixin, BaseEstimator):
+    """
+    Opérations colonne par colonne fusionnées en un seul passage.
+
+    Les opérations (mise à l'échelle, imputation, plafonnement ou
+    remplacement des outliers, transformations log/racine/puissance) sont
+    ajustées dans l'ordre, chacune sur le résultat des précédentes. Elles
+    sont compilées en programme : les mises à l'échelle et imputations
+    successives deviennent une seule opération affine x * a + b avec
+    valeur de remplacement des NaN, appliquée sur toutes les colonnes du
+    bloc à la fois.
+
+    Args:
+        operations: Les étapes "column" du plan (voir compile_plan)
+    """
+
+    def __init__(self, operations=None):
+        self.operations = operations
+
+    def fit(self, X, y=None):
+        self.fit_transform(X, y)
+        return self
+
+    def fit_transform(self, X, y=None):
+        self.columns_ = []
+        self.object_fills_ = {}
+        self.program_ = []
+        self.summaries_ = []
+        targets = []
+        for operation in self.operations:
+            columns = operation["columns"]
+            if operation["op"] == "transform":
+                # Colonnes éventuellement supprimées par l'encodage ou la sélection de caractéristiques
+                columns = [column for column in columns if column in X.columns]
+            targets.append(columns)
+            for column in columns:
+                if operation["op"] == "impute" and not pd.api.types.is_numeric_dtype(X[column]):
+                    continue
+                if column not in self.columns_:
+                    self.columns_.append(column)
+
+        position = {column: i for i, column in enumerate(self.columns_)}
+        block = self.extract(X)
+        for operation, columns in zip(self.operations, targets):
+            numeric = [column for column in columns if column in position]
+            index = np.array([position[column] for column in numeric], dtype=np.intp)
+            for instruction in self.fit_operation(operation, columns, numeric, block[:, index], X):
+                instruction = (instruction[0], index) + instruction[1:]
+                self.run(block, instruction)
+                self.append(instruction)
+        return self.write(X, block)
+
+    def fit_operation(self, operation, columns, numeric, x, X):
+        """Ajuste une opération sur le bloc courant et retourne ses instructions (sans les index)."""
+        op = operation["op"]
+        n = x.shape[1]
+        if op == "scale":
+            a, b = fit_scaling(x, operation["method"])
+            if operation["step"] == "normalization":
+                self.summaries_.append({
+                    "name": "Normalization",
+                    "params": {"Method": operation["method"], "Columns": ", ".join(columns)},
+                })
+            else:
+                self.summaries_.append({"name": "Standardization", "params": {"Columns": ", ".join(columns)}})
+            return [("affine", a, b, np.full(n, np.nan))]
+
+        if op == "impute":
+            strategy = operation["strategy"]
+            for column in columns:
+                if column in numeric:
+                    continue
+                # Colonnes non numériques : seules les stratégies most_frequent et constant s'appliquent
+                if strategy == "most_frequent":
+                    modes = X[column].mode()
+                    self.object_fills_[column] = modes.iloc[0] if len(modes) else None
+                elif strategy == "constant":
+                    self.object_fills_[column] = operation["fill_value"]
+                else:
+                    raise ValueError(f"Impossible d'utiliser la stratégie {strategy} sur la colonne non numérique {column}")
+            if strategy == "mean":
+                fill = np.nanmean(x, axis=0)
+            elif strategy == "median":
+                fill = np.nanmedian(x, axis=0)
+            elif strategy == "most_frequent":
+                fill = column_mode(x)
+            else:
+                fill = np.full(n, float(operation["fill_value"]))
+            strategy_name = (
+                f"Valeur constante ({operation['fill_value']})"
+                if strategy == "constant"
+                else IMPUTATION_NAMES[strategy]
+            )
+            self.summaries_.append({
+                "name": "missing_values",
+                "params": {"Stratégie": strategy_name, "columns": ", ".join(columns)},
+            })
+            return [("affine", np.ones(n), np.zeros(n), fill)]
+
+        if op == "outliers":
+            method, treatment = operation["method"], operation["treatment"]
+            low, high = outlier_bounds(x, method)
+            detected = int(((x < low) | (x > high)).sum())
+            self.summaries_.append(outlier_summary(method, treatment, columns, detected))
+            if treatment == "cap":
+                return [("clip", low, high)]
+            return [("replace", low, high, replacement_values(x, treatment))]
+
+        method = operation["method"]
+        self.summaries_.append({
+            "name": "transformation",
+            "params": {"Méthode": TRANSFORMATION_NAMES[method], "columns": ", ".join(columns)},
+        })
+        if method == "yeo-johnson":
+            return [("power", PowerTransformer(method="yeo-johnson").fit(x))]
+        low = np.nanmin(x, axis=0)
+        if method == "sqrt":
+            # Valeurs ramenées à [0, +inf[ avant la racine
+            return [("affine", np.ones(n), np.where(low < 0, -low, 0.0), np.full(n, np.nan)), ("sqrt",)]
+        # log et Box-Cox : valeurs ramenées à [1, +inf[
+        instructions = [("affine", np.ones(n), np.where(low <= 0, 1 - low, 0.0), np.full(n, np.nan))]
+        if method == "log":
+            return instructions + [("log",)]
+        shifted = x + instructions[0][2]
+        transformers = []
+        for i in range(n):
+            try:
+                transformers.append(PowerTransformer(method="box-cox").fit(shifted[:, [i]]))
+            except Exception:
+                # En cas d'erreur, utiliser Yeo-Johnson qui est plus flexible
+                transformers.append(PowerTransformer(method="yeo-johnson").fit(shifted[:, [i]]))
+        return instructions + [("boxcox", transformers)]
+
+    def append(self, instruction):
+        """Ajoute une instruction au programme, fusionnée avec l'opération affine précédente si possible."""
+        if instruction[0] == "affine":
+            k = len(self.columns_)
+            a, b, fill = np.ones(k), np.zeros(k), np.full(k, np.nan)
+            index = instruction[1]
+            a[index], b[index], fill[index] = instruction[2], instruction[3], instruction[4]
+            if self.program_ and self.program_[-1][0] == "affine":
+                _, previous_a, previous_b, previous_fill = self.program_.pop()
+                # Une valeur manquante remplacée par la première opération passe par la seconde
+                fill = np.where(np.isnan(previous_fill), fill, a * previous_fill + b)
+                a, b = a * previous_a, a * previous_b + b
+            self.program_.append(("affine", a, b, fill))
+        else:
+            self.program_.append(instruction)
+
+    @staticmethod
+    def run(block, instruction):
+        """Exécute une instruction sur le bloc, en place."""
+        kind = instruction[0]
+        if kind == "affine":
+            # Instruction du programme (toutes les colonnes) ou en cours d'ajustement (colonnes indexées)
+            if len(instruction) == 4:
+                _, a, b, fill = instruction
+                missing = np.isnan(block)
+                block *= a
+                block += b
+                np.copyto(block, np.broadcast_to(fill, block.shape), where=missing)
+                return
+            _, index, a, b, fill = instruction
+            x = block[:, index]
+            block[:, index] = np.where(np.isnan(x), fill, x * a + b)
+            return
+        index = instruction[1]
+        x = block[:, index]
+        if kind == "clip":
+            block[:, index] = np.clip(x, instruction[2], instruction[3])
+        elif kind == "replace":
+            _, _, low, high, values = instruction
+            block[:, index] = np.where((x < low) | (x > high), values, x)
+        elif kind == "log":
+            block[:, index] = np.log(x)
+        elif kind == "sqrt":
+            block[:, index] = np.sqrt(x)
+        elif kind == "power":
+            block[:, index] = instruction[2].transform(x)
+        elif kind == "boxcox":
+            block[:, index] = np.column_stack([
+                transformer.transform(x[:, [i]])[:, 0] for i, transformer in enumerate(instruction[2])
+            ])
+
+    def extract(self, X):
+        # Ordre Fortran : chaque colonne est contiguë, une seule copie des données
+        block = np.empty((len(X), len(self.columns_)), dtype=np.float64, order="F")
+        for i, column in enumerate(self.columns_):
+            block[:, i] = X[column].to_numpy(dtype=np.float64, na_value=np.nan)
+        return block
+
+    def write(self, X, block):
+        # Copie superficielle : le DataFrame d'entrée (partagé par le cache) n'est pas modifié
+        output = X.copy(deep=False)
+        for i, column in enumerate(self.columns_):
+            output[column] = block[:, i]
+        if self.object_fills_:
+            output = output.fillna(self.object_fills_)
+        return output
+
+    def transform(self, X):
+        block = self.extract(X)
+        for instruction in self.program_:
+            self.run(block, instruction)
+        return self.write(X, block)
+
+
+def outlier_summary(method, treatment, columns, detected):
+    return {
+        "name": "outliers detection",
+        "params": {
+            "Méthode": OUTLIER_METHOD_NAMES.get(method, method),
+            "Traitement": OUTLIER_TREATMENT_NAMES.get(treatment, treatment),
+            "columns": ", ".join(columns),
+            "Outliers détectés": str(detected),
+        },
+    }
+
+
+class DropMissingRows(TransformerMixin, BaseEstimator):
+    """Supprime les lignes ayant une valeur manquante dans l'une des colonnes."""
+
+    def __init__(self, columns=None):
+        self.columns = columns
+
+    def fit(self, X, y=None):
+        self.fit_transform(X, y)
+        return self
+
+    def fit_transform(self, X, y=None):
+        output = self.transform(X)
+        self.summaries_ = [{
+            "name": "missing_values",
+            "params": {
+                "Stratégie": "Suppression des lignes",
+                "columns": ", ".join(self.columns),
+                "Lignes supprimées": str(len(X) - len(output)),
+            },
+        }]
+        return output
+
+    def transform(self, X):
+        return X.dropna(subset=self.columns)
+
+
+class OutlierFilter(TransformerMixin, BaseEstimator):
+    """
+    Outliers traités sur le DataFrame entier : suppression des lignes, ou Isolation Forest.
+
+    Les colonnes sélectionnées sont extraites une fois dans un bloc NumPy :
+    les bornes z-score / IQR de toutes les colonnes sont calculées en un
+    passage vectorisé, et les masques par colonne combinés pour supprimer
+    les lignes en un seul filtrage. Isolation Forest ajuste une forêt par
+    colonne, ou une seule forêt sur toutes les colonnes (multivariate),
+    sur tous les cœurs.
+
+    Args:
+        method: "zscore", "iqr" ou "isolation_forest"
+        treatment: "remove", "cap", "replace_mean" ou "replace_median"
+        columns: Les colonnes numériques à traiter
+        multivariate: Isolation Forest uniquement : une forêt pour toutes les colonnes
+    """
+
+    def __init__(self, method="zscore", treatment="remove", columns=None, multivariate=False):
+        self.method = method
+        self.treatment = treatment
+        self.columns = columns
+        self.multivariate = multivariate
+
+    def fit(self, X, y=None):
+        self.fit_transform(X, y)
+        return self
+
+    def fit_transform(self, X, y=None):
+        block = self.extract(X)
+        if self.method == "isolation_forest":
+            forests = [block] if self.multivariate else [block[:, [i]] for i in range(block.shape[1])]
+            self.detectors_ = [
+                IsolationForest(contamination=0.05, random_state=42, n_jobs=OUTLIER_JOBS).fit(x)
+                for x in forests
+            ]
+        else:
+            self.detectors_ = outlier_bounds(block, self.method)
+        self.replacements_ = (
+            replacement_values(block, self.treatment)
+            if self.treatment in ["replace_mean", "replace_median"]
+            else None
+        )
+        mask = self.outliers(block)
+        output = self.treat(X, block, mask)
+        # Multivarié : une ligne aberrante compte une fois
+        detected = mask.any(axis=1).sum() if self.method == "isolation_forest" and self.multivariate else mask.sum()
+        params = outlier_summary(self.method, self.treatment, self.columns, int(detected))
+        if self.treatment == "remove":
+            params["params"]["Lignes supprimées"] = str(len(X) - len(output))
+        self.summaries_ = [params]
+        return output
+
+    def extract(self, X):
+        return X[self.columns].to_numpy(dtype=np.float64)
+
+    def outliers(self, block):
+        """Masque (lignes x colonnes) des valeurs aberrantes ; en multivarié, une ligne entière est aberrante."""
+        if self.method != "isolation_forest":
+            low, high = self.detectors_
+            return (block < low) | (block > high)
+        if self.multivariate:
+            rows = self.detectors_[0].predict(block) == -1
+            return np.repeat(rows[:, None], block.shape[1], axis=1)
+        return np.column_stack([
+            detector.predict(block[:, [i]]) == -1 for i, detector in enumerate(self.detectors_)
+        ])
+
+    def treat(self, X, block, mask):
+        if self.treatment == "remove":
+            return X[~mask.any(axis=1)]
+        if self.replacements_ is None:
+            # Plafonnement avec Isolation Forest : pas de bornes, valeurs inchangées
+            return X
+        output = X.copy(deep=False)
+        output[self.columns] = np.where(mask, self.replacements_, block)
+        return output
+
+    def transform(self, X):
+        block = self.extract(X)
+        return self.treat(X, block, self.outliers(block))
+
+
+class CategoricalEncoder(TransformerMixin, BaseEstimator):
+    """
+    Encodage des variables catégorielles avec les modalités apprises au fit.
+
+    One-hot et binaire : une colonne booléenne "<colonne>_<modalité>" par
+    modalité, ajoutées en fin de DataFrame (comme pd.get_dummies). Label et
+    ordinal : code de la modalité dans l'ordre trié, -1 pour une modalité
+    inconnue.
+    """
+
+    def __init__(self, method="onehot", columns=None):
+        self.method = method
+        self.columns = columns
+
+    def fit(self, X, y=None):
+        self.categories_ = {}
+        for column in self.columns:
+            values = X[column].dropna() if self.method in ["onehot", "binary"] else X[column].astype(str)
+            # Modalités triées, comme pd.get_dummies et LabelEncoder
+            self.categories_[column] = pd.Categorical(values).categories
+        self.summaries_ = [{
+            "name": "encoding categorical features",
+            "params": {"Méthode": ENCODING_NAMES.get(self.method, self.method), "columns": ", ".join(self.columns)},
+        }]
+        return self
+
+    def transform(self, X):
+        if self.method in ["onehot", "binary"]:
+            dummies = {}
+            for column in self.columns:
+                codes = pd.Categorical(X[column], categories=self.categories_[column]).codes
+                for i, category in enumerate(self.categories_[column]):
+                    dummies[f"{column}_{category}"] = codes == i
+            return pd.concat(
+                [X.drop(columns=self.columns), pd.DataFrame(dummies, index=X.index)], axis=1
+            )
+        output = X.copy(deep=False)
+        for column in self.columns:
+            codes = pd.Categorical(X[column].astype(str), categories=self.categories_[column]).codes
+            output[column] = codes.astype(np.int64 if self.method == "label" else np.float64)
+        return output
+
+
+class FeatureSelector(TransformerMixin, BaseEstimator):
+    """
+    Sélection de caractéristiques : seuil de variance, SelectKBest ou RFE sur la colonne "target", ou PCA.
+
+    RFE élimine récursivement les caractéristiques les moins importantes
+    d'un arbre de décision (classification ou régression selon la cible).
+
+    Les colonnes non numériques sont conservées après les caractéristiques
+    sélectionnées (ou les composantes principales).
+    """
+
+    def __init__(self, method="variance", n_components=5):
+        self.method = method
+        self.n_components = n_components
+
+    def fit(self, X, y=None):
+        self.fit_transform(X, y)
+        return self
+
+    def fit_transform(self, X, y=None):
+        numeric = X.select_dtypes(include=["number"]).columns.tolist()
+        self.selector_ = None
+        self.input_columns_ = numeric
+        if self.method == "variance" and numeric:
+            self.selector_ = VarianceThreshold(threshold=0.1).fit(X[numeric])
+        elif self.method == "kbest" and "target" in X.columns:
+            self.input_columns_ = [column for column in numeric if column != "target"]
+            if self.input_columns_:
+                k = min(self.n_components, len(self.input_columns_))
+                self.selector_ = SelectKBest(f_classif, k=k).fit(X[self.input_columns_], X["target"])
+        elif self.method == "rfe" and "target" in X.columns:
+            self.input_columns_ = [column for column in numeric if column != "target"]
+            if self.input_columns_:
+                k = min(self.n_components, len(self.input_columns_))
+                if type_of_target(X["target"]) == "continuous":
+                    estimator = DecisionTreeRegressor(random_state=42)
+                else:
+                    estimator = DecisionTreeClassifier(random_state=42)
+                self.selector_ = RFE(estimator, n_features_to_select=k).fit(X[self.input_columns_], X["target"])
+        elif self.method == "pca" and numeric:
+            self.selector_ = PCA(n_components=min(self.n_components, len(numeric))).fit(X[numeric])
+        output = self.transform(X)
+        self.summaries_ = [{
+            "name": "feature_selection",
+            "params": {
+                "Méthode": FEATURE_SELECTION_NAMES.get(self.method, self.method),
+                "Nombre de caractéristiques": str(self.n_components),
+                "Caractéristiques sélectionnées": str(len(output.columns)),
+            },
+        }]
+        return output
+
+    def transform(self, X):
+        if self.selector_ is None:
+            return X
+        if self.method == "pca":
+            components = self.selector_.transform(X[self.input_columns_])
+            selected = pd.DataFrame(
+                components,
+                columns=[f"PC{i + 1}" for i in range(components.shape[1])],
+                index=X.index,
+            )
+        else:
+            columns = [
+                column for column, keep in zip(self.input_columns_, self.selector_.get_support()) if keep
+            ]
+            selected = X[columns]
+            if self.method in ["kbest", "rfe"]:
+                selected = selected.assign(target=X["target"])
+        others = [column for column in X.columns if column not in self.input_columns_ and column not in selected.columns]
+        return pd.concat([selected, X[others]], axis=1) if others else selected
@@ -0,0 +1,46 @@
+from pymongo import ASCENDING
+
+
+def projection(fields):
+    """Projection MongoDB limitée aux champs demandés (notation pointée acceptée)."""
+    return {field: 1 for field in fields}
+
+
+class ProjectStore:
+    """
+    Accès aux documents de la collection des projets.
+
+    Chaque lecture déclare les champs dont elle a besoin : les matrices,
+    figures et rapports stockés dans le document ne sont transférés que
+    par les routes qui les utilisent.
+
+    Args:
+        collection: La collection MongoDB des projets
+    """
+
+    def __init__(self, collection):
+        self.collection = collection
+
+    def ensure_indexes(self):
+        # Toutes les lectures filtrent sur (user_id, project_name) ou sur user_id seul
+        self.collection.create_index(
+            [("user_id", ASCENDING), ("project_name", ASCENDING)],
+            name="user_id_project_name",
+        )
+
+    def get(self, user_id, project_name, fields):
+        """Retourne le projet d'un utilisateur, limité aux champs demandés (None s'il n'existe pas)."""
+        return self.collection.find_one(
+            {"user_id": user_id, "project_name": project_name}, projection(fields)
+        )
+
+    def find_all(self, user_id, fields):
+        """Retourne les projets d'un utilisateur, limités aux champs demandés."""
+        return self.collection.find({"user_id": user_id}, projection(fields))
+
+    def find_by_file(self, user_id, file_id, fields):
+        """Retourne le projet de l'utilisateur dont le dataset est le fichier GridFS file_id."""
+        return self.collection.find_one(
+            {"user_id": user_id, "$or": [{"dataset_file_id": file_id}, {"parquet_file_id": file_id}]},
+            projection(fields),
+        )
@@ -0,0 +1,112 @@
+import os
+import numpy as np
+from pymongo import ASCENDING
+from sklearn.decomposition import PCA, IncrementalPCA
+from artifacts import save_array, load_array
+
+# Jusqu'à ce nombre de lignes, ACP exacte (SVD complète), comme avant
+EXACT_PCA_MAX_ROWS = 10000
+# Au-delà de ce nombre de valeurs (lignes x colonnes), ACP incrémentale par blocs plutôt que randomisée
+INCREMENTAL_PCA_MIN_VALUES = int(os.environ.get("INCREMENTAL_PCA_MIN_VALUES", 50_000_000))
+# Nombre de lignes par bloc de l'ACP incrémentale et de la projection
+PROJECTION_BATCH_ROWS = 50000
+
+
+def fit_projection(X):
+    """
+    Projette des données sur leurs 2 premières composantes principales.
+
+    Les petits jeux de données gardent l'ACP exacte. Au-delà de
+    EXACT_PCA_MAX_ROWS lignes, l'ACP est randomisée (seules 2 composantes
+    sont calculées) ; au-delà de INCREMENTAL_PCA_MIN_VALUES valeurs, elle
+    est ajustée bloc par bloc (IncrementalPCA) pour ne jamais centrer une
+    copie complète des données.
+
+    Args:
+        X: Les données numériques (ndarray ou DataFrame), une ligne par point
+
+    Returns:
+        ndarray: La projection (n_lignes, 2) en float32
+    """
+    X = np.asarray(X, dtype=np.float64)
+    n_rows = len(X)
+    if n_rows <= EXACT_PCA_MAX_ROWS:
+        pca = PCA(n_components=2)
+    elif X.size < INCREMENTAL_PCA_MIN_VALUES:
+        pca = PCA(n_components=2, svd_solver="randomized", random_state=42)
+    else:
+        pca = IncrementalPCA(n_components=2, batch_size=PROJECTION_BATCH_ROWS)
+        for start in range(0, n_rows, PROJECTION_BATCH_ROWS):
+            batch = X[start:start + PROJECTION_BATCH_ROWS]
+            # partial_fit exige au moins n_components lignes par bloc
+            if len(batch) >= 2:
+                pca.partial_fit(batch)
+    if not isinstance(pca, IncrementalPCA):
+        pca.fit(X)
+
+    projection = np.empty((n_rows, 2), dtype=np.float32)
+    for start in range(0, n_rows, PROJECTION_BATCH_ROWS):
+        projection[start:start + PROJECTION_BATCH_ROWS] = pca.transform(X[start:start + PROJECTION_BATCH_ROWS])
+    return projection
+
+
+class ProjectionCache:
+    """
+    Projections 2D des graphiques de résultats, calculées une fois par modèle.
+
+    La projection (float32, deux colonnes) est stockée dans GridFS et
+    référencée par le model_id du modèle entraîné : /plot_results la
+    relit au lieu de réajuster une ACP à chaque affichage. Un nouvel
+    entraînement écrit un nouveau model_id, donc une nouvelle projection.
+
+    Args:
+        collection: La collection MongoDB des projections
+        fs: L'instance GridFS
+    """
+
+    def __init__(self, collection, fs):
+        self.collection = collection
+        self.fs = fs
+
+    def ensure_indexes(self):
+        self.collection.create_index([("model_id", ASCENDING)], name="model_id", unique=True)
+
+    def put(self, model_id, X):
+        """Calcule et enregistre la projection de X pour le modèle ; la retourne."""
+        projection = fit_projection(X)
+        array_id = save_array(self.fs, projection, f"{model_id}_projection.npz")
+        previous = self.collection.find_one_and_update(
+            {"model_id": model_id},
+            {"$set": {"array_id": array_id, "n_rows": len(projection)}},
+            upsert=True,
+        )
+        if previous is not None:
+            self.fs.delete(previous["array_id"])
+        return projection
+
+    def get(self, model_id, load_X):
+        """
+        Retourne la projection du modèle, calculée au premier appel (modèles entraînés avant le cache).
+
+        Args:
+            model_id: L'identifiant du modèle entraîné
+            load_X: Fonction sans argument retournant les données à projeter (appelée seulement si nécessaire)
+        """
+        doc = self.collection.find_one({"model_id": model_id})
+        if doc is not None:
+            try:
+                return load_array(self.fs, doc["array_id"])
+            except Exception as e:
+                print(f"Projection en cache illisible pour le modèle {model_id}: {str(e)}")
+        return self.put(model_id, load_X())
+
+    def delete(self, model_id):
+        """Supprime la projection d'un modèle (réentraînement ou suppression du projet)."""
+        if model_id is None:
+            return
+        for doc in self.collection.find({"model_id": model_id}, {"array_id": 1}):
+            try:
+                self.fs.delete(doc["array_id"])
+            except Exception as e:
+                print(f"Erreur lors de la suppression de la projection {doc['array_id']}: {str(e)}")
+        self.collection.delete_many({"model_id": model_id})
@@ -10,6 +10,7 @@ from flask import (
     session,
     jsonify,
     send_file,
+    Response,
 )
 import pdfkit
 from werkzeug.security import generate_password_hash, check_password_hash
@@ -21,8 +22,23 @@ from sklearn.datasets import (
     make_regression,
 )   
 import pickle
-import supervised_models, unsupervised_models
-from sklearn.decomposition import PCA
+import supervised_models, unsupervised_models, dataset_store, model_artifacts, preprocessing_pipeline, plot_data
+from cache import LRUCache, dataframe_nbytes
+from artifacts import LazyArrays, delete_arrays
+from serialization import convert_to_serializable, to_native
+from training import train_project, training_columns, use_streaming, TRAINING_FIELDS
+from project_store import ProjectStore
+from model_registry import ModelRegistry
+from batch_prediction import expected_columns, stream_predictions
+from hyperparameter_search import parse_search_options, search_space
+from cross_validation import FoldCache, parse_cv_options
+from projection import ProjectionCache
+from chunked_upload import UploadStore, UploadError
+from column_profile import ColumnProfileStore, describe_stats
+from jobs import TrainingJobQueue, serialize_job, SUCCEEDED, FAILED, TRAIN, LEADERBOARD, VISUALIZATIONS
+from visualizations import VisualizationStore, visualization_specs
+from bson.objectid import ObjectId
+from bson.errors import InvalidId
 from sklearn.preprocessing import LabelEncoder
 import pandas as pd
 import numpy as np
@@ -35,20 +51,9 @@ import matplotlib.pyplot as plt
 from werkzeug.utils import secure_filename
 import os
 import shutil
+import tempfile
 import json
 import importlib
-from sklearn.preprocessing import (
-    MinMaxScaler,
-    StandardScaler,
-    RobustScaler,
-    MaxAbsScaler,
-)
-from sklearn.impute import SimpleImputer
-from sklearn.feature_selection import VarianceThreshold, SelectKBest, f_classif
-from sklearn.ensemble import IsolationForest
-from sklearn.preprocessing import LabelEncoder, OrdinalEncoder
-from sklearn.decomposition import PCA
-from sklearn.preprocessing import PowerTransformer
 import seaborn as sns
 from flask_cors import CORS
 from pymongo import MongoClient
@@ -70,13 +75,53 @@ UPLOAD_FOLDER = os.path.join(os.path.dirname(__file__), "static", "projects")
 os.makedirs(UPLOAD_FOLDER, exist_ok=True)
 app.config["UPLOAD_FOLDER"] = UPLOAD_FOLDER
 app.config["MAX_CONTENT_LENGTH"] = 16 * 1024 * 1024  # 16MB max file size
+# Taille maximale d'un dataset envoyé par morceaux (/upload/init), chaque morceau restant sous MAX_CONTENT_LENGTH
+app.config["UPLOAD_MAX_BYTES"] = int(os.environ.get("UPLOAD_MAX_BYTES", 10 * 1024 * 1024 * 1024))
 app.config["SECRET_KEY"] = "changeme_123456" #configure MongoDB Database
+# Budget mémoire du cache des datasets parsés (2GB par défaut)
+app.config["DATASET_CACHE_MAX_BYTES"] = int(
+    os.environ.get("DATASET_CACHE_MAX_BYTES", 2 * 1024 * 1024 * 1024)
+)
 
-client = MongoClient("mongodb://localhost:27017/")
-db = client["pfa"]  # Base de données "pfa"
+# Budget mémoire du cache des modèles entraînés (1GB par défaut)
+app.config["MODEL_CACHE_MAX_BYTES"] = int(
+    os.environ.get("MODEL_CACHE_MAX_BYTES", 1024 * 1024 * 1024)
+)
+
+app.config["MONGO_URI"] = os.environ.get("MONGO_URI", "mongodb://localhost:27017/")
+app.config["MONGO_DB"] = "pfa"
+# Prédiction par lots : taille maximale de l'upload et nombre de lignes par bloc
+app.config["PREDICT_BATCH_MAX_CONTENT_LENGTH"] = int(
+    os.environ.get("PREDICT_BATCH_MAX_CONTENT_LENGTH", 1024 * 1024 * 1024)
+)
+app.config["PREDICT_BATCH_ROWS"] = 50000
+# Nombre maximal de points envoyés par /plot_results (sous-échantillonnage au-delà)
+app.config["PLOT_POINT_BUDGET"] = int(os.environ.get("PLOT_POINT_BUDGET", 5000))
+# Nombre de processus du pool d'entraînement asynchrone
+app.config["TRAINING_WORKERS"] = int(os.environ.get("TRAINING_WORKERS", 2))
+# Classement d'algorithmes : processus simultanés et budget de temps par algorithme (secondes)
+app.config["LEADERBOARD_WORKERS"] = int(os.environ.get("LEADERBOARD_WORKERS", min(4, os.cpu_count() or 1)))
+app.config["LEADERBOARD_TIME_BUDGET"] = int(os.environ.get("LEADERBOARD_TIME_BUDGET", 300))
+
+client = MongoClient(app.config["MONGO_URI"])
+db = client[app.config["MONGO_DB"]]  # Base de données "pfa"
 users_collection = db["users"]  # Collection "users"
 projects_collection = db["projects"]
+jobs_collection = db["jobs"]
 fs = GridFS(db)
+project_store = ProjectStore(projects_collection)
+project_store.ensure_indexes()
+model_registry = ModelRegistry(fs, app.config["MODEL_CACHE_MAX_BYTES"])
+fold_cache = FoldCache(db["folds"], fs)
+fold_cache.ensure_indexes()
+upload_store = UploadStore(db, app.config["UPLOAD_MAX_BYTES"])
+upload_store.ensure_indexes()
+column_profiles = ColumnProfileStore(db["column_profiles"], fs)
+column_profiles.ensure_indexes()
+visualization_store = VisualizationStore(db["visualizations"], fs)
+visualization_store.ensure_indexes()
+projection_cache = ProjectionCache(db["projections"], fs)
+projection_cache.ensure_indexes()
 
 path_wkhtmltopdf = r"C:\Program Files\wkhtmltopdf\bin\wkhtmltopdf.exe"
 config = pdfkit.configuration(wkhtmltopdf=path_wkhtmltopdf)
@@ -84,6 +129,45 @@ config = pdfkit.configuration(wkhtmltopdf=path_wkhtmltopdf)
 ALLOWED_EXTENSIONS = {"csv", "xlsx", "json"}
 params_cache = {}
 algorithm_parameters_cache = {}
+training_queue = TrainingJobQueue(
+    jobs_collection,
+    app.config["MONGO_URI"],
+    app.config["MONGO_DB"],
+    max_workers=app.config["TRAINING_WORKERS"],
+)
+# DataFrames parsés, indexés par dataset_file_id (partagés entre les étapes du wizard)
+dataset_cache = LRUCache(app.config["DATASET_CACHE_MAX_BYTES"], sizeof=dataframe_nbytes)
+
+
+def load_dataset(project, columns=None):
+    """Retourne le DataFrame du dataset d'un projet, parsé une seule fois par processus.
+
+    Le dataset est lu depuis sa copie Parquet (projetée sur `columns` si
+    fourni), ou depuis le CSV original pour les projets sans copie Parquet.
+    Le DataFrame retourné est partagé : les appelants qui le modifient
+    doivent travailler sur une copie.
+    """
+    dataset_file_id = project["dataset_file_id"]
+    df = dataset_cache.get(dataset_file_id)
+    if df is not None:
+        return df if columns is None else df[columns]
+
+    if columns is not None and project.get("parquet_file_id") is not None:
+        # Lecture partielle : seules les colonnes demandées sont lues, sans mise en cache
+        return dataset_store.read_project_dataset(fs, project, columns=columns)
+    df = dataset_store.read_project_dataset(fs, project)
+    dataset_cache.put(dataset_file_id, df)
+    return df if columns is None else df[columns]
+
+
+def store_columnar(df, filename):
+    """Stocke la copie Parquet d'un dataset dans GridFS et retourne son id (None en cas d'échec)."""
+    try:
+        return dataset_store.store_parquet(fs, df, f"{filename}.parquet")
+    except Exception as e:
+        # Colonnes de types mixtes ou pyarrow absent : les lecteurs retombent sur le CSV
+        print(f"Conversion Parquet impossible pour {filename}: {str(e)}")
+        return None
 
 @app.route("/admin/users", methods=["GET"])
 def get_all_users():
@@ -214,13 +298,9 @@ def delete_user(user_id):
 def allowed_file(filename):
     return "." in filename and filename.rsplit(".", 1)[1].lower() in ALLOWED_EXTENSIONS
 
-def preview(filename) :
-    df = pd.read_csv(filename)
-    preview = {
-        "columns": df.columns.tolist(),
-        "data": df.head(5).values.tolist(),
-    }
-    return preview
+def preview(source, filename="dataset.csv"):
+    """Aperçu d'un dataset (colonnes, premières lignes, types) à coût borné : voir dataset_store.read_preview."""
+    return dataset_store.read_preview(source, filename)
 
 @app.route("/preview_custom", methods=["POST"])
 def upload_dataset_preview():
@@ -233,14 +313,16 @@ def upload_dataset_preview():
         return jsonify({"error": "Nom de fichier vide"}), 400
 
     try:
-        # Lire le CSV directement en mémoire
-        df = pd.read_csv(io.BytesIO(file.read()))
-
-        # Retourner uniquement un aperçu (columns + head)
-        preview = {
-            "columns": df.columns.tolist(),
-            "data": df.head(5).values.tolist(),
-        }
+        # Seul le début du fichier est lu : la latence ne dépend pas de sa taille.
+        # partial=true : le client n'a envoyé que le début du fichier ; sample=true : lignes tirées au hasard
+        preview = dataset_store.read_preview(
+            file.stream,
+            secure_filename(file.filename),
+            partial=request.form.get("partial") == "true",
+            sample=request.form.get("sample") == "true",
+        )
+        if preview is None:
+            return jsonify({"error": "Only CSV, Excel, and JSON files are supported."}), 400
         return jsonify({"preview": preview}), 200
     except Exception as e:
         return jsonify({"error": str(e)}), 500
@@ -335,7 +417,7 @@ def project_details(name):
         return jsonify({"success": False,"error": "Veuillez vous connecter."}), 401
 
     user_id = session["user_id"]
-    doc = projects_collection.find_one({"user_id":user_id,"project_name": name})
+    doc = project_store.get(user_id, name, ["filename", "model_type", "algo", "train_parameters", "figure"])
     if not doc:
         return jsonify({"success": False, "error": "Projet introuvable."}), 404
 
@@ -378,7 +460,16 @@ def dashboard():
 
     user_id = session["user_id"]
     projects = []
-    results = projects_collection.find({"user_id":user_id})
+    results = project_store.find_all(user_id, [
+        "project_name",
+        "model_type",
+        "filename",
+        "algo",
+        "preprocessing_results.applied_methods.name",
+        "metrics.mse",
+        "metrics.accuracy",
+        "metrics.silhouette",
+    ])
 
     # Parcourir tous les dossiers de projets de l'utilisateur
     for i, doc in enumerate(results, start=1):
@@ -412,6 +503,96 @@ def dashboard():
 
 
 
+def find_upload(upload_id):
+    """Retourne l'upload par morceaux de l'utilisateur connecté, ou None."""
+    try:
+        object_id = ObjectId(upload_id)
+    except InvalidId:
+        return None
+    return upload_store.get(session["user_id"], object_id)
+
+
+def serialize_upload(upload):
+    return {
+        "upload_id": str(upload["_id"]),
+        "filename": upload["filename"],
+        "size": upload["size"],
+        "chunk_size": upload["chunk_size"],
+        "received": upload["received"],
+        "status": upload["status"],
+    }
+
+
+@app.route("/upload/init", methods=["POST"])
+def upload_init():
+    """Démarre un upload reprenable ; le dataset est ensuite envoyé morceau par morceau."""
+    if "user_id" not in session:
+        return jsonify({"success": False, "error": "Authentication required."}), 401
+    data = request.get_json(silent=True) or {}
+    filename = secure_filename(data.get("filename") or "")
+    if not filename or not allowed_file(filename):
+        return jsonify({"success": False, "error": "Only CSV, Excel, and JSON files are supported."}), 400
+    try:
+        upload = upload_store.init(
+            session["user_id"], filename, int(data.get("size") or 0), data.get("content_type")
+        )
+    except (TypeError, ValueError) as e:
+        return jsonify({"success": False, "error": str(e)}), 400
+    return jsonify({"success": True, "upload": serialize_upload(upload)}), 201
+
+
+@app.route("/upload/<string:upload_id>", methods=["GET", "DELETE"])
+def upload_status(upload_id):
+    """Nombre d'octets déjà reçus (pour reprendre un envoi), ou abandon de l'upload (DELETE)."""
+    if "user_id" not in session:
+        return jsonify({"success": False, "error": "Authentication required."}), 401
+    upload = find_upload(upload_id)
+    if not upload:
+        return jsonify({"success": False, "error": "Upload introuvable."}), 404
+    if request.method == "DELETE":
+        upload_store.abort(upload)
+        return jsonify({"success": True})
+    return jsonify({"success": True, "upload": serialize_upload(upload)})
+
+
+@app.route("/upload/<string:upload_id>/chunk", methods=["PUT"])
+def upload_chunk(upload_id):
+    """Ajoute un morceau (corps brut) à ?offset=, avec son SHA-256 dans l'en-tête X-Chunk-SHA256."""
+    if "user_id" not in session:
+        return jsonify({"success": False, "error": "Authentication required."}), 401
+    upload = find_upload(upload_id)
+    if not upload:
+        return jsonify({"success": False, "error": "Upload introuvable."}), 404
+    offset = request.args.get("offset", type=int)
+    if offset is None:
+        return jsonify({"success": False, "error": "offset manquant."}), 400
+    try:
+        received = upload_store.append(
+            upload, offset, request.stream, request.headers.get("X-Chunk-SHA256")
+        )
+    except UploadError as e:
+        # Le client se recale sur le nombre d'octets effectivement reçus
+        current = find_upload(upload_id)
+        return jsonify({"success": False, "error": str(e), "upload": serialize_upload(current)}), 409
+    return jsonify({"success": True, "received": received})
+
+
+@app.route("/upload/<string:upload_id>/finalize", methods=["POST"])
+def upload_finalize(upload_id):
+    """Vérifie le checksum final ; l'upload_id peut ensuite être passé à /project à la place du fichier."""
+    if "user_id" not in session:
+        return jsonify({"success": False, "error": "Authentication required."}), 401
+    upload = find_upload(upload_id)
+    if not upload:
+        return jsonify({"success": False, "error": "Upload introuvable."}), 404
+    data = request.get_json(silent=True) or {}
+    try:
+        upload_store.finalize(upload, data.get("checksum"))
+    except UploadError as e:
+        return jsonify({"success": False, "error": str(e)}), 400
+    return jsonify({"success": True, "upload": serialize_upload(find_upload(upload_id))})
+
+
 @app.route("/project", methods=["GET", "POST"])
 def upload():
     try:
@@ -436,6 +617,7 @@ def upload():
             predefined_dataset = request.form.getlist("predefined_dataset")[0] if request.form.getlist("predefined_dataset") else None
             generation_algorithm = request.form.getlist("create_algorithm")[0] if request.form.getlist("create_algorithm") else None
             enable_preprocessing = request.form.getlist("preprocessing")[0] == "true"
+            upload_id = request.form.get("upload_id")
 
             # Get preprocessing options as list
             preprocessing_options = request.form.getlist("preprocessing_options[]")
@@ -452,6 +634,7 @@ def upload():
                 )
                 enable_preprocessing = data.get("preprocessing")
                 preprocessing_options = data.get("preprocessing_options", [])
+                upload_id = data.get("upload_id")
             else:
                 return jsonify({"status": "error", "message": "No data received."}), 400
 
@@ -462,7 +645,28 @@ def upload():
                 400,
             )
         # Handle different dataset types
-        if dataset_type == "custom":
+        if dataset_type == "custom" and upload_id:
+            # Dataset déjà envoyé par morceaux (/upload/...) : lecture depuis GridFS
+            upload = find_upload(upload_id)
+            if not upload or upload["status"] != "complete":
+                return jsonify({"status": "error", "message": "Upload introuvable ou non finalisé."}), 400
+            filename = upload["filename"]
+            dataset_file_id = upload["file_id"]
+            try:
+                df = dataset_store.parse_dataset(fs.get(dataset_file_id), filename)
+                if df is None:
+                    return jsonify({"status": "error", "message": "Unsupported file format."}), 400
+                if df.empty:
+                    return jsonify({"status": "error", "message": "The uploaded file is empty."}), 400
+                preview_data = {
+                    "columns": df.columns.tolist(),
+                    "data": df.head().values.tolist(),
+                }
+            except Exception as e:
+                return jsonify({"status": "error", "message": f"Error processing file: {str(e)}"}), 500
+            upload_store.consume(session["user_id"], upload["_id"])
+
+        elif dataset_type == "custom":
             file = request.files.get("dataset") or request.files.get("selectedFile")
             if not file:
                 return jsonify({"status": "error", "message": "No file selected."}), 400
@@ -472,18 +676,13 @@ def upload():
                 return jsonify({"status": "error", "message": "Only CSV, Excel, and JSON files are supported."}), 400
 
             filename = secure_filename(file.filename)
-            file_bytes = file.read()  # lit le fichier en bytes
-            dataset_file_id = fs.put(file_bytes, filename=filename, content_type=file.content_type)
+            # Copie par blocs dans GridFS, puis lecture pandas depuis le même flux (jamais chargé en bytes)
+            dataset_file_id = dataset_store.store_file(fs, file.stream, filename, file.content_type)
+            file.stream.seek(0)
 
-            # Lecture avec pandas directement depuis les bytes
             try:
-                if filename.endswith(".csv"):
-                    df = pd.read_csv(io.BytesIO(file_bytes))
-                elif filename.endswith(".xlsx"):
-                    df = pd.read_excel(io.BytesIO(file_bytes))
-                elif filename.endswith(".json"):
-                    df = pd.read_json(io.BytesIO(file_bytes))
-                else:
+                df = dataset_store.parse_dataset(file.stream, filename)
+                if df is None:
                     return jsonify({"status": "error", "message": "Unsupported file format."}), 400
 
                 if df.empty:
@@ -536,7 +735,7 @@ def upload():
                 df["target"] = data.target
 
                 filename = f"{predefined_dataset}.csv"
-                dataset_file_id = fs.put(df.to_csv(index=False).encode(), filename=filename, content_type="text/csv")
+                dataset_file_id = dataset_store.store_csv(fs, df, filename)
 
 
                 preview_data = {
@@ -631,7 +830,7 @@ def upload():
                     df["target"] = y
 
                 filename = f"{generation_algorithm}_generated.csv"
-                dataset_file_id = fs.put(df.to_csv(index=False).encode(), filename=filename, content_type="text/csv")
+                dataset_file_id = dataset_store.store_csv(fs, df, filename)
                 preview_data = {
                     "columns": df.columns.tolist(),
                     "data": df.head().values.tolist(),
@@ -656,6 +855,9 @@ def upload():
                 ),
                 400,
             )
+        # Copie colonnaire typée, convertie une seule fois à l'ingestion
+        df = df.rename(columns=str)
+        parquet_file_id = store_columnar(df, filename)
         project_doc = {
             "user_id": user_id,
             "project_name": project_name,
@@ -666,6 +868,7 @@ def upload():
             "enable_preprocessing": enable_preprocessing,
             "preprocessing_options": preprocessing_options,
             "dataset_file_id": dataset_file_id,
+            "parquet_file_id": parquet_file_id,
             "filename": filename,
         }
         session["user_id"] = user_id
@@ -673,6 +876,7 @@ def upload():
         session["filename"] = filename
         session["learning_type"] = learning_type
         result = projects_collection.insert_one(project_doc)
+        dataset_cache.put(dataset_file_id, df)
         return (
             jsonify(
                 {
@@ -730,6 +934,7 @@ def get_algorithm_doc():
             "AdaBoost Classifier": ("sklearn.ensemble", "AdaBoostClassifier"),
             "Bagging Classifier": ("sklearn.ensemble", "BaggingClassifier"),
             "Gaussian NB": ("sklearn.naive_bayes", "GaussianNB"),
+            "SGD Classifier": ("sklearn.linear_model", "SGDClassifier"),
             "MLP Classifier": ("sklearn.neural_network", "MLPClassifier"),
             # Regression
             "Linear Regression": ("sklearn.linear_model", "LinearRegression"),
@@ -738,6 +943,7 @@ def get_algorithm_doc():
             "Ridge": ("sklearn.linear_model", "Ridge"),
             "Lasso": ("sklearn.linear_model", "Lasso"),
             "Elastic Net": ("sklearn.linear_model", "ElasticNet"),
+            "SGD Regressor": ("sklearn.linear_model", "SGDRegressor"),
             "Random Forest Regressor": ("sklearn.ensemble", "RandomForestRegressor"),
             "Gradient Boosting Regressor": (
                 "sklearn.ensemble",
@@ -749,6 +955,7 @@ def get_algorithm_doc():
             "MLP Regressor": ("sklearn.neural_network", "MLPRegressor"),
             # Clustering
             "KMeans": ("sklearn.cluster", "KMeans"),
+            "MiniBatchKMeans": ("sklearn.cluster", "MiniBatchKMeans"),
             "DBSCAN": ("sklearn.cluster", "DBSCAN"),
             "OPTICS": ("sklearn.cluster", "OPTICS"),
             "Agglomerative": ("sklearn.cluster", "AgglomerativeClustering"),
@@ -835,10 +1042,14 @@ def select_type():
             model_type = data.get("model_type")
             algo = data.get("algo")
             algorithm_parameters = data.get("algorithm_parameters", "{}")
+            hyperparameter_search = data.get("hyperparameter_search")
+            cross_validation = data.get("cross_validation")
         else:
             model_type = request.form.get("model_type")
             algo = request.form.get("algo")
             algorithm_parameters = request.form.get("algorithm_parameters", "{}")
+            hyperparameter_search = request.form.get("hyperparameter_search")
+            cross_validation = {"folds": request.form.get("cv_folds")}
         session["algo"] = algo
         session["model_type"] = model_type
         project_name = session.get("project_name")
@@ -854,6 +1065,15 @@ def select_type():
         try:
             algorithm_parameters_dict = json.loads(algorithm_parameters)
             algorithm_parameters_raw = algorithm_parameters_dict.get("parameters", {})
+            try:
+                if isinstance(hyperparameter_search, str):
+                    hyperparameter_search = json.loads(hyperparameter_search)
+                hyperparameter_search = parse_search_options(hyperparameter_search)
+                if hyperparameter_search:
+                    search_space(algo)
+                cross_validation = parse_cv_options(cross_validation)
+            except ValueError as e:
+                return jsonify({"error": str(e)}), 400
             
             result = projects_collection.update_one(
                 {"user_id": user_id, "project_name": project_name},
@@ -861,6 +1081,8 @@ def select_type():
                     "model_type": model_type,
                     "algo": algo,
                     "algorithm_parameters": algorithm_parameters_raw,
+                    "hyperparameter_search": hyperparameter_search,
+                    "cross_validation": cross_validation,
                 }}
             )
             print(f"user_id : {user_id} + project_name : {project_name} + matched_count : {result.matched_count}")
@@ -888,15 +1110,13 @@ def select_features():
 
     user_id = session["user_id"]
     project_name = session["project_name"]
-    result = projects_collection.find_one({"user_id": user_id, "project_name": project_name})
+    result = project_store.get(user_id, project_name, [
+        "learning_type", "algo", "filename", "model_type", "dataset_file_id", "parquet_file_id",
+    ])
     learning_type = result["learning_type"]
     algo = result["algo"]
     filename = result["filename"]
     model_type = result["model_type"]
-    file_from_db = fs.get(result["dataset_file_id"])
-    file_bytes = file_from_db.read()
-    data = pd.read_csv(io.BytesIO(file_bytes))
-    numeric_data = data.select_dtypes(include=["number"])
     if learning_type == "supervised":
         algo_class = supervised_models.ALGORITHMS[algo]
     else:
@@ -906,17 +1126,12 @@ def select_features():
     session["params_dict"] = params_dict
 
     if request.method == "GET":
+        # Profil calculé en une passe au premier appel, puis relu depuis MongoDB
+        profile = column_profiles.get(result, dataset_cache.get(result["dataset_file_id"]))
+        features = [column["name"] for column in profile["columns"]]
+        stats = describe_stats(profile["columns"])
         # Support JSON GET for React frontend
         if request.is_json or request.headers.get("Content-Type") == "application/json":
-            features = data.columns.tolist()
-            stats = numeric_data.describe().transpose().to_dict(orient="index")
-            result = projects_collection.update_one(
-                {"user_id": user_id, "project_name": project_name},
-                {"$set": {
-                    "features": features,
-                    "stats": stats,
-                }}
-            )
             return jsonify(
                 {
                     "model_info": {
@@ -928,21 +1143,14 @@ def select_features():
                     },
                     "features": features,
                     "stats": stats,
+                    "profile": profile["columns"],
+                    "n_rows": profile["n_rows"],
                     "model_type": model_type,
                     "algo": algo,
                     "learning_type": learning_type,
                 }
             )
         # Fallback to template rendering for legacy
-        features = data.columns.tolist()
-        stats = numeric_data.describe().transpose().to_dict(orient="index")
-        result = projects_collection.update_one(
-                {"user_id": user_id, "project_name": project_name},
-                {"$set": {
-                    "features": features,
-                    "stats": stats,
-                }}
-            )
         return jsonify(
             {
                 "features": features,
@@ -1019,36 +1227,6 @@ def select_features():
             return redirect(url_for("train_model"))
 
 
-def convert_to_serializable(obj):
-    if isinstance(obj, pd.DataFrame):
-        return obj.to_dict(orient="records")
-    elif isinstance(obj, np.ndarray):
-        return obj.tolist()
-    elif isinstance(obj, (np.integer, int)):
-        return int(obj)
-    elif isinstance(obj, (np.floating, float)):
-        return float(obj)
-    elif isinstance(obj, (np.bool_, bool)):
-        return bool(obj)
-    elif isinstance(obj, list):
-        return [convert_to_serializable(x) for x in obj]
-    elif isinstance(obj, dict):
-        return {k: convert_to_serializable(v) for k, v in obj.items()}
-    else:
-        return str(obj)  # Dernier recours pour éviter les erreurs
-
-
-def to_native(val):
-    """Convertit les types NumPy vers des types natifs Python."""
-    if isinstance(val, (np.integer, np.int64, np.int32)):
-        return int(val)
-    elif isinstance(val, (np.floating, np.float64, np.float32)):
-        return float(val)
-    elif isinstance(val, np.ndarray):
-        return val.tolist()
-    else:
-        return val
-
 @app.route("/train_model", methods=["GET"])
 def train_model():
     # Authentication check
@@ -1057,139 +1235,21 @@ def train_model():
 
     user_id = session["user_id"]
     project_name = session["project_name"]
-    result = projects_collection.find_one({"user_id":user_id, "project_name":project_name})
-    learning_type = result["learning_type"]
-    algo = result["algo"]
-    model_type = result["model_type"]
-    filename = result["filename"]
-    selected_features = result["selected_features"]
-    algorithm_parameters = result["algorithm_parameters"]
-    enable_preprocessing = result["enable_preprocessing"]
-    preprocessing_options = result["preprocessing_options"] 
-    file_from_db = fs.get(result["dataset_file_id"])
-    file_bytes = file_from_db.read()
+    result = project_store.get(user_id, project_name, TRAINING_FIELDS)
     try:
-        if learning_type == "supervised":
-            target_feature = result["target_feature"]
-            if not target_feature:
-                return (
-                    jsonify(
-                        {"success": False, "error": "Target feature not selected."}
-                    ),
-                    400,
-                )
-            print("before train")
-            model, params = supervised_models.model_train(
-                io.BytesIO(file_bytes),
-                algo,
-                selected_features,
-                target_feature=target_feature,
-                algorithm_parameters=algorithm_parameters,
-                enable_preprocessing=enable_preprocessing,
-                preprocessing_options=preprocessing_options,
-            )
-            print("after train and before update mongoDB")
-            buffer = io.BytesIO()
-            jb.dump(model, buffer)
-            buffer.seek(0)
-            model_id = fs.put(buffer, filename=f"{project_name}_{algo}.pkl")
-            print("after train and after update mongoDB")
-            X_test = params.get("X_test")
-            if "X_train_columns" in params and params["X_train_columns"] is not None:
-                X_test = pd.DataFrame(X_test, columns=params["X_train_columns"])
-            predictions_serialize = model.predict(X_test)
-            predictions = convert_to_serializable(predictions_serialize)
-            values = params.get("y_test",[])
-            values = values.tolist() if isinstance(values, np.ndarray) else values
-            predictions_values = [(to_native(p), to_native(v)) for p, v in zip(predictions, values)]
-            params_to_save = {
-                    "X_train": params["X_train"].values.tolist(),
-                    "y_train": params["y_train"].tolist(),
-                    "X_test": params["X_test"].values.tolist(),
-                    "y_test": params["y_test"].tolist(),
-                    "X_train_columns": params["X_train_columns"],
-                    'X_test_columns': params["X_test_columns"],
-                    "model_params":params["model_params"],
-                    "predictions_values":predictions_values,
-                    "algo":algo
-            }
-            result = projects_collection.update_one(
-                {"user_id": user_id, "project_name": project_name},
-                {"$set": {
-                    "train_parameters":params_to_save,
-                    "model_id":model_id,
-                }}
-            )
-        else:
-            print("before train")
-            model, params = unsupervised_models.model_train(
-                io.BytesIO(file_bytes),
-                algo,
-                selected_features,
-                algorithm_parameters=algorithm_parameters,
-                enable_preprocessing=enable_preprocessing,
-                preprocessing_options=preprocessing_options,
-            )
-            print("after train")
-            X_scaled = params.get("X_scaled")
-            if "X_train_columns" in params and params["X_train_columns"]:
-                X_scaled = pd.DataFrame(X_scaled, columns=params["X_train_columns"])
-            print("before predict")
-            labels = params.get("labels", [])
-            predictions = unsupervised_models.predict_cluster(
-                model, X_scaled, X_scaled, labels
-            )[:20]
-            print("after predict")
-            predictions_serialize = (
-                predictions.tolist()
-                if isinstance(predictions, np.ndarray)
-                else predictions
-            )
-            print("after predict and before convert")
-            predictions = convert_to_serializable(predictions_serialize)
-            print(type(predictions[0]))
-            values = labels[:20]
-            values = values.tolist() if isinstance(values, np.ndarray) else values
-            predictions_values = [(to_native(p), to_native(v)) for p, v in zip(predictions, values)]
-            params_to_save = {
-                "X":params["X"].values.tolist(),
-                'X_scaled': params["X_scaled"].tolist(),
-                "X_columns":params["X_columns"],
-                "model_params":params["model_params"],
-                'labels':params["labels"].tolist(),
-                'algo': algo,
-                "predictions_values":predictions_values,
-                'n_clusters':params["n_clusters"]
-            }
-            print("after train and before update mongoDB")
-            buffer = io.BytesIO()
-            pickle.dump(model, buffer)
-            buffer.seek(0)
-            model_id = fs.put(buffer, filename=f"{project_name}_{algo}.pkl")
-            print("after train and after update mongoDB")
-            result = projects_collection.update_one(
-                {"user_id": user_id, "project_name": project_name},
-                {"$set": {
-                    "train_parameters":params_to_save,
-                    "model_id":model_id,
-                }}
-            )
+        # Ne lire que les colonnes utilisées par l'entraînement
+        # Gros dataset et algorithme compatible : entraînement par blocs, sans chargement complet
+        data = None if use_streaming(fs, result) else load_dataset(result, columns=training_columns(result))
+    except KeyError as e:
+        return jsonify({"success": False, "error": f"Training error: colonnes introuvables {str(e)}"}), 400
+    try:
+        model_info_raw = train_project(projects_collection, fs, result, data)
     except ValueError as e:
         return jsonify({"success": False, "error": f"Training error: {str(e)}"}), 400
     except Exception as e:
         return jsonify({"success": False, "error": f"Unexpected error: {str(e)}"}), 500
 
-    model_info_raw = {
-        "filename": filename,
-        "project_name": project_name,
-        "model_type": model_type,
-        "algo": algo,
-        "learning_type": learning_type,
-        "features": selected_features,
-        "predictions_values": predictions_values,
-        "params_dict": algorithm_parameters,
-        "preprocessing_options": preprocessing_options,
-    }
+    model_registry.invalidate(user_id, project_name)
     model_info = convert_to_serializable(model_info_raw)
     session["model_info"] = model_info
     return jsonify(
@@ -1201,6 +1261,149 @@ def train_model():
     )
 
 
+@app.route("/train_model/search", methods=["GET"])
+def train_model_search():
+    """Retourne l'historique complet de la recherche d'hyperparamètres du dernier entraînement."""
+    if "user_id" not in session:
+        return jsonify({"success": False, "error": "Authentication required."}), 401
+    project = project_store.get(session["user_id"], session.get("project_name"), ["train_parameters.search"])
+    search = ((project or {}).get("train_parameters") or {}).get("search")
+    if not search:
+        return jsonify({"success": False, "error": "Aucune recherche d'hyperparamètres pour ce projet."}), 404
+    return jsonify({"success": True, "search": search})
+
+
+@app.route("/train_model/jobs", methods=["GET", "POST"])
+def train_model_jobs():
+    """Soumet un entraînement asynchrone (POST) ou retourne le dernier job du projet (GET)."""
+    if "user_id" not in session:
+        return jsonify({"success": False, "error": "Authentication required."}), 401
+
+    user_id = session["user_id"]
+    project_name = session.get("project_name")
+    if request.method == "POST":
+        project = project_store.get(user_id, project_name, ["_id"])
+        if not project:
+            return jsonify({"success": False, "error": "Projet introuvable."}), 404
+        job_id = training_queue.submit(user_id, project_name)
+        return jsonify({"success": True, "job_id": str(job_id)}), 202
+
+    # Seuls les entraînements : les classements et les graphiques partagent la collection des jobs
+    job = jobs_collection.find_one(
+        {"user_id": user_id, "project_name": project_name, "kind": {"$in": [TRAIN, None]}},
+        sort=[("created_at", -1)],
+    )
+    if not job:
+        return jsonify({"success": False, "error": "Aucun job pour ce projet."}), 404
+    return jsonify({"success": True, "job": serialize_job(job)})
+
+
+@app.route("/leaderboard", methods=["GET", "POST"])
+def leaderboard():
+    """Lance un classement d'algorithmes en job (POST) ou retourne le dernier classement du projet (GET)."""
+    if "user_id" not in session:
+        return jsonify({"success": False, "error": "Authentication required."}), 401
+
+    user_id = session["user_id"]
+    project_name = session.get("project_name")
+    project = project_store.get(user_id, project_name, ["learning_type", "model_type", "leaderboard"])
+    if not project:
+        return jsonify({"success": False, "error": "Projet introuvable."}), 404
+    if request.method == "GET":
+        if not project.get("leaderboard"):
+            return jsonify({"success": False, "error": "Aucun classement pour ce projet."}), 404
+        return jsonify({"success": True, "leaderboard": project["leaderboard"]})
+
+    if project.get("learning_type") != "supervised":
+        return jsonify({"success": False, "error": "Le classement n'est disponible qu'en apprentissage supervisé."}), 400
+    data = request.get_json(silent=True) or {}
+    algorithms = data.get("algorithms") or None
+    if algorithms is not None:
+        try:
+            compatible = supervised_models.candidate_algorithms(project.get("model_type"))
+        except ValueError as e:
+            return jsonify({"success": False, "error": str(e)}), 400
+        unknown = [algo for algo in algorithms if algo not in compatible]
+        if unknown:
+            return jsonify({"success": False, "error": f"Algorithmes incompatibles : {', '.join(unknown)}"}), 400
+    try:
+        time_budget = int(data.get("time_budget", app.config["LEADERBOARD_TIME_BUDGET"]))
+    except (TypeError, ValueError):
+        return jsonify({"success": False, "error": "time_budget doit être un nombre de secondes."}), 400
+    options = {
+        "algorithms": algorithms,
+        "algorithm_parameters": data.get("algorithm_parameters") or {},
+        "time_budget": max(1, min(time_budget, app.config["LEADERBOARD_TIME_BUDGET"])),
+        "max_workers": app.config["LEADERBOARD_WORKERS"],
+    }
+    job_id = training_queue.submit(user_id, project_name, kind=LEADERBOARD, options=options)
+    return jsonify({"success": True, "job_id": str(job_id)}), 202
+
+
+def find_job(job_id):
+    """Retourne le job de l'utilisateur connecté, ou None."""
+    try:
+        object_id = ObjectId(job_id)
+    except InvalidId:
+        return None
+    return jobs_collection.find_one({"_id": object_id, "user_id": session["user_id"]})
+
+
+@app.route("/jobs/<string:job_id>", methods=["GET"])
+def job_status(job_id):
+    if "user_id" not in session:
+        return jsonify({"success": False, "error": "Authentication required."}), 401
+    job = find_job(job_id)
+    if not job:
+        return jsonify({"success": False, "error": "Job introuvable."}), 404
+    if training_queue.is_stale(job):
+        # Processus arrêté pendant le job : le client reçoit l'échec au lieu d'attendre sans fin
+        training_queue.recover()
+        job = find_job(job_id)
+    return jsonify({"success": True, "job": serialize_job(job)})
+
+
+@app.route("/jobs/<string:job_id>/result", methods=["GET"])
+def job_result(job_id):
+    if "user_id" not in session:
+        return jsonify({"success": False, "error": "Authentication required."}), 401
+    job = find_job(job_id)
+    if not job:
+        return jsonify({"success": False, "error": "Job introuvable."}), 404
+    if job["status"] != SUCCEEDED:
+        return (
+            jsonify({"success": False, "error": job.get("error") or "Entraînement non terminé.", "job": serialize_job(job)}),
+            409,
+        )
+    kind = job.get("kind", TRAIN)
+    if kind == LEADERBOARD:
+        return jsonify({"success": True, "leaderboard": job["result"]})
+    if kind == VISUALIZATIONS:
+        return jsonify({"success": True, "visualizations": job["result"]})
+    if kind != TRAIN:
+        return jsonify({"success": False, "error": f"Type de job inconnu : {kind}"}), 400
+    model_registry.invalidate(job["user_id"], job["project_name"])
+    session["model_info"] = job["result"]
+    return jsonify(
+        {
+            "success": True,
+            "model_info": job["result"],
+            "redirect": url_for("select_features"),
+        }
+    )
+
+
+@app.route("/jobs/<string:job_id>/cancel", methods=["POST"])
+def job_cancel(job_id):
+    if "user_id" not in session:
+        return jsonify({"success": False, "error": "Authentication required."}), 401
+    job = find_job(job_id)
+    if not job:
+        return jsonify({"success": False, "error": "Job introuvable."}), 404
+    training_queue.cancel(job["_id"])
+    return jsonify({"success": True, "job": serialize_job(find_job(job_id))})
+
+
 @app.route("/evaluate", methods=["GET", "POST"])
 def evaluate():
     # Vérifier si l'utilisateur est connecté
@@ -1209,7 +1412,11 @@ def evaluate():
         return jsonify({"success" : False ,"error": "Unauthorized"}), 401
     user_id = session["user_id"]
     project_name = session["project_name"]
-    result = projects_collection.find_one({"user_id":user_id,"project_name":project_name})
+    result = project_store.get(user_id, project_name, [
+        "algo", "filename", "learning_type", "model_type", "selected_features",
+        "predictions_values", "algorithm_parameters", "preprocessing_options",
+        "train_parameters", "model_id",
+    ])
     algo = result.get("algo")
     filename = result.get("filename")
     learning_type = result.get("learning_type", "supervised")
@@ -1224,11 +1431,8 @@ def evaluate():
         error = "Veuillez sélectionner un algorithme."
     elif filename and algo and project_name:
         try:
-            params = result.get("train_parameters")
-            model_id = result.get("model_id")
-            model_from_db = fs.get(model_id)
-            model_bytes = model_from_db.read()
-            model = jb.load(io.BytesIO(model_bytes))
+            params = LazyArrays(fs, result.get("train_parameters"))
+            model = model_registry.load(user_id, project_name, result.get("model_id"))
             if not params:
                 return redirect(url_for("train_model"))
             if learning_type == "supervised":
@@ -1268,14 +1472,26 @@ def evaluate():
 
 @app.route("/plot_results", methods=["POST", "GET"])
 def plot_results():
+    """
+    Données du graphique de résultats du projet, sous-échantillonnées.
+
+    Au plus PLOT_POINT_BUDGET points sont envoyés (paramètre `points`
+    pour un budget plus petit), sous forme de colonnes binaires compactes
+    (voir plot_data.encode_columns). L'image PNG n'est dessinée que pour un
+    export statique (`export=png`) : elle est alors retournée et devient la
+    figure du projet.
+    """
     user_id = session.get("user_id", "")
     project_name = session.get("project_name")
-    result = projects_collection.find_one({"user_id": user_id, "project_name": project_name})
+    result = project_store.get(user_id, project_name, [
+        "filename", "algo", "model_type", "learning_type", "train_parameters", "model_id",
+    ])
     filename = result.get("filename")
     algo = result.get("algo")
+    model_id = result.get("model_id")
     model_type = result.get("model_type")
     learning_type = result.get("learning_type", "supervised")
-    params = result.get("train_parameters")
+    params = LazyArrays(fs, result.get("train_parameters"))
     predictions_values = params.get("predictions_values")
 
     
@@ -1288,169 +1504,78 @@ def plot_results():
                 "error": "Project name, filename, and algorithm are required.",
             }
         )
+    try:
+        budget = min(int(request.values.get("points", app.config["PLOT_POINT_BUDGET"])), app.config["PLOT_POINT_BUDGET"])
+    except ValueError:
+        return jsonify({"success": False, "error": "points doit être un entier"}), 400
+    budget = max(budget, plot_data.MIN_POINTS_PER_LABEL)
 
-    # Initialize variables for interactive plot data
-    plot_data = {}
-    plot_title = ""
-
+    classes = None
     if learning_type == "supervised":
         if model_type == "regression":
-            X_test = np.array(params["X_test"]).flatten()
-            y_test = np.array(params["y_test"]).flatten()
-            predictions = np.array(predictions_values)[:,0]
-            # Save static image
-            plt.figure(figsize=(4, 3))
-            plt.plot(X_test,y_test, label="y_test", color="blue")
-            plt.plot(X_test,predictions, label="y_pred", color="red")
-            plt.title("Courbe de différence Y_TEST vs Y_PRED")
-            plt.xlabel("X_test")
-            plt.ylabel("y")
-            plt.legend()
-            plt.grid(True)
-
-            buf = io.BytesIO()
-            plt.savefig(buf, format="png")   # can use 'jpg', 'svg', etc.
-            buf.seek(0)
-            result = projects_collection.update_one(
-                {"user_id": user_id, "project_name": project_name},
-                {"$set": {
-                    "figure":Binary(buf.getvalue()),
-                }}
-            )
-
-            plt.close()
-
-            # URL for the static image
-
-            # Prepare data for interactive plot
-            plot_data = {
-                "type": "regression",
-                "y_test": (
-                    params["y_test"]
-                    if isinstance(params["y_test"], list)
-                    else params["y_test"].tolist()
-                ),
-                "predictions": predictions.tolist(),
-                "title": "Courbe de différence Y_TEST vs Y_PRED",
-                "xlabel": "x_test",
-                "ylabel": "y_test vs predictions"
-                
-            }
+            if "predictions" in params:
+                predictions = np.asarray(params["predictions"])
+            else:
+                predictions = np.array(predictions_values)[:,0]
+            columns, n_total = plot_data.regression_points(params["y_test"], predictions, budget)
+            sampling = "lttb"
+            plot_type = "regression"
+            title, xlabel, ylabel = "Courbe de différence Y_TEST vs Y_PRED", "x_test", "y_test vs predictions"
             plot_title = "Regression Error Curve"
 
         else:  # Classification
-            # Prepare X_test for prediction
-            X_test = np.array(params["X_test"])
-            if "X_train_columns" in params and params["X_train_columns"] is not None:
-                X_test = pd.DataFrame(X_test, columns=params["X_train_columns"])
-            else:
-                X_test = np.array(X_test) if isinstance(X_test, list) else X_test
-
-            # Réduire la dimensionnalité à 2 dimensions pour une meilleure visualisation
-            pca = PCA(n_components=2)
-            print(X_test.shape)
-            X_pca = pca.fit_transform(X_test)
-            print(X_test.shape)
+            # Projection 2D de X_test calculée à l'entraînement (ou au premier affichage pour les anciens modèles)
+            X_pca = projection_cache.get(model_id, lambda: params["X_test"])
             # Prédictions des classes
-            print("shape",len(predictions_values))
-            print("test : ",predictions_values)
-            predictions_values = np.array(predictions_values)
-            y_pred = predictions_values[:,0]
+            if "predictions" in params:
+                y_pred = np.asarray(params["predictions"])
+            else:
+                y_pred = np.array(predictions_values)[:,0]
 
-            print("test : ",predictions_values)
             le = LabelEncoder()
             y_encoded = le.fit_transform(y_pred)
-
-            # Create static image
-            plt.figure(figsize=(4, 3))
-            scatter = plt.scatter(
-                X_pca[:, 0], X_pca[:, 1], c=y_encoded, cmap="viridis", marker="o"
-            )
-            plt.title("Clusters de Classification")
-            plt.xlabel("PC1")
-            plt.ylabel("PC2")
-
-            # Ajouter une légende
-            legend1 = plt.legend(*scatter.legend_elements(), title="Classes")
-            plt.gca().add_artist(legend1)
-
-            # Sauvegarde de l'image dans le dossier du projet de l'utilisateur
-            buf = io.BytesIO()
-            plt.savefig(buf, format="png")   # can use 'jpg', 'svg', etc.
-            buf.seek(0)
-            result = projects_collection.update_one(
-                {"user_id": user_id, "project_name": project_name},
-                {"$set": {
-                    "figure":Binary(buf.getvalue()),
-                }}
-            )
-            plt.close()
-            # Prepare data for interactive plot
-            plot_data = {
-                "type": "classification",
-                "x_pca_0": X_pca[:, 0].tolist(),
-                "x_pca_1": X_pca[:, 1].tolist(),
-                "labels": y_encoded.tolist(),
-                "title": "Clusters de Classification",
-                "xlabel": "PC1",
-                "ylabel": "PC2",
-            }
+            classes = [str(label) for label in le.classes_]
+            columns, n_total = plot_data.scatter_points(X_pca, y_encoded, budget)
+            sampling = "stratified"
+            plot_type = "classification"
+            title, xlabel, ylabel = "Clusters de Classification", "PC1", "PC2"
             plot_title = "Classification Clusters"
 
     else:  # Unsupervised learning
-        X = params["X"]
-        labels = params["labels"]
-        # Réduire la dimensionnalité à 2 dimensions pour une meilleure visualisation
-        pca = PCA(n_components=2)
-        X_pca = pca.fit_transform(X)
-
-        # Create static image
-        plt.figure(figsize=(4, 3))
-        scatter = plt.scatter(
-            X_pca[:, 0], X_pca[:, 1], c=labels, cmap="viridis", marker="o"
-        )
-        plt.title("Clusters Non Supervisés")
-        plt.xlabel("PC1")
-        plt.ylabel("PC2")
-
-        # Ajouter une légende
-        legend1 = plt.legend(*scatter.legend_elements(), title="Clusters")
-        plt.gca().add_artist(legend1)
-
-        buf = io.BytesIO()
-        plt.savefig(buf, format="png")   # can use 'jpg', 'svg', etc.
-        buf.seek(0)
-        result = projects_collection.update_one(
+        # Données prétraitées : l'espace dans lequel les clusters ont été calculés
+        labels = np.asarray(params["labels"])
+        X_pca = projection_cache.get(model_id, lambda: params["X_scaled"])
+        columns, n_total = plot_data.scatter_points(X_pca, labels, budget)
+        sampling = "stratified"
+        plot_type = "clustering"
+        title, xlabel, ylabel = "Clusters Non Supervisés", "PC1", "PC2"
+        plot_title = "Unsupervised Clusters"
+
+    n_points = len(next(iter(columns.values())))
+    if request.values.get("export") == "png":
+        image = plot_data.render_png(plot_type, columns, title, xlabel, ylabel)
+        projects_collection.update_one(
             {"user_id": user_id, "project_name": project_name},
             {"$set": {
-                "figure":Binary(buf.getvalue()),
+                "figure":Binary(image),
             }}
         )
-        plt.close()
-
-
-        # Prepare data for interactive plot
-        plot_data = {
-            "type": "clustering",
-            "x_pca_0": X_pca[:, 0].tolist(),
-            "x_pca_1": X_pca[:, 1].tolist(),
-            "labels": labels.tolist() if hasattr(labels, "tolist") else labels,
-            "title": "Clusters Non Supervisés",
-            "xlabel": "PC1",
-            "ylabel": "PC2",
-        }
-        plot_title = "Unsupervised Clusters"
+        return send_file(io.BytesIO(image), mimetype="image/png", as_attachment=True, download_name=f"{project_name}_plot.png")
 
-    # Convert plot data to JSON for the template
-    import json
-    plot_data_json = json.dumps(plot_data)
-    
-
-    
     return jsonify(
         {
             "success": True,
-            "plot_data": plot_data_json,
+            "plot_data": {
+                "type": plot_type,
+                "title": title,
+                "xlabel": xlabel,
+                "ylabel": ylabel,
+                "classes": classes,
+                "sampling": sampling if n_points < n_total else "none",
+                "n_total": n_total,
+                "n_points": n_points,
+                "columns": plot_data.encode_columns(columns),
+            },
             "plot_title": plot_title,
             "redirect_url" : "/plot_results"
         }
@@ -1465,19 +1590,35 @@ def delete(name):
         flash("Nom du projet invalide.", "error")
         return jsonify({"success": False, "error": "Project name is required."}), 400
 
-    project = projects_collection.find_one({"user_id": user_id, "project_name": project_name})
+    project = project_store.get(user_id, project_name, [
+        "dataset_file_id", "parquet_file_id", "model_id", "train_parameters.arrays",
+        "preprocessing_pipeline_id",
+    ])
     if project:
         # If figure stored in GridFS
         if "dataset_file_id" in project:
+            dataset_cache.invalidate(project["dataset_file_id"])
+            fold_cache.delete_dataset(project["dataset_file_id"])
+            column_profiles.delete_dataset(project["dataset_file_id"])
+            visualization_store.delete_dataset(project["dataset_file_id"])
             try:
                 fs.delete(project["dataset_file_id"])
             except Exception as e:
                 flash(f"Erreur lors de la suppression de dataset : {str(e)}", "error")
+        delete_arrays(fs, project.get("train_parameters"))
+        if project.get("parquet_file_id") is not None:
+            try:
+                fs.delete(project["parquet_file_id"])
+            except Exception as e:
+                flash(f"Erreur lors de la suppression de dataset : {str(e)}", "error")
         if "model_id" in project:
+            model_registry.invalidate(user_id, project_name)
+            projection_cache.delete(project["model_id"])
             try:
                 fs.delete(project["model_id"])
             except Exception as e:
                 flash(f"Erreur lors de la suppression de model : {str(e)}", "error")
+        delete_preprocessing_pipeline(project.get("preprocessing_pipeline_id"))
         projects_collection.delete_one({"_id": project["_id"]})
         flash(f"Projet '{project_name}' supprimé avec succès (MongoDB).", "success")
     else:
@@ -1508,7 +1649,7 @@ def preprocessing_methods():
 
     user_id = session.get("user_id")
     project_name = session.get("project_name")
-    result = projects_collection.find_one({"user_id":user_id, "project_name":project_name})
+    result = project_store.get(user_id, project_name, ["filename", "dataset_file_id", "parquet_file_id"])
     filename = result.get("filename")
 
     if not project_name or not filename:
@@ -1521,12 +1662,9 @@ def preprocessing_methods():
             }
         )
 
-    dataset_id = result.get("dataset_file_id")
-    dataset_from_db = fs.get(dataset_id)
-    file_bytes = dataset_from_db.read()
     print("hello")
     try:
-        df = pd.read_csv(io.BytesIO(file_bytes))
+        df = load_dataset(result)
 
         # Déterminer les types de colonnes
         column_types = [
@@ -1555,18 +1693,20 @@ def preprocessing_methods():
         )
 
 
-def create_report(project_name,preprocessed_file_path):
-    try:
-        if isinstance(preprocessed_file_path, (str, bytes, os.PathLike)):
-            df = pd.read_csv(preprocessed_file_path)
-            filename = os.path.basename(preprocessed_file_path)
-        else:
-            df = pd.read_csv(preprocessed_file_path)
-            filename = "in_memory_dataset.csv"
-        df = pd.read_csv(preprocessed_file_path)
-        filename = os.path.basename(preprocessed_file_path)
-        final_filename = filename.replace("preprocessed_", "")
+def create_report(project_name, filename, df, stats):
+    """
+    Rapport HTML d'un prétraitement, construit à partir du DataFrame prétraité déjà en mémoire.
+
+    Args:
+        project_name: Le nom du projet
+        filename: Le nom du fichier du dataset original
+        df: Le DataFrame prétraité
+        stats: Les statistiques du dataset prétraité calculées par /preprocessing/apply
 
+    Returns:
+        Binary: Le rapport HTML, ou None en cas d'erreur
+    """
+    try:
         # Construire le rapport HTML en mémoire (pas sur disque)
         html_content = "<html><head><title>Preprocessing Report</title>"
         html_content += (
@@ -1576,15 +1716,15 @@ def create_report(project_name,preprocessed_file_path):
         )
         html_content += "</head><body>"
         html_content += f"<h1>Preprocessing Report - {project_name}</h1>"
-        html_content += f'<p><strong>Original Dataset:</strong> {filename.replace("preprocessed_", "")}</p>'
-        html_content += f"<p><strong>Preprocessed Dataset:</strong> {final_filename}</p>"
+        html_content += f"<p><strong>Original Dataset:</strong> {filename}</p>"
+        html_content += f"<p><strong>Preprocessed Dataset:</strong> preprocessed_{filename}</p>"
 
         # Dataset Statistics
         html_content += "<h2>Dataset Statistics</h2>"
-        html_content += f"<p>Number of Rows: {len(df)}</p>"
-        html_content += f"<p>Number of Columns: {len(df.columns)}</p>"
-        html_content += f"<p>Missing Values: {df.isna().sum().sum()}</p>"
-        html_content += f"<p>Memory Size: {df.memory_usage(deep=True).sum() / (1024 * 1024):.2f} MB</p>"
+        html_content += f"<p>Number of Rows: {stats['rows']}</p>"
+        html_content += f"<p>Number of Columns: {stats['columns']}</p>"
+        html_content += f"<p>Missing Values: {stats['missing_values']}</p>"
+        html_content += f"<p>Memory Size: {stats['memory_usage']}</p>"
 
         # Data Preview
         html_content += "<h2>Data Preview</h2><div style='overflow-x:auto;'>"
@@ -1605,6 +1745,17 @@ def create_report(project_name,preprocessed_file_path):
         return None
 
 
+def delete_preprocessing_pipeline(pipeline_id):
+    """Supprime un pipeline de prétraitement enregistré (remplacé ou projet supprimé)."""
+    if pipeline_id is None:
+        return
+    try:
+        fs.delete(pipeline_id)
+    except Exception as e:
+        print(f"Erreur lors de la suppression du pipeline {pipeline_id}: {str(e)}")
+    model_artifacts.discard_local_copy(pipeline_id)
+
+
 @app.route("/preprocessing/apply", methods=["POST","GET"])
 def preprocessing_apply():
     # Vérifier si l'utilisateur est connecté
@@ -1615,7 +1766,9 @@ def preprocessing_apply():
     # Récupérer les informations de la session et du formulaire
     user_id = session["user_id"]
     project_name = session.get("project_name")
-    result = projects_collection.find_one({"user_id":user_id, "project_name":project_name})
+    result = project_store.get(user_id, project_name, [
+        "filename", "dataset_file_id", "parquet_file_id", "preprocessing_pipeline_id",
+    ])
     filename = result.get("filename")    
     if not project_name or not filename:
         flash("Informations de projet manquantes. Veuillez recommencer.")
@@ -1630,591 +1783,60 @@ def preprocessing_apply():
             flash("Veuillez sélectionner au moins une méthode de prétraitement.")
             return jsonify({"success": False, "error": "No preprocessing methods selected."}), 400
         dataset_id = result.get("dataset_file_id")
-        dataset_from_db = fs.get(dataset_id)
-        file_bytes = dataset_from_db.read()
+        previous_pipeline_id = result.get("preprocessing_pipeline_id")
 
         try:
             print("df loading")
-            df = pd.read_csv(io.BytesIO(file_bytes))
-            print("shape : ",df.shape)
-            original_df = df.copy()
-            applied_methods = []
-
-            # 1. Normalisation
-            if "normalization" in preprocessing_methods:
-                norm_method = data.get("normalization_method")
-                norm_columns = data.get("normalization_columns")
-                if norm_columns:
-                    if norm_method == "minmax":
-                        scaler = MinMaxScaler()
-                        df[norm_columns] = scaler.fit_transform(df[norm_columns])
-                    elif norm_method == "robust":
-                        scaler = RobustScaler()
-                        df[norm_columns] = scaler.fit_transform(df[norm_columns])
-                    elif norm_method == "maxabs":
-                        scaler = MaxAbsScaler()
-                        df[norm_columns] = scaler.fit_transform(df[norm_columns])
-
-                    # Créer une visualisation avant/après
-                    plt.figure(figsize=(14, 6))
-                    plt.subplot(1, 2, 1)
-                    plt.title("Before Normalization")
-                    for col in norm_columns[:2]:
-                        sns.kdeplot(original_df[col], label=col)
-                    plt.legend()
-
-                    # Après normalisation
-                    plt.subplot(1, 2, 2)
-                    plt.title("After Normalization")
-                    for col in norm_columns[:2]:
-                        sns.kdeplot(df[col], label=f"{col} normalisé")
-                    plt.legend()
-
-                    
-                    plt.tight_layout(pad=2.0)  # Augmenter l'espace entre les subplots
-                    buf = io.BytesIO()
-                    plt.savefig(buf, format="png")   # can use 'jpg', 'svg', etc.
-                    buf.seek(0)
-                    result = projects_collection.update_one(
-                        {"user_id": user_id, "project_name": project_name},
-                        {"$set": {
-                            "visualizations":{
-                                 "normalization":Binary(buf.getvalue()),
-                            } 
-                        }}
-                    )
-                    plt.close()
-                    applied_methods.append(
-                        {
-                            "name": "Normalization",
-                            "params": {
-                                "Method": norm_method,
-                                "Columns": ", ".join(norm_columns),
-                            },
-                        }
-                    )
-
-            # 2. Standardisation
-            if "standardization" in preprocessing_methods:
-                std_columns = data.get("standardization_columns")
-
-                if std_columns:
-                    scaler = StandardScaler()
-                    df[std_columns] = scaler.fit_transform(df[std_columns])
-
-                    # Créer une visualisation avant/après
-                    plt.figure(figsize=(14, 6))
-                    plt.subplot(1, 2,1)
-                    plt.title("Before standardization")
-                    for col in std_columns[:2]:
-                        sns.kdeplot(original_df[col], label=f"{col}")
-                    plt.legend()
-                    plt.subplot(1, 2,2)
-                    plt.title("After standardization")
-                    for col in std_columns[:2]:
-                        sns.kdeplot(df[col], label=f"{col} standarized")
-                    plt.legend()
-
-                    
-                    plt.tight_layout(pad=2.0)  # Augmenter l'espace entre les subplots
-                    buf = io.BytesIO()
-                    plt.savefig(buf, format="png")   # can use 'jpg', 'svg', etc.
-                    buf.seek(0)
-                    result = projects_collection.update_one(
-                        {"user_id": user_id, "project_name": project_name},
-                        {"$set": {
-                            "visualizations":{
-                                 "standardization":Binary(buf.getvalue()),
-                            } 
-                        }}
-                    )
-                    plt.close()
-
-                    applied_methods.append(
-                        {
-                            "name": "Standardization",
-                            "params": {"Columns": ", ".join(std_columns)},
-                        }
-                    )
-
-            # 3. Gestion des valeurs manquantes
-            if "missing_values" in preprocessing_methods:
-                missing_strategy = data.get("missing_values_strategy", "mean")
-                missing_columns = data.get("missing_values_columns")
-                constant_value = data.get("missing_values_constant_value", "0")
-
-                if missing_columns:
-                    if missing_strategy == "drop":
-                        # Compter les lignes avant la suppression
-                        rows_before = len(df)
-                        df = df.dropna(subset=missing_columns)
-                        rows_after = len(df)
-                        rows_dropped = rows_before - rows_after
-
-                        applied_methods.append(
-                            {
-                                "name": "missing_values",
-                                "params": {
-                                    "Stratégie": "Suppression des lignes",
-                                    "columns": ", ".join(missing_columns),
-                                    "Lignes supprimées": str(rows_dropped),
-                                },
-                            }
-                        )
-                    else:
-                        # Utiliser SimpleImputer pour les autres stratégies
-                        if missing_strategy == "constant":
-                            imputer = SimpleImputer(
-                                strategy="constant", fill_value=constant_value
-                            )
-                            strategy_name = f"Valeur constante ({constant_value})"
-                        else:
-                            imputer = SimpleImputer(strategy=missing_strategy)
-                            strategy_name = {
-                                "mean": "Moyenne",
-                                "median": "Médiane",
-                                "most_frequent": "Valeur la plus fréquente",
-                            }[missing_strategy]
-
-                        df[missing_columns] = imputer.fit_transform(df[missing_columns])
-
-                        applied_methods.append(
-                            {
-                                "name": "missing_values",
-                                "params": {
-                                    "Stratégie": strategy_name,
-                                    "columns": ", ".join(missing_columns),
-                                },
-                            }
-                        )
-
-            # 4. Détection et traitement des outliers
-            if "outliers" in preprocessing_methods:
-                outlier_method = data.get("outliers_method", "zscore")
-                outlier_treatment = data.get("outliers_treatment", "remove")
-                outlier_columns = data.get("outliers_columns")
-
-                if outlier_columns:
-                    outliers_detected = 0
-
-                    for col in outlier_columns:
-                        if outlier_method == "zscore":
-                            # Z-score method
-                            z_scores = np.abs((df[col] - df[col].mean()) / df[col].std())
-                            outliers_mask = z_scores > 3
-                            outliers_detected += outliers_mask.sum()
-
-                            if outlier_treatment == "remove":
-                                df = df[~outliers_mask]
-                            elif outlier_treatment == "cap":
-                                # Capping
-                                upper_limit = df[col].mean() + 3 * df[col].std()
-                                lower_limit = df[col].mean() - 3 * df[col].std()
-                                df[col] = df[col].clip(lower=lower_limit, upper=upper_limit)
-                            elif outlier_treatment == "replace_mean":
-                                df.loc[outliers_mask, col] = df[col].mean()
-                            elif outlier_treatment == "replace_median":
-                                df.loc[outliers_mask, col] = df[col].median()
-
-                        elif outlier_method == "iqr":
-                            # IQR method
-                            Q1 = df[col].quantile(0.25)
-                            Q3 = df[col].quantile(0.75)
-                            IQR = Q3 - Q1
-                            lower_bound = Q1 - 1.5 * IQR
-                            upper_bound = Q3 + 1.5 * IQR
-                            outliers_mask = (df[col] < lower_bound) | (
-                                df[col] > upper_bound
-                            )
-                            outliers_detected += outliers_mask.sum()
-
-                            if outlier_treatment == "remove":
-                                df = df[~outliers_mask]
-                            elif outlier_treatment == "cap":
-                                df[col] = df[col].clip(lower=lower_bound, upper=upper_bound)
-                            elif outlier_treatment == "replace_mean":
-                                df.loc[outliers_mask, col] = df[col].mean()
-                            elif outlier_treatment == "replace_median":
-                                df.loc[outliers_mask, col] = df[col].median()
-
-                        elif outlier_method == "isolation_forest":
-                            # Isolation Forest
-                            iso_forest = IsolationForest(
-                                contamination=0.05, random_state=42
-                            )
-                            outliers_mask = iso_forest.fit_predict(df[[col]]) == -1
-                            outliers_detected += outliers_mask.sum()
-
-                            if outlier_treatment == "remove":
-                                df = df[~outliers_mask]
-                            elif outlier_treatment == "replace_mean":
-                                df.loc[outliers_mask, col] = df[col].mean()
-                            elif outlier_treatment == "replace_median":
-                                df.loc[outliers_mask, col] = df[col].median()
-
-                    # Créer une visualisation pour les outliers (boxplot avant/après)
-                    if outlier_columns:
-                        plt.figure(figsize=(14, 6))
-                        plt.subplot(1, 2, 1)
-                        plt.title("Before outliers treatement")
-                        sns.boxplot(data=original_df[outlier_columns[:3]])
-
-                        plt.subplot(1, 2, 2)
-                        plt.title("After outliers treatement")
-                        sns.boxplot(data=df[outlier_columns[:3]])
-
-                        plt.tight_layout()
-                        buf = io.BytesIO()
-                        plt.savefig(buf, format="png")   # can use 'jpg', 'svg', etc.
-                        buf.seek(0)
-                        result = projects_collection.update_one(
-                            {"user_id": user_id, "project_name": project_name},
-                            {"$set": {
-                                "visualizations":{
-                                "outliers":Binary(buf.getvalue()),
-                            } 
-                            }}
-                        )
-                        plt.close()
-
-                    treatment_names = {
-                        "remove": "Suppression",
-                        "cap": "Plafonnement",
-                        "replace_mean": "Remplacement par la moyenne",
-                        "replace_median": "Remplacement par la médiane",
-                    }
-
-                    method_names = {
-                        "zscore": "Z-Score",
-                        "iqr": "IQR (Écart interquartile)",
-                        "isolation_forest": "Isolation Forest",
-                    }
-
-                    applied_methods.append(
-                        {
-                            "name": "outliers detection",
-                            "params": {
-                                "Méthode": method_names.get(outlier_method, outlier_method),
-                                "Traitement": treatment_names.get(
-                                    outlier_treatment, outlier_treatment
-                                ),
-                                "columns": ", ".join(outlier_columns),
-                                "Outliers détectés": str(outliers_detected),
-                            },
-                        }
-                    )
-
-            # 5. Encodage des variables catégorielles
-            if "encoding" in preprocessing_methods:
-                encoding_method = data.get("encoding_method", "onehot")
-                encoding_columns = data.get("encoding_columns")
-
-                if encoding_columns:
-                    if encoding_method == "onehot":
-                        # One-hot encoding
-                        df = pd.get_dummies(df, columns=encoding_columns, drop_first=False)
-                    elif encoding_method == "label":
-                        # Label encoding
-                        for col in encoding_columns:
-                            le = LabelEncoder()
-                            df[col] = le.fit_transform(df[col].astype(str))
-                    elif encoding_method == "ordinal":
-                        # Ordinal encoding
-                        oe = OrdinalEncoder()
-                        df[encoding_columns] = oe.fit_transform(
-                            df[encoding_columns].astype(str)
-                        )
-                    elif encoding_method == "binary":
-                        # Binary encoding (utilisant get_dummies puis conversion en binaire)
-                        for col in encoding_columns:
-                            dummies = pd.get_dummies(df[col], prefix=col)
-                            df = pd.concat([df.drop(col, axis=1), dummies], axis=1)
-
-                    method_names = {
-                        "onehot": "One-Hot Encoding",
-                        "label": "Label Encoding",
-                        "ordinal": "Ordinal Encoding",
-                        "binary": "Binary Encoding",
-                    }
-
-                    applied_methods.append(
-                        {
-                            "name": "encoding categorical features",
-                            "params": {
-                                "Méthode": method_names.get(
-                                    encoding_method, encoding_method
-                                ),
-                                "columns": ", ".join(encoding_columns),
-                            },
-                        }
-                    )
-
-            # 6. Sélection de caractéristiques
-            if "feature_selection" in preprocessing_methods:
-                feature_method = data.get("feature_selection_method", "variance")
-                n_components = int(data.get("feature_selection_n_components", 5))
-
-                # Sauvegarder les columns originales pour la visualisation
-                original_columns = df.columns.tolist()
-
-                if feature_method == "variance":
-                    # Variance threshold
-                    selector = VarianceThreshold(threshold=0.1)
-                    numeric_cols = df.select_dtypes(include=["number"]).columns.tolist()
-                    if numeric_cols:
-                        df_numeric = df[numeric_cols]
-                        selected_data = selector.fit_transform(df_numeric)
-                        selected_features = [
-                            numeric_cols[i]
-                            for i in range(len(numeric_cols))
-                            if i in selector.get_support(indices=True)
-                        ]
-
-                        # Reconstruire le dataframe avec les caractéristiques sélectionnées
-                        df = pd.DataFrame(selected_data, columns=selected_features)
-
-                        # Ajouter les columns non numériques si elles existent
-                        non_numeric_cols = [
-                            col for col in original_columns if col not in numeric_cols
-                        ]
-                        if non_numeric_cols:
-                            df = pd.concat([df, original_df[non_numeric_cols]], axis=1)
-
-                elif feature_method == "kbest":
-                    # SelectKBest
-                    if "target" in df.columns:
-                        X = df.drop("target", axis=1).select_dtypes(include=["number"])
-                        y = df["target"]
-
-                        if not X.empty:
-                            selector = SelectKBest(
-                                f_classif, k=min(n_components, X.shape[1])
-                            )
-                            selected_data = selector.fit_transform(X, y)
-                            selected_features = X.columns[selector.get_support()].tolist()
-
-                            # Reconstruire le dataframe
-                            new_df = pd.DataFrame(selected_data, columns=selected_features)
-                            new_df["target"] = y.values
-
-                            # Ajouter les columns non numériques si elles existent
-                            non_numeric_cols = [
-                                col
-                                for col in original_columns
-                                if col not in X.columns and col != "target"
-                            ]
-                            if non_numeric_cols:
-                                new_df = pd.concat(
-                                    [new_df, original_df[non_numeric_cols]], axis=1
-                                )
-
-                            df = new_df
-
-                elif feature_method == "pca":
-                    # PCA
-                    numeric_cols = df.select_dtypes(include=["number"]).columns.tolist()
-                    if numeric_cols:
-                        pca = PCA(n_components=min(n_components, len(numeric_cols)))
-                        pca_result = pca.fit_transform(df[numeric_cols])
-
-                        # Créer un nouveau dataframe avec les composantes principales
-                        pca_df = pd.DataFrame(
-                            pca_result,
-                            columns=[f"PC{i+1}" for i in range(pca_result.shape[1])],
-                        )
-
-                        # Ajouter les columns non numériques si elles existent
-                        non_numeric_cols = [
-                            col for col in df.columns if col not in numeric_cols
-                        ]
-                        if non_numeric_cols:
-                            pca_df = pd.concat([pca_df, df[non_numeric_cols]], axis=1)
-
-                        # Créer une visualisation de la variance expliquée
-                        plt.figure(figsize=(12, 6))
-                        plt.bar(
-                            range(1, len(pca.explained_variance_ratio_) + 1),
-                            pca.explained_variance_ratio_,
-                            alpha=0.8,
-                        )
-                        plt.step(
-                            range(1, len(pca.explained_variance_ratio_) + 1),
-                            np.cumsum(pca.explained_variance_ratio_),
-                            where="mid",
-                            label="Variance expliquée cumulée",
-                        )
-                        plt.xlabel("Composantes principales")
-                        plt.ylabel("Ratio de variance expliquée")
-                        plt.title("Variance expliquée par composante principale")
-                        plt.legend()
-
-                        
-                        plt.tight_layout()
-                        buf = io.BytesIO()
-                        plt.savefig(buf, format="png")   # can use 'jpg', 'svg', etc.
-                        buf.seek(0)
-                        result = projects_collection.update_one(
-                            {"user_id": user_id, "project_name": project_name},
-                            {"$set": {
-                                "visualizations":{
-                                "feature_selection":Binary(buf.getvalue()),
-                            } 
-                            }}
-                        )
-                        plt.close()
-
-                        df = pca_df
-
-                method_names = {
-                    "variance": "Seuil de variance",
-                    "kbest": "SelectKBest",
-                    "rfe": "Élimination récursive",
-                    "pca": "Analyse en composantes principales (PCA)",
-                }
-
-                applied_methods.append(
-                    {
-                        "name": "feature_selection",
-                        "params": {
-                            "Méthode": method_names.get(feature_method, feature_method),
-                            "Nombre de caractéristiques": str(n_components),
-                            "Caractéristiques sélectionnées": str(len(df.columns)),
-                        },
-                    }
-                )
-
-            # 7. Transformation des données
-            if "transformation" in preprocessing_methods:
-                transform_method = data.get("transformation_method", "log")
-                transform_columns = data.get("transformation_columns")
-
-                if transform_columns:
-                    # Vérifier que les columns existent dans le dataframe
-                    transform_columns = [
-                        col for col in transform_columns if col in df.columns
-                    ]
-
-                    if transform_method == "log":
-                        # Log transformation (ajouter 1 pour éviter log(0))
-                        for col in transform_columns:
-                            # S'assurer que toutes les valeurs sont positives
-                            min_val = df[col].min()
-                            if min_val <= 0:
-                                df[col] = df[col] - min_val + 1
-                            df[col] = np.log(df[col])
-
-                    elif transform_method == "sqrt":
-                        # Square root transformation
-                        for col in transform_columns:
-                            # S'assurer que toutes les valeurs sont positives
-                            min_val = df[col].min()
-                            if min_val < 0:
-                                df[col] = df[col] - min_val
-                            df[col] = np.sqrt(df[col])
-
-                    elif transform_method == "boxcox":
-                        # Box-Cox transformation
-                        for col in transform_columns:
-                            # Box-Cox nécessite des valeurs strictement positives
-                            min_val = df[col].min()
-                            if min_val <= 0:
-                                df[col] = df[col] - min_val + 1
-
-                            # Appliquer Box-Cox
-                            try:
-                                transformer = PowerTransformer(method="box-cox")
-                                df[col] = transformer.fit_transform(df[[col]]).flatten()
-                            except Exception as e:
-                                # En cas d'erreur, utiliser Yeo-Johnson qui est plus flexible
-                                transformer = PowerTransformer(method="yeo-johnson")
-                                df[col] = transformer.fit_transform(df[[col]]).flatten()
-
-                    elif transform_method == "yeo-johnson":
-                        # Yeo-Johnson transformation
-                        transformer = PowerTransformer(method="yeo-johnson")
-                        df[transform_columns] = transformer.fit_transform(
-                            df[transform_columns]
-                        )
-
-                    # Créer une visualisation avant/après
-                    plt.figure(figsize=(16, 6))
-                    cols_to_plot = transform_columns[:2]  # max 2 columns
-
-                    for i, col in enumerate(cols_to_plot):
-                        plt.subplot(1, 2 * len(cols_to_plot), 2 * i + 1)
-                        plt.title(f"Before transformation - {col}")
-                        sns.histplot(original_df[col], kde=True)
-
-                        plt.subplot(1, 2 * len(cols_to_plot), 2 * i + 2)
-                        plt.title(f"After transformation - {col}")
-                        sns.histplot(df[col], kde=True)
-
-                    
-                    plt.tight_layout()
-                    buf = io.BytesIO()
-                    plt.savefig(buf, format="png")   # can use 'jpg', 'svg', etc.
-                    buf.seek(0)
-                    result = projects_collection.update_one(
-                        {"user_id": user_id, "project_name": project_name},
-                        {"$set": {
-                            "visualizations":{
-                                 "transformation":Binary(buf.getvalue()),
-                            } 
-                        }}
-                    )
-                    plt.close()
-
-                    method_names = {
-                        "log": "Logarithmique",
-                        "sqrt": "Racine carrée",
-                        "boxcox": "Box-Cox",
-                        "yeo-johnson": "Yeo-Johnson",
-                    }
-
-                    applied_methods.append(
-                        {
-                            "name": "transformation",
-                            "params": {
-                                "Méthode": method_names.get(
-                                    transform_method, transform_method
-                                ),
-                                "columns": ", ".join(transform_columns),
-                            },
-                        }
-                    )
+            # Le DataFrame en cache reste intact : chaque étape produit un nouveau DataFrame
+            original_df = load_dataset(result)
+            print("shape : ",original_df.shape)
+
+            # Plan compilé en Pipeline : les opérations colonne par colonne consécutives sont fusionnées
+            plan = preprocessing_pipeline.compile_plan(data)
+            pipeline = preprocessing_pipeline.build_pipeline(plan)
+            df = pipeline.fit_transform(original_df)
+            applied_methods = preprocessing_pipeline.applied_methods(pipeline)
+            # Graphiques dessinés plus tard, en arrière-plan et sur un échantillon (voir /preprocessing/visualizations)
+            specs = visualization_specs(plan, pipeline, original_df, df)
+            # Pipeline ajusté enregistré pour être rejoué sur de nouvelles données (/preprocessing/transform)
+            pipeline_id = model_artifacts.save_model(fs, pipeline, f"preprocessing_{filename}.joblib.gz")
 
             # Sauvegarder le dataframe prétraité
-            csv_bytes = df.to_csv(index=False).encode()
-            dataset_file_id = fs.put(csv_bytes, filename=f"preprocessed_{filename}", content_type="text/csv")
-            preview_dataset = preview(io.BytesIO(csv_bytes))
+            dataset_file_id = dataset_store.store_csv(fs, df, f"preprocessed_{filename}")
+            parquet_file_id = store_columnar(df, f"preprocessed_{filename}")
+            preview_dataset = preview(fs.get(dataset_file_id))
             stats = {
                 "rows": len(df),
                 "columns": len(df.columns),
                 "missing_values": df.isna().sum().sum(),
                 "memory_usage": f"{df.memory_usage(deep=True).sum() / (1024 * 1024):.2f} MB",
             }
-            
-            data_visualizations = []
-            result = projects_collection.find_one({"user_id":user_id,"project_name":project_name},{"visualizations": 1, "_id": 0})
-            if result and "visualizations" in result:
-                for key, value in result["visualizations"].items():
-                    if isinstance(value, Binary):
-                        encoded = base64.b64encode(value).decode("utf-8")
-                        data_visualizations.append({"name": key, "data": encoded})
-            temp_path = f"preprocessed_{filename}.csv"
-            df.to_csv(temp_path, index=False)
-            report_doc = create_report(project_name, temp_path)
+            source = {"dataset_file_id": dataset_id, "parquet_file_id": result.get("parquet_file_id")}
+            report_doc = create_report(project_name, filename, df, stats)
+            dataset_cache.invalidate(dataset_id)
+            dataset_cache.put(dataset_file_id, df)
+            delete_preprocessing_pipeline(previous_pipeline_id)
+            visualization_store.delete_dataset(dataset_id)
             result = projects_collection.update_one({"user_id":user_id,"project_name": project_name},
-            {"$set":{
+            {"$unset": {"visualizations": ""},
+            "$set":{
                 "dataset_file_id":dataset_file_id,
+                "parquet_file_id":parquet_file_id,
+                "preprocessing_pipeline_id":pipeline_id,
                 "report_doc":report_doc,
                 "preprocessing_results":{
                     "applied_methods": convert_to_serializable(applied_methods),
                     "stats": convert_to_serializable(stats),
                     "preview_data":preview_dataset,
-                    "visualizations":data_visualizations,
-                }
+                    "visualizations":[
+                        {"name": spec["step"], "columns": spec["columns"], "url": f"/preprocessing/visualizations/{spec['step']}"}
+                        for spec in specs
+                    ],
+                },
+                "preprocessing_visualizations": {"source": source, "specs": specs},
             }})
+            if specs:
+                training_queue.submit(user_id, project_name, kind=VISUALIZATIONS)
             return jsonify({
                 "success": True
             })
@@ -2223,7 +1845,7 @@ def preprocessing_apply():
             # Rediriger vers la page des méthodes de prétraitement au lieu d'afficher une page d'erreur
             return jsonify({"success": False, "error": str(e)})
     elif request.method == 'GET' : 
-        result = projects_collection.find_one({"user_id":user_id,"project_name":project_name},{"preprocessing_results":1, "_id": 0})
+        result = project_store.get(user_id, project_name, ["preprocessing_results"])
         if result and "preprocessing_results" in result :
             preprocessing_results = result["preprocessing_results"]
         else :  
@@ -2239,6 +1861,67 @@ def preprocessing_apply():
             **preprocessing_results
         })
 
+
+@app.route("/preprocessing/visualizations/<string:step>", methods=["GET"])
+def preprocessing_visualization(step):
+    """
+    Retourne le graphique avant/après d'une étape du dernier prétraitement (image PNG).
+
+    Tant que le graphique n'est pas rendu, la réponse est 202 avec le job
+    de rendu, que le client interroge à nouveau plus tard.
+    """
+    if "user_id" not in session:
+        return jsonify({"success": False, "error": "Authentication required."}), 401
+
+    user_id = session["user_id"]
+    project_name = session.get("project_name")
+    project = project_store.get(user_id, project_name, ["dataset_file_id", "preprocessing_visualizations"])
+    specs = ((project or {}).get("preprocessing_visualizations") or {}).get("specs", [])
+    spec = next((spec for spec in specs if spec["step"] == step), None)
+    if spec is None:
+        return jsonify({"success": False, "error": "Aucun graphique pour cette étape."}), 404
+
+    image = visualization_store.get(project["dataset_file_id"], spec)
+    if image is not None:
+        return send_file(io.BytesIO(image), mimetype="image/png")
+
+    job = jobs_collection.find_one(
+        {"user_id": user_id, "project_name": project_name, "kind": VISUALIZATIONS},
+        sort=[("created_at", -1)],
+    )
+    if job is not None and job["status"] == FAILED:
+        return jsonify({"success": False, "error": job.get("error"), "job": serialize_job(job)}), 500
+    # Pas de job actif (rendu interrompu, ou lancé avant le dernier prétraitement) : en relancer un
+    job_id = training_queue.submit(user_id, project_name, kind=VISUALIZATIONS)
+    job = jobs_collection.find_one({"_id": job_id})
+    return jsonify({"success": True, "status": "pending", "job": serialize_job(job)}), 202
+
+
+@app.route("/preprocessing/transform", methods=["POST"])
+def preprocessing_transform():
+    """Rejoue le pipeline de prétraitement ajusté du projet sur un nouveau fichier et retourne le CSV obtenu."""
+    user_id = session.get("user_id")
+    project_name = session.get("project_name")
+    if not user_id or not project_name:
+        return jsonify({"success": False, "error": "Veuillez vous connecter."}), 401
+
+    project = project_store.get(user_id, project_name, ["preprocessing_pipeline_id"])
+    if not project or project.get("preprocessing_pipeline_id") is None:
+        return jsonify({"success": False, "error": "Aucun prétraitement appliqué à ce projet."}), 404
+    file = request.files.get("dataset")
+    if not file or not allowed_file(file.filename):
+        return jsonify({"success": False, "error": "Only CSV, Excel, and JSON files are supported."}), 400
+
+    try:
+        df = dataset_store.parse_dataset(file.stream, secure_filename(file.filename))
+        pipeline, _ = model_artifacts.load_model(fs, project["preprocessing_pipeline_id"])
+        transformed = pipeline.transform(df)
+    except Exception as e:
+        return jsonify({"success": False, "error": str(e)}), 400
+    output = io.BytesIO(transformed.to_csv(index=False).encode("utf-8"))
+    return send_file(output, as_attachment=True, download_name=f"preprocessed_{secure_filename(file.filename)}.csv", mimetype="text/csv")
+
+
 @app.route("/preprocessing/report",methods=['GET'])
 def preprocessing_report():
     user_id = session.get("user_id")
@@ -2247,9 +1930,7 @@ def preprocessing_report():
     if not user_id or not project_name:
         return jsonify({"success": False, "error": "Veuillez vous connecter."}), 401
 
-    project = projects_collection.find_one(
-        {"user_id": user_id, "project_name": project_name}  # assume you saved HTML as 'report' field
-    )
+    project = project_store.get(user_id, project_name, ["report_doc"])
     report_doc = project.get("report_doc")
     if isinstance(report_doc, Binary):  # bson.binary.Binary
         report_doc = bytes(report_doc).decode("utf-8")
@@ -2287,12 +1968,10 @@ def predict_page():
         )
 
     user_id = session["user_id"]
-    result = projects_collection.find_one({"user_id":user_id, "project_name":project_name})
-    params = result["train_parameters"]
-    if learning_type == "supervised":
-        features = params.get("X_train_columns", [])
-    else:
-        features = params.get("X_columns", [])
+    result = project_store.get(user_id, project_name, [
+        "train_parameters.input_columns", "train_parameters.X_train_columns", "train_parameters.X_columns",
+    ])
+    features = expected_columns(result["train_parameters"], learning_type)
 
     model_info = {
         "project_name": project_name,
@@ -2342,43 +2021,30 @@ def predict():
             processed_inputs[feature] = val 
     print(processed_inputs)
     try:
-        result = projects_collection.find_one({"user_id":user_id, "project_name":project_name})
-        model_id = result.get("model_id")
-        model_from_db = fs.get(model_id)
-        model_bytes = model_from_db.read()
-        model = jb.load(io.BytesIO(model_bytes))
-        params = result["train_parameters"]
-        print(params)
-
-        # Préparer les données d'entrée pour la prédiction
-        if learning_type == "supervised":
-            expected_columns = params.get("X_train_columns", list(processed_inputs.keys()))
-        else:
-            expected_columns = params.get("X_columns", list(processed_inputs.keys()))
-        print(expected_columns)
-        input_data = [processed_inputs[feature] for feature in expected_columns]
+        result = project_store.get(user_id, project_name, ["model_id", "train_parameters"])
+        model = model_registry.load(user_id, project_name, result.get("model_id"))
+        params = LazyArrays(fs, result["train_parameters"])
 
-        # Créer un DataFrame avec les données d'entrée
-        input_df = pd.DataFrame([input_data], columns=expected_columns)
+        # Préparer les données d'entrée pour la prédiction (colonnes brutes de l'entraînement)
+        columns = expected_columns(params, learning_type) or list(processed_inputs.keys())
+        print(columns)
+        input_data = [processed_inputs[feature] for feature in columns]
 
-        # Appliquer les mêmes prétraitements que lors de l'entraînement si nécessaire
-        if "preprocessor" in params and params["preprocessor"] is not None:
-            input_df = params["preprocessor"].transform(input_df)
+        # Créer un DataFrame avec les données d'entrée ; le modèle applique
+        # lui-même le prétraitement ajusté à l'entraînement
+        input_df = pd.DataFrame([input_data], columns=columns)
 
         # Faire la prédiction
         # Pour les modèles non supervisés, utiliser notre fonction predict_cluster
         if learning_type == "unsupervised":
             # Importer la fonction predict_cluster depuis unsupervised_models
 
-            # Récupérer les données d'entraînement et les labels si disponibles
-            X_scaled = params.get("X_scaled", None)
-            labels = params.get("labels", None)
-
             # Utiliser notre fonction personnalisée pour prédire le cluster
+            # (centroïdes calculés à l'entraînement, ou données d'entraînement pour les anciens projets)
             prediction = unsupervised_models.predict_cluster(
-                model, input_df.values, X_scaled, labels
+                model, input_df, params=params
             )
-            prediction_result = prediction[0]
+            prediction_result = to_native(prediction[0])
 
             # Si la prédiction est -1 (bruit), afficher un message plus clair
             if prediction_result == -1:
@@ -2402,14 +2068,14 @@ def predict():
         print(processed_inputs)
         session["input_values"] = processed_inputs
         session["prediction_result"] = prediction_result
-        session["features"] = expected_columns
+        session["features"] = columns
         model_info = {
             "project_name": project_name,
             "filename": filename,
             "algo": algo,
             "model_type": model_type,
             "learning_type": learning_type,
-            "features": expected_columns,  
+            "features": columns,
             "input_values":processed_inputs,
             "prediction_result":prediction_result,
             "params_dict": params.get("algorithm_parameters", {})
@@ -2427,6 +2093,88 @@ def predict():
         return jsonify({"success": False, "error": str(e)})
 
 
+def batch_input_file(user_id):
+    """
+    Retourne le fichier à prédire et son format ("csv" ou "parquet").
+
+    Le fichier est soit uploadé (champ "file"), soit un dataset GridFS
+    d'un projet de l'utilisateur (champ "file_id").
+
+    Returns:
+        tuple: (fichier, format), ou (None, message d'erreur)
+    """
+    if "file" in request.files:
+        upload = request.files["file"]
+        filename = upload.filename or ""
+        # Copie sur disque : Flask ferme les fichiers uploadés avant la fin du streaming
+        source = tempfile.TemporaryFile()
+        upload.save(source)
+        source.seek(0)
+    else:
+        try:
+            file_id = ObjectId(request.form.get("file_id", ""))
+        except InvalidId:
+            return None, "Aucun fichier à prédire."
+        if not project_store.find_by_file(user_id, file_id, ["_id"]):
+            return None, "Fichier introuvable."
+        source = fs.get(file_id)
+        if source.content_type == dataset_store.PARQUET_CONTENT_TYPE:
+            return source, "parquet"
+        filename = source.filename or ""
+    if filename.endswith(".parquet"):
+        return source, "parquet"
+    if filename.endswith(".csv"):
+        return source, "csv"
+    return None, "Format non supporté (CSV ou Parquet attendu)."
+
+
+@app.route("/predict/batch", methods=["POST"])
+def predict_batch():
+    """Prédit toutes les lignes d'un fichier CSV/Parquet et renvoie les prédictions en CSV, par blocs."""
+    if "user_id" not in session:
+        return jsonify({"success": False, "error": "Veuillez vous connecter."}), 401
+
+    # Limite propre à cette route : les fichiers à prédire dépassent MAX_CONTENT_LENGTH
+    request.max_content_length = app.config["PREDICT_BATCH_MAX_CONTENT_LENGTH"]
+    user_id = session["user_id"]
+    project_name = request.form.get("project_name") or session.get("project_name")
+    result = project_store.get(user_id, project_name, ["learning_type", "model_id", "train_parameters"])
+    if not result or not result.get("model_id"):
+        return jsonify({"success": False, "error": "Aucun modèle entraîné pour ce projet."}), 404
+
+    source, file_format = batch_input_file(user_id)
+    if source is None:
+        return jsonify({"success": False, "error": file_format}), 400
+
+    learning_type = result.get("learning_type", "supervised")
+    params = LazyArrays(fs, result["train_parameters"])
+    columns = expected_columns(params, learning_type)
+    try:
+        available = dataset_store.read_columns(source, file_format)
+        source.seek(0)
+    except Exception as e:
+        source.close()
+        return jsonify({"success": False, "error": f"Fichier illisible : {str(e)}"}), 400
+    missing = [column for column in columns if column not in available]
+    if missing:
+        source.close()
+        return jsonify({"success": False, "error": "Colonnes manquantes.", "missing_columns": missing}), 400
+
+    try:
+        model = model_registry.load(user_id, project_name, result["model_id"])
+    except Exception as e:
+        source.close()
+        return jsonify({"success": False, "error": str(e)}), 500
+    chunks = dataset_store.iter_chunks(source, file_format, columns, app.config["PREDICT_BATCH_ROWS"])
+    response = Response(
+        stream_predictions(model, chunks, learning_type, params),
+        mimetype="text/csv",
+        headers={"Content-Disposition": f"attachment; filename={project_name}_predictions.csv"},
+    )
+    response.call_on_close(source.close)
+    return response
+
+
 @app.route("/error", methods=["POST", "GET"])
 def error():
     return render_template("error.html")
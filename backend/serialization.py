@@ -0,0 +1,33 @@
+import pandas as pd
+import numpy as np
+
+
+def convert_to_serializable(obj):
+    if isinstance(obj, pd.DataFrame):
+        return obj.to_dict(orient="records")
+    elif isinstance(obj, np.ndarray):
+        return obj.tolist()
+    elif isinstance(obj, (np.integer, int)):
+        return int(obj)
+    elif isinstance(obj, (np.floating, float)):
+        return float(obj)
+    elif isinstance(obj, (np.bool_, bool)):
+        return bool(obj)
+    elif isinstance(obj, list):
+        return [convert_to_serializable(x) for x in obj]
+    elif isinstance(obj, dict):
+        return {k: convert_to_serializable(v) for k, v in obj.items()}
+    else:
+        return str(obj)  # Dernier recours pour éviter les erreurs
+
+
+def to_native(val):
+    """Convertit les types NumPy vers des types natifs Python."""
+    if isinstance(val, (np.integer, np.int64, np.int32)):
+        return int(val)
+    elif isinstance(val, (np.floating, np.float64, np.float32)):
+        return float(val)
+    elif isinstance(val, np.ndarray):
+        return val.tolist()
+    else:
+        return val
@@ -1,6 +1,6 @@
 import pandas as pd
 import numpy as np
-from sklearn.linear_model import LogisticRegression, LinearRegression, Ridge, Lasso, ElasticNet
+from sklearn.linear_model import LogisticRegression, LinearRegression, Ridge, Lasso, ElasticNet, SGDClassifier, SGDRegressor
 from sklearn.svm import SVC, SVR
 from sklearn.tree import DecisionTreeRegressor, DecisionTreeClassifier
 from sklearn.ensemble import GradientBoostingRegressor, RandomForestRegressor, RandomForestClassifier, GradientBoostingClassifier, AdaBoostClassifier, AdaBoostRegressor, BaggingClassifier, BaggingRegressor, RandomTreesEmbedding
@@ -12,10 +12,12 @@ from sklearn.model_selection import train_test_split
 from sklearn.metrics import accuracy_score, precision_score, recall_score, f1_score, mean_absolute_error, mean_squared_error
 import os
 import json
-from sklearn.preprocessing import StandardScaler, MinMaxScaler
-from sklearn.impute import SimpleImputer
-from sklearn.feature_selection import SelectKBest, f_classif, f_regression
+from sklearn.pipeline import Pipeline
+from sklearn.base import is_classifier
 from imblearn.over_sampling import SMOTE
+from model_preprocessing import fit_preprocessor
+from incremental import RowReservoir, split_chunks
+from hyperparameter_search import parse_search_options, run_search
 ALGORITHMS = {
     'Logistic Regression': LogisticRegression,
     'SVC': SVC,
@@ -28,12 +30,14 @@ ALGORITHMS = {
     'AdaBoost Classifier': AdaBoostClassifier,
     'Bagging Classifier': BaggingClassifier,
     'Gaussian NB': GaussianNB,
+    'SGD Classifier': SGDClassifier,
     'Linear Regression': LinearRegression,
     'SVR': SVR,
     'Decision Tree Regressor': DecisionTreeRegressor,
     'Ridge': Ridge,
     'Lasso': Lasso,
     'Elastic Net': ElasticNet,
+    'SGD Regressor': SGDRegressor,
     'Random Forest Regressor': RandomForestRegressor,
     'Gradient Boosting Regressor': GradientBoostingRegressor,
     'AdaBoost Regressor': AdaBoostRegressor,
@@ -43,6 +47,27 @@ ALGORITHMS = {
     'MLP Regressor': MLPRegressor
 }
 
+# Algorithmes candidats par type de modèle (Random Trees Embedding n'est pas un prédicteur)
+CLASSIFICATION_ALGORITHMS = [
+    'Logistic Regression', 'SVC', 'Decision Tree Classifier', 'Random Forest Classifier',
+    'Gradient Boosting Classifier', 'KNeighbors Classifier', 'Quadratic Discriminant Analysis',
+    'Linear Discriminant Analysis', 'AdaBoost Classifier', 'Bagging Classifier', 'Gaussian NB',
+    'SGD Classifier', 'MLP Classifier',
+]
+REGRESSION_ALGORITHMS = [
+    'Linear Regression', 'SVR', 'Decision Tree Regressor', 'Ridge', 'Lasso', 'Elastic Net',
+    'SGD Regressor', 'Random Forest Regressor', 'Gradient Boosting Regressor', 'AdaBoost Regressor',
+    'Bagging Regressor', 'MLP Regressor',
+]
+
+def candidate_algorithms(model_type):
+    """Retourne les algorithmes compatibles avec un type de modèle (classification ou regression)."""
+    if model_type == 'classification':
+        return list(CLASSIFICATION_ALGORITHMS)
+    if model_type == 'regression':
+        return list(REGRESSION_ALGORITHMS)
+    raise ValueError(f"Type de modèle {model_type} non valide")
+
 def convert_algorithm_parameters(algorithm_parameters):
     processed_parameters = {}
 
@@ -91,85 +116,15 @@ def preprocess_data(X, y=None, enable_preprocessing=False, preprocessing_options
     Returns:
         X_processed: Les features prétraitées
         y_processed: La variable cible prétraitée (si fournie)
+        preprocessor: Le Pipeline de prétraitement ajusté, à rejouer à la prédiction (ou None)
     """
     if not enable_preprocessing or not preprocessing_options:
-        return X, y
+        return X, y, None
     
-    X_processed = X.copy()
     y_processed = y.copy() if y is not None else None
     
-    # Récupérer les colonnes numériques et catégorielles
-    numeric_cols = X_processed.select_dtypes(include=['number']).columns.tolist()
-    categorical_cols = X_processed.select_dtypes(exclude=['number']).columns.tolist()
-    
-    # Gestion des valeurs manquantes
-    if 'missing_values' in preprocessing_options:
-        # Imputation des valeurs numériques manquantes par la médiane
-        if numeric_cols:
-            num_imputer = SimpleImputer(strategy='median')
-            X_processed[numeric_cols] = num_imputer.fit_transform(X_processed[numeric_cols])
-        
-        # Imputation des valeurs catégorielles manquantes par le mode
-        if categorical_cols:
-            cat_imputer = SimpleImputer(strategy='most_frequent')
-            X_processed[categorical_cols] = cat_imputer.fit_transform(X_processed[categorical_cols])
-    
-    # Encodage des variables catégorielles
-    if 'encode_categorical' in preprocessing_options and categorical_cols:
-        # Utiliser OneHotEncoder pour les variables catégorielles
-        for col in categorical_cols:
-            # Créer des variables dummy et les ajouter au DataFrame
-            dummies = pd.get_dummies(X_processed[col], prefix=col, drop_first=True)
-            X_processed = pd.concat([X_processed, dummies], axis=1)
-        
-        # Supprimer les colonnes catégorielles originales
-        X_processed = X_processed.drop(categorical_cols, axis=1)
-    
-    # Normalisation (Min-Max Scaling)
-    if 'normalize' in preprocessing_options:
-        scaler = MinMaxScaler()
-        X_processed = pd.DataFrame(scaler.fit_transform(X_processed), 
-                                 columns=X_processed.columns, 
-                                 index=X_processed.index)
-    
-    # Standardisation (Z-score)
-    if 'standardize' in preprocessing_options:
-        scaler = StandardScaler()
-        X_processed = pd.DataFrame(scaler.fit_transform(X_processed), 
-                                 columns=X_processed.columns, 
-                                 index=X_processed.index)
-    
-    # Détection et traitement des outliers
-    if 'outliers' in preprocessing_options:
-        # Utiliser la méthode IQR pour détecter et remplacer les outliers
-        for col in X_processed.select_dtypes(include=['number']).columns:
-            Q1 = X_processed[col].quantile(0.25)
-            Q3 = X_processed[col].quantile(0.75)
-            IQR = Q3 - Q1
-            lower_bound = Q1 - 1.5 * IQR
-            upper_bound = Q3 + 1.5 * IQR
-            
-            # Remplacer les outliers par les bornes
-            X_processed[col] = np.where(X_processed[col] < lower_bound, lower_bound, X_processed[col])
-            X_processed[col] = np.where(X_processed[col] > upper_bound, upper_bound, X_processed[col])
-    
-    # Sélection de caractéristiques
-    if 'feature_selection' in preprocessing_options and y is not None and len(X_processed.columns) > 5:
-        # Utiliser SelectKBest pour sélectionner les meilleures caractéristiques
-        k = min(10, len(X_processed.columns))  # Sélectionner au maximum 10 caractéristiques
-        
-        # Choisir la fonction de score appropriée selon le type de y
-        if np.issubdtype(y.dtype, np.number):
-            selector = SelectKBest(f_regression, k=k)
-        else:
-            selector = SelectKBest(f_classif, k=k)
-        
-        # Appliquer la sélection
-        X_selected = selector.fit_transform(X_processed, y)
-        
-        # Récupérer les noms des colonnes sélectionnées
-        selected_cols = X_processed.columns[selector.get_support()]
-        X_processed = pd.DataFrame(X_selected, columns=selected_cols, index=X_processed.index)
+    # Imputation, encodage, mise à l'échelle, outliers et sélection de caractéristiques
+    preprocessor, X_processed = fit_preprocessor(X, y, preprocessing_options)
     
     # Équilibrage des données (uniquement pour les problèmes de classification)
     if 'data_balancing' in preprocessing_options and y is not None:
@@ -185,18 +140,48 @@ def preprocess_data(X, y=None, enable_preprocessing=False, preprocessing_options
                 # Si SMOTE échoue (par exemple, si une classe a trop peu d'échantillons)
                 print(f"Erreur lors de l'application de SMOTE: {str(e)}")
     
-    return X_processed, y_processed
+    return X_processed, y_processed, preprocessor
 
-def model_train(file, model_name, selected_features=None, target_feature=None, algorithm_parameters=None, enable_preprocessing=False, preprocessing_options=None):
+def build_model(model_name, algorithm_parameters=None):
+    """Instancie l'estimateur d'un algorithme avec les paramètres saisis par l'utilisateur."""
+    model_class = ALGORITHMS[model_name]
+    # Convertir les paramètres booléens de chaînes en valeurs booléennes Python
+    # et les paramètres numériques de chaînes en entiers ou flottants
+    if algorithm_parameters:
+        return model_class(**convert_algorithm_parameters(algorithm_parameters))
+    return model_class()
+
+def supports_partial_fit(model_name, algorithm_parameters=None):
+    """Indique si l'algorithme peut être entraîné par blocs (partial_fit)."""
+    if model_name not in ALGORITHMS:
+        return False
+    # MLP : partial_fit n'existe qu'avec les solveurs sgd et adam
+    return hasattr(build_model(model_name, algorithm_parameters), 'partial_fit')
+
+def model_train(file, model_name, selected_features=None, target_feature=None, algorithm_parameters=None, enable_preprocessing=False, preprocessing_options=None, hyperparameter_search=None):
+    """
+    Entraîne un modèle supervisé sur 80% des données et garde 20% pour le test.
+
+    Si hyperparameter_search est fourni ({"strategy": "random" | "halving",
+    "n_iter", "cv"}), les hyperparamètres non saisis par l'utilisateur sont
+    recherchés par validation croisée sur l'ensemble d'entraînement, et le
+    meilleur modèle est retourné ; params["search"] contient l'historique
+    des essais.
+    """
+    search_options = parse_search_options(hyperparameter_search)
     if model_name not in ALGORITHMS:
         raise ValueError(f"Modèle {model_name} non valide")
     if not target_feature:
         raise ValueError("La colonne cible (target_feature) doit être spécifiée")
 
-    try:
-        data = pd.read_csv(file)
-    except Exception as e:
-        raise ValueError(f"Erreur lors de la lecture du fichier CSV : {str(e)}")
+    # Un DataFrame déjà chargé (cache des datasets) est utilisé tel quel
+    if isinstance(file, pd.DataFrame):
+        data = file
+    else:
+        try:
+            data = pd.read_csv(file)
+        except Exception as e:
+            raise ValueError(f"Erreur lors de la lecture du fichier CSV : {str(e)}")
 
     if target_feature not in data.columns:
         raise ValueError(f"La colonne cible {target_feature} n'existe pas dans le dataset")
@@ -210,14 +195,7 @@ def model_train(file, model_name, selected_features=None, target_feature=None, a
     # Configuration des paramètres selon le type d'algorithme
     
     # Initialisation du modèle avec les paramètres
-    model_class = ALGORITHMS[model_name]
-    # Convertir les paramètres booléens de chaînes en valeurs booléennes Python
-    # et les paramètres numériques de chaînes en entiers ou flottants
-    if algorithm_parameters:
-        processed_parameters = convert_algorithm_parameters(algorithm_parameters)
-        md = model_class(**processed_parameters)
-    else:
-        md = model_class()
+    md = build_model(model_name, algorithm_parameters)
     
     # Préparation des données
     if selected_features:
@@ -230,11 +208,20 @@ def model_train(file, model_name, selected_features=None, target_feature=None, a
     y = data[target_feature]
     
     # Appliquer le prétraitement des données si activé
-    X_processed, y_processed = preprocess_data(X, y, enable_preprocessing, preprocessing_options)
+    X_processed, y_processed, preprocessor = preprocess_data(X, y, enable_preprocessing, preprocessing_options)
     
     # Division des données en ensembles d'entraînement et de test
     X_train, X_test, y_train, y_test = train_test_split(X_processed, y_processed if y_processed is not None else y, test_size=0.2, random_state=42)
-    md.fit(X_train, y_train)
+    search_summary = None
+    if search_options:
+        md, search_summary = run_search(
+            md, model_name, X_train, y_train, search_options,
+            fixed_parameters=convert_algorithm_parameters(algorithm_parameters),
+        )
+    else:
+        md.fit(X_train, y_train)
+    # Le prétraitement ajusté est sérialisé avec l'estimateur et rejoué à la prédiction
+    model = Pipeline([('preprocessor', preprocessor), ('model', md)]) if preprocessor is not None else md
     
     # Convertir les DataFrames en listes pour la sérialisation JSON
     # Retourne l'objet tel quel si ce n'est ni DataFrame, Series, list ou array
@@ -249,7 +236,7 @@ def model_train(file, model_name, selected_features=None, target_feature=None, a
         model_params = md.get_params()
         # Save model parameters to JSON file
     except:
-        model_params = processed_parameters
+        model_params = convert_algorithm_parameters(algorithm_parameters)
     params = {
         'X_train': X_train,
         'y_train': y_train,
@@ -257,17 +244,95 @@ def model_train(file, model_name, selected_features=None, target_feature=None, a
         'y_test': y_test,
         'X_train_columns': X_train_columns,
         'X_test_columns': X_test_columns,
+        'input_columns': X.columns.tolist(),  # Colonnes brutes attendues à la prédiction
          # Don't store the model object in the params dictionary
         'model_params': model_params,  # Store model parameters instead
+        'search': search_summary,
         'algo': model_name
     }
 
-    return md,params
+    return model,params
+
+def model_train_streaming(read_chunks, model_name, selected_features, target_feature, algorithm_parameters=None, enable_preprocessing=False, preprocessing_options=None):
+    """
+    Entraîne un modèle par blocs avec partial_fit, sans charger le dataset en mémoire.
+
+    Deux lectures du dataset : la première collecte les classes de la cible et
+    un échantillon sur lequel le prétraitement est ajusté, la seconde entraîne
+    le modèle bloc par bloc. 20% des lignes sont réservées au test ; les
+    ensembles d'entraînement et de test conservés pour l'évaluation sont des
+    échantillons de taille bornée. L'équilibrage SMOTE n'est pas appliqué.
+
+    Args:
+        read_chunks: Fonction sans argument retournant un itérateur de DataFrames
+            (colonnes selected_features + target_feature)
+        model_name: Le nom de l'algorithme (doit supporter partial_fit)
+        selected_features: Les colonnes utilisées comme features
+        target_feature: La colonne cible
+
+    Returns:
+        tuple: (modèle, params) au même format que model_train
+    """
+    if not target_feature:
+        raise ValueError("La colonne cible (target_feature) doit être spécifiée")
+    if not supports_partial_fit(model_name, algorithm_parameters):
+        raise ValueError(f"Le modèle {model_name} ne supporte pas l'entraînement par blocs")
+    md = build_model(model_name, algorithm_parameters)
+    classifier = is_classifier(md)
+
+    # Première lecture : classes de la cible et échantillon pour le prétraitement
+    sample = RowReservoir()
+    classes = set()
+    for chunk in read_chunks():
+        sample.add(chunk)
+        if classifier:
+            classes.update(chunk[target_feature].dropna().unique().tolist())
+    if sample.rows_seen == 0:
+        raise ValueError("Le dataset est vide.")
+    preprocessor = None
+    if enable_preprocessing and preprocessing_options:
+        preprocessor, _ = fit_preprocessor(
+            sample.frame[selected_features], sample.frame[target_feature], preprocessing_options
+        )
+
+    def transform(X):
+        return preprocessor.transform(X) if preprocessor is not None else X
+
+    # Seconde lecture : entraînement incrémental
+    fit_kwargs = {'classes': np.array(sorted(classes))} if classifier else {}
+    train_sample = RowReservoir(seed=0)
+    test_sample = RowReservoir(seed=1)
+    for train_chunk, test_chunk in split_chunks(read_chunks()):
+        test_sample.add(test_chunk)
+        if len(train_chunk) == 0:
+            continue
+        train_sample.add(train_chunk)
+        md.partial_fit(transform(train_chunk[selected_features]), train_chunk[target_feature], **fit_kwargs)
+
+    model = Pipeline([('preprocessor', preprocessor), ('model', md)]) if preprocessor is not None else md
+    X_train = transform(train_sample.frame[selected_features])
+    X_test = transform(test_sample.frame[selected_features])
+    params = {
+        'X_train': X_train,
+        'y_train': train_sample.frame[target_feature],
+        'X_test': X_test,
+        'y_test': test_sample.frame[target_feature],
+        'X_train_columns': X_train.columns.tolist(),
+        'X_test_columns': X_test.columns.tolist(),
+        'input_columns': list(selected_features),
+        'model_params': md.get_params(),
+        'algo': model_name,
+    }
+    return model, params
+
+def final_estimator(model):
+    """Retourne l'estimateur d'un modèle, sans son Pipeline de prétraitement."""
+    return model.steps[-1][1] if isinstance(model, Pipeline) else model
 
 def model_evaluate(params, model):
-    # Liste des algorithmes de régression
-    regression_algorithms = ['Linear Regression', 'SVR', 'Decision Tree Regressor', 'Ridge', 'Lasso', 'Elastic Net', 'Random Forest Regressor', 'Gradient Boosting Regressor', 'AdaBoost Regressor', 'Bagging Regressor']
-    
+    # X_train et X_test sont déjà prétraités : évaluer l'estimateur seul
+    model = final_estimator(model)
+
     # Reconvertir les données sérialisées en format approprié pour l'évaluation
     X_test = params['X_test']
     y_test = params['y_test']
@@ -291,7 +356,7 @@ def model_evaluate(params, model):
     
     # Load the model from disk if available, otherwise use the model in params
     
-    if params['algo'] in regression_algorithms:
+    if params['algo'] in REGRESSION_ALGORITHMS:
         # Regression metrics
         y_pred = model.predict(X_test)
         metrics = {
@@ -308,4 +373,7 @@ def model_evaluate(params, model):
             'recall': float(recall_score(y_test, y_pred, average='weighted')),  # Convertir en float pour JSON
             'f1_score': float(f1_score(y_test, y_pred, average='weighted'))  # Convertir en float pour JSON
         }
+    # Moyenne et écart-type de chaque métrique sur les k folds (si la validation croisée est activée)
+    if params.get('cross_validation'):
+        metrics['cross_validation'] = params['cross_validation']
     return metrics
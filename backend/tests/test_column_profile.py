@@ -0,0 +1,43 @@
+import numpy as np
+import pandas as pd
+from column_profile import HLL_PRECISION, QUANTILE_SKETCH_SIZE, HyperLogLog, QuantileSketch, hash_values
+
+
+def test_quantile_sketch_rank_error():
+    rng = np.random.default_rng(0)
+    values = rng.lognormal(size=200_000)
+    sketch = QuantileSketch()
+    # Blocs de tailles inégales, comme les blocs lus pendant le profilage
+    for chunk in np.array_split(values, 37):
+        sketch.update(chunk)
+
+    ordered = np.sort(values)
+    for q in [0.01, 0.25, 0.5, 0.75, 0.99]:
+        rank = np.searchsorted(ordered, sketch.quantile(q)) / len(values)
+        assert abs(rank - q) <= 2 / QUANTILE_SKETCH_SIZE
+    # Mémoire de l'ordre de k * log2(n / k) valeurs, pas de n
+    assert sum(len(level) for level in sketch.levels) < QUANTILE_SKETCH_SIZE * np.log2(len(values) / QUANTILE_SKETCH_SIZE)
+
+
+def test_quantile_sketch_empty():
+    assert QuantileSketch().quantile(0.5) is None
+
+
+def test_hyperloglog_estimate():
+    rng = np.random.default_rng(0)
+    values = pd.Series(rng.integers(0, 10 ** 12, 300_000))
+    hll = HyperLogLog()
+    # Les mêmes valeurs vues dans plusieurs blocs ne comptent qu'une fois
+    for start in range(0, len(values), 23_077):
+        hll.update(hash_values(values.iloc[start:start + 23_077]))
+    hll.update(hash_values(values.iloc[:1000]))
+
+    # Erreur standard 1.04 / sqrt(2 ** precision) (~0.8 %) : tolérance de trois écarts-types
+    standard_error = 1.04 / np.sqrt(2 ** HLL_PRECISION)
+    assert abs(hll.count() / values.nunique() - 1) <= 3 * standard_error
+
+
+def test_hyperloglog_small_cardinality():
+    hll = HyperLogLog()
+    hll.update(hash_values(pd.Series(["a", "b", "c", "a", None])))
+    assert hll.count() == 3
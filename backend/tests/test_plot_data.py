@@ -0,0 +1,24 @@
+import numpy as np
+import pytest
+from plot_data import lttb
+
+
+@pytest.mark.parametrize("n, budget", [(10_000, 500), (1001, 3), (257, 100), (50, 49)])
+def test_lttb_indices(n, budget):
+    rng = np.random.default_rng(0)
+    y = np.cumsum(rng.normal(size=n))
+    indices = lttb(y, budget)
+    assert len(indices) == budget
+    assert indices[0] == 0
+    assert indices[-1] == n - 1
+    assert (np.diff(indices) > 0).all()
+
+
+def test_lttb_keeps_peak():
+    y = np.zeros(10_000)
+    y[4321] = 100.0
+    assert 4321 in lttb(y, 50)
+
+
+def test_lttb_short_series_unchanged():
+    np.testing.assert_array_equal(lttb(np.arange(10.0), 20), np.arange(10))
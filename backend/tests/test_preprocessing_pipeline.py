@@ -0,0 +1,69 @@
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.impute import SimpleImputer
+from sklearn.preprocessing import MinMaxScaler, StandardScaler
+import preprocessing_pipeline
+
+
+@pytest.fixture
+def df():
+    rng = np.random.default_rng(0)
+    n = 500
+    df = pd.DataFrame({
+        "a": rng.normal(3, 2, n),
+        "b": rng.exponential(2, n),
+        "c": rng.integers(-2, 5, n).astype(float),
+        "s": rng.choice(["x", "y"], n),
+    })
+    df.loc[::7, "a"] = np.nan
+    df.loc[::11, "c"] = np.nan
+    return df
+
+
+def apply_one_by_one(df):
+    """Les mêmes étapes que le plan de test_fused_steps_match_one_by_one, appliquées une à une."""
+    df = df.copy()
+    df[["a", "b"]] = MinMaxScaler().fit_transform(df[["a", "b"]])
+    df[["b", "c"]] = StandardScaler().fit_transform(df[["b", "c"]])
+    # Imputation après la mise à l'échelle : moyenne des valeurs déjà transformées
+    df[["a", "c"]] = SimpleImputer(strategy="mean").fit_transform(df[["a", "c"]])
+    for column in ["a", "c"]:
+        low = df[column].min()
+        if low <= 0:
+            df[column] = df[column] - low + 1
+        df[column] = np.log(df[column])
+    return df
+
+
+def test_fused_steps_match_one_by_one(df):
+    plan = preprocessing_pipeline.compile_plan({
+        "preprocessing_methods": ["normalization", "standardization", "missing_values", "transformation"],
+        "normalization_method": "minmax",
+        "normalization_columns": ["a", "b"],
+        "standardization_columns": ["b", "c"],
+        "missing_values_strategy": "mean",
+        "missing_values_columns": ["a", "c"],
+        "transformation_method": "log",
+        "transformation_columns": ["a", "c"],
+    })
+    pipeline = preprocessing_pipeline.build_pipeline(plan)
+    # Étapes colonne par colonne consécutives : un seul ColumnOps
+    assert len(pipeline.steps) == 1
+
+    original = df.copy()
+    result = pipeline.fit_transform(df)
+    expected = apply_one_by_one(df)
+    pd.testing.assert_frame_equal(result, expected, check_dtype=False, atol=1e-9)
+    assert not result[["a", "c"]].isna().any().any()
+    # Le DataFrame d'entrée n'est pas modifié, et le pipeline ajusté rejoue les mêmes paramètres
+    pd.testing.assert_frame_equal(df, original)
+    pd.testing.assert_frame_equal(pipeline.transform(df), result, check_dtype=False)
+
+
+def test_unknown_feature_selection_method_is_rejected():
+    with pytest.raises(ValueError):
+        preprocessing_pipeline.compile_plan({
+            "preprocessing_methods": ["feature_selection"],
+            "feature_selection_method": "lasso",
+        })
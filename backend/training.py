@@ -0,0 +1,276 @@
+import os
+import pandas as pd
+import numpy as np
+import supervised_models, unsupervised_models
+from artifacts import save_arrays, delete_arrays
+from model_artifacts import save_model
+from serialization import convert_to_serializable, to_native
+import dataset_store
+from cross_validation import FoldCache, cross_validate_model, parse_cv_options
+from projection import ProjectionCache
+
+# Au-delà de cette taille, les algorithmes qui supportent partial_fit sont entraînés par blocs
+STREAMING_MIN_BYTES = int(os.environ.get("STREAMING_TRAINING_MIN_BYTES", 256 * 1024 * 1024))
+# Nombre de lignes lues par bloc lors d'un entraînement par blocs
+STREAMING_CHUNK_ROWS = int(os.environ.get("STREAMING_TRAINING_CHUNK_ROWS", 100000))
+
+
+# Champs du document projet lus par l'entraînement
+TRAINING_FIELDS = [
+    "user_id",
+    "project_name",
+    "filename",
+    "learning_type",
+    "model_type",
+    "algo",
+    "selected_features",
+    "target_feature",
+    "algorithm_parameters",
+    "enable_preprocessing",
+    "preprocessing_options",
+    "hyperparameter_search",
+    "cross_validation",
+    "dataset_file_id",
+    "parquet_file_id",
+    "model_id",
+    "train_parameters.arrays",
+]
+
+
+def training_columns(project):
+    """Colonnes du dataset utilisées par l'entraînement (None pour toutes)."""
+    selected_features = project.get("selected_features")
+    if not selected_features:
+        return None
+    columns = list(selected_features)
+    target_feature = project.get("target_feature")
+    if project.get("learning_type") == "supervised" and target_feature and target_feature not in columns:
+        columns.append(target_feature)
+    return columns
+
+
+def streaming_source(project):
+    """Fichier GridFS lisible par blocs pour un projet : (file_id, format), ou None."""
+    if project.get("parquet_file_id") is not None:
+        return project["parquet_file_id"], "parquet"
+    if project.get("filename", "").endswith(".csv"):
+        return project["dataset_file_id"], "csv"
+    return None
+
+
+def use_streaming(fs, project):
+    """Indique si le projet doit être entraîné par blocs, sans charger le dataset en mémoire."""
+    source = streaming_source(project)
+    # La recherche d'hyperparamètres et la validation croisée ont besoin du dataset en mémoire
+    if source is None or not project.get("selected_features"):
+        return False
+    if project.get("hyperparameter_search") or project.get("cross_validation"):
+        return False
+    models = supervised_models if project["learning_type"] == "supervised" else unsupervised_models
+    if not models.supports_partial_fit(project["algo"], project.get("algorithm_parameters")):
+        return False
+    return fs.get(source[0]).length >= STREAMING_MIN_BYTES
+
+
+def chunk_reader(fs, project):
+    """Fonction retournant à chaque appel un nouvel itérateur sur les blocs du dataset du projet."""
+    file_id, file_format = streaming_source(project)
+    columns = training_columns(project)
+
+    def read_chunks():
+        return dataset_store.iter_chunks(fs.get(file_id), file_format, columns, STREAMING_CHUNK_ROWS)
+    return read_chunks
+
+
+def cross_validate_project(projects_collection, fs, project, data, model, cv_options):
+    """Évalue le modèle d'un projet supervisé par validation croisée, avec les folds en cache du dataset."""
+    target_feature = project["target_feature"]
+    X = data[project["selected_features"]] if project.get("selected_features") else data.drop(columns=[target_feature])
+    y = data[target_feature]
+    classification = project["algo"] not in supervised_models.REGRESSION_ALGORITHMS
+    fold_cache = FoldCache(projects_collection.database["folds"], fs)
+    assignments = fold_cache.get(
+        project["dataset_file_id"], target_feature, y, cv_options["folds"], classification
+    )
+    return cross_validate_model(model, X, y, assignments, classification)
+
+
+def train_project(projects_collection, fs, project, data, progress=None):
+    """
+    Entraîne le modèle d'un projet et enregistre le modèle et ses matrices.
+
+    Args:
+        projects_collection: La collection MongoDB des projets
+        fs: L'instance GridFS
+        project: Le document du projet (algo, features, paramètres...)
+        data: Le DataFrame du dataset, projeté sur training_columns(project),
+            ou None pour un entraînement par blocs (voir use_streaming)
+        progress: Fonction optionnelle progress(stage, percent) appelée entre les étapes
+
+    Returns:
+        dict: Les informations du modèle entraîné (model_info)
+    """
+    if progress is None:
+        progress = lambda stage, percent: None
+
+    user_id = project["user_id"]
+    project_name = project["project_name"]
+    learning_type = project["learning_type"]
+    algo = project["algo"]
+    selected_features = project["selected_features"]
+    algorithm_parameters = project["algorithm_parameters"]
+    enable_preprocessing = project["enable_preprocessing"]
+    preprocessing_options = project["preprocessing_options"]
+    projections = ProjectionCache(projects_collection.database["projections"], fs)
+    # Matrices et modèle en cours d'utilisation, supprimés seulement après l'enregistrement des nouveaux
+    previous_parameters = project.get("train_parameters")
+    previous_model_id = project.get("model_id")
+
+    if learning_type == "supervised":
+        target_feature = project.get("target_feature")
+        if not target_feature:
+            raise ValueError("Target feature not selected.")
+        progress("fitting", 10)
+        if data is None:
+            model, params = supervised_models.model_train_streaming(
+                chunk_reader(fs, project),
+                algo,
+                selected_features,
+                target_feature,
+                algorithm_parameters=algorithm_parameters,
+                enable_preprocessing=enable_preprocessing,
+                preprocessing_options=preprocessing_options,
+            )
+        else:
+            model, params = supervised_models.model_train(
+                data,
+                algo,
+                selected_features,
+                target_feature=target_feature,
+                algorithm_parameters=algorithm_parameters,
+                enable_preprocessing=enable_preprocessing,
+                preprocessing_options=preprocessing_options,
+                hyperparameter_search=project.get("hyperparameter_search"),
+            )
+        cv_options = parse_cv_options(project.get("cross_validation"))
+        cv_results = None
+        if cv_options and data is not None:
+            progress("cross_validating", 40)
+            cv_results = cross_validate_project(projects_collection, fs, project, data, model, cv_options)
+        progress("predicting", 70)
+        X_test = params.get("X_test")
+        if "X_train_columns" in params and params["X_train_columns"] is not None:
+            X_test = pd.DataFrame(X_test, columns=params["X_train_columns"])
+        # X_test est déjà prétraité : prédire avec l'estimateur seul
+        predictions_serialize = supervised_models.final_estimator(model).predict(X_test)
+        predictions = convert_to_serializable(predictions_serialize[:20])
+        values = params.get("y_test", [])[:20]
+        values = values.tolist() if isinstance(values, np.ndarray) else values
+        predictions_values = [(to_native(p), to_native(v)) for p, v in zip(predictions, values)]
+
+        progress("saving", 85)
+        model_id = save_model(fs, model, f"{project_name}_{algo}.joblib.gz")
+        if project["model_type"] != "regression":
+            # Projection 2D du graphique de résultats (/plot_results), calculée une fois par modèle
+            projections.put(model_id, X_test)
+        # Les matrices sont stockées dans GridFS, le document ne garde que leurs références
+        arrays = save_arrays(fs, {
+            "X_train": params["X_train"],
+            "y_train": params["y_train"],
+            "X_test": params["X_test"],
+            "y_test": params["y_test"],
+            "predictions": predictions_serialize,
+        }, prefix=f"{project_name}_{algo}")
+        params_to_save = {
+            "arrays": arrays,
+            "X_train_columns": params["X_train_columns"],
+            "X_test_columns": params["X_test_columns"],
+            "input_columns": params["input_columns"],
+            "model_params": params["model_params"],
+            "predictions_values": predictions_values,
+            "search": params.get("search"),
+            "cross_validation": cv_results,
+            "algo": algo,
+        }
+    else:
+        progress("fitting", 10)
+        if data is None:
+            model, params = unsupervised_models.model_train_streaming(
+                chunk_reader(fs, project),
+                algo,
+                selected_features,
+                algorithm_parameters=algorithm_parameters,
+                enable_preprocessing=enable_preprocessing,
+                preprocessing_options=preprocessing_options,
+            )
+        else:
+            model, params = unsupervised_models.model_train(
+                data,
+                algo,
+                selected_features,
+                algorithm_parameters=algorithm_parameters,
+                enable_preprocessing=enable_preprocessing,
+                preprocessing_options=preprocessing_options,
+            )
+        progress("predicting", 70)
+        labels = params.get("labels", [])
+        # Le modèle applique lui-même son prétraitement : prédire sur les données brutes
+        predictions = unsupervised_models.predict_cluster(
+            model, params["X"][:20], params=params
+        )
+        predictions = convert_to_serializable(predictions)
+        values = labels[:20]
+        values = values.tolist() if isinstance(values, np.ndarray) else values
+        predictions_values = [(to_native(p), to_native(v)) for p, v in zip(predictions, values)]
+
+        progress("saving", 85)
+        model_id = save_model(fs, model, f"{project_name}_{algo}.joblib.gz")
+        projections.put(model_id, params["X_scaled"])
+        arrays = save_arrays(fs, {
+            "X": params["X"],
+            "X_scaled": params["X_scaled"],
+            "labels": params["labels"],
+            "centroid_labels": params["centroid_labels"],
+            "centroids": params["centroids"],
+        }, prefix=f"{project_name}_{algo}")
+        params_to_save = {
+            "arrays": arrays,
+            "X_columns": params["X_columns"],
+            "model_params": params["model_params"],
+            "algo": algo,
+            "predictions_values": predictions_values,
+            "n_clusters": params["n_clusters"],
+        }
+
+    projects_collection.update_one(
+        {"user_id": user_id, "project_name": project_name},
+        {"$set": {
+            "train_parameters": params_to_save,
+            "model_id": model_id,
+        }}
+    )
+    # Anciennes matrices supprimées une fois le projet basculé sur les nouvelles :
+    # /evaluate, /plot_results ou /predict pendant un réentraînement lisent toujours des fichiers existants
+    delete_arrays(fs, previous_parameters)
+    projections.delete(previous_model_id)
+    progress("done", 100)
+
+    model_info = {
+        "filename": project["filename"],
+        "project_name": project_name,
+        "model_type": project["model_type"],
+        "algo": algo,
+        "learning_type": learning_type,
+        "features": selected_features,
+        "predictions_values": predictions_values,
+        "params_dict": algorithm_parameters,
+        "preprocessing_options": preprocessing_options,
+    }
+    search = params_to_save.get("search")
+    if search:
+        # model_info est gardé en session : l'historique complet reste dans train_parameters
+        model_info["hyperparameter_search"] = {
+            key: value for key, value in search.items() if key != "trials"
+        }
+        model_info["hyperparameter_search"]["n_trials"] = len(search["trials"])
+    return model_info
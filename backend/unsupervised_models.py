@@ -3,14 +3,19 @@ import numpy as np
 import os
 import json
 from sklearn.preprocessing import StandardScaler, MinMaxScaler, OneHotEncoder, LabelEncoder
-from sklearn.cluster import KMeans, DBSCAN, AgglomerativeClustering, Birch, SpectralClustering, OPTICS, HDBSCAN
+from sklearn.cluster import KMeans, MiniBatchKMeans, DBSCAN, AgglomerativeClustering, Birch, SpectralClustering, OPTICS, HDBSCAN
 from sklearn.mixture import GaussianMixture
 from sklearn.decomposition import PCA
 from sklearn import metrics
+from sklearn.metrics import pairwise_distances_argmin_min
+from sklearn.neighbors import BallTree, NearestNeighbors
 from sklearn.impute import SimpleImputer
 from sklearn.feature_selection import SelectKBest, f_classif, f_regression
+from model_preprocessing import fit_preprocessor
+from incremental import RowReservoir
 ALGORITHMS = {
     'KMeans': KMeans,
+    'MiniBatchKMeans': MiniBatchKMeans,
     'DBSCAN': DBSCAN,
     'HDBSCAN': HDBSCAN,  # Ajout de 'HDBSCAN'
     'OPTICS': OPTICS,
@@ -84,75 +89,31 @@ def preprocess_data(X, enable_preprocessing=False, preprocessing_options=None):
         
     Returns:
         X_processed: Les features prétraitées
+        preprocessor: Le Pipeline de prétraitement ajusté, à rejouer à la prédiction (ou None)
     """
     if not enable_preprocessing or not preprocessing_options:
-        return X
-    
-    X_processed = X.copy()
-    
-    # Récupérer les colonnes numériques et catégorielles
-    numeric_cols = X_processed.select_dtypes(include=['number']).columns.tolist()
-    categorical_cols = X_processed.select_dtypes(exclude=['number']).columns.tolist()
-    
-    # Gestion des valeurs manquantes
-    if 'missing_values' in preprocessing_options:
-        # Imputation des valeurs numériques manquantes par la médiane
-        if numeric_cols:
-            num_imputer = SimpleImputer(strategy='median')
-            X_processed[numeric_cols] = num_imputer.fit_transform(X_processed[numeric_cols])
-        
-        # Imputation des valeurs catégorielles manquantes par le mode
-        if categorical_cols:
-            cat_imputer = SimpleImputer(strategy='most_frequent')
-            X_processed[categorical_cols] = cat_imputer.fit_transform(X_processed[categorical_cols])
-    
-    # Encodage des variables catégorielles
-    if 'encode_categorical' in preprocessing_options and categorical_cols:
-        # Utiliser OneHotEncoder pour les variables catégorielles
-        for col in categorical_cols:
-            # Créer des variables dummy et les ajouter au DataFrame
-            dummies = pd.get_dummies(X_processed[col], prefix=col, drop_first=True)
-            X_processed = pd.concat([X_processed, dummies], axis=1)
-        
-        # Supprimer les colonnes catégorielles originales
-        X_processed = X_processed.drop(categorical_cols, axis=1)
-    
-    # Normalisation (Min-Max Scaling)
-    if 'normalize' in preprocessing_options:
-        scaler = MinMaxScaler()
-        X_processed = pd.DataFrame(scaler.fit_transform(X_processed), 
-                                 columns=X_processed.columns, 
-                                 index=X_processed.index)
-    
-    # Standardisation (Z-score)
-    if 'standardize' in preprocessing_options:
-        scaler = StandardScaler()
-        X_processed = pd.DataFrame(scaler.fit_transform(X_processed), 
-                                 columns=X_processed.columns, 
-                                 index=X_processed.index)
-    
-    # Détection et traitement des outliers
-    if 'outliers' in preprocessing_options:
-        # Utiliser la méthode IQR pour détecter et remplacer les outliers
-        for col in X_processed.select_dtypes(include=['number']).columns:
-            Q1 = X_processed[col].quantile(0.25)
-            Q3 = X_processed[col].quantile(0.75)
-            IQR = Q3 - Q1
-            lower_bound = Q1 - 1.5 * IQR
-            upper_bound = Q3 + 1.5 * IQR
-            
-            # Remplacer les outliers par les bornes
-            X_processed[col] = np.where(X_processed[col] < lower_bound, lower_bound, X_processed[col])
-            X_processed[col] = np.where(X_processed[col] > upper_bound, upper_bound, X_processed[col])
-    
-    return X_processed
+        return X, None
+
+    # Imputation, encodage, mise à l'échelle et outliers (pas de cible : pas de sélection)
+    preprocessor, X_processed = fit_preprocessor(X, None, preprocessing_options)
+    return X_processed, preprocessor
+
+def build_model(model_name, algorithm_parameters=None):
+    """Instancie l'algorithme de clustering avec les paramètres saisis par l'utilisateur."""
+    if algorithm_parameters:
+        return ALGORITHMS[model_name](**convert_algorithm_parameters(algorithm_parameters))
+    return ALGORITHMS[model_name]()
+
+def supports_partial_fit(model_name, algorithm_parameters=None):
+    """Indique si l'algorithme peut être entraîné par blocs (partial_fit)."""
+    return model_name in ALGORITHMS and hasattr(build_model(model_name, algorithm_parameters), 'partial_fit')
 
 def model_train(file, model_name, selected_features=None, algorithm_parameters=None, enable_preprocessing=False, preprocessing_options=None):
     """
     Entraîne un modèle de clustering sur les données.
     
     Args:
-        file: Le fichier CSV contenant les données
+        file: Le fichier CSV contenant les données, ou un DataFrame déjà chargé
         model_name: Le nom de l'algorithme à utiliser
         selected_features: Les colonnes à utiliser pour le clustering
         n_clusters: Le nombre de clusters (pour les algorithmes basés sur la partition)
@@ -166,10 +127,14 @@ def model_train(file, model_name, selected_features=None, algorithm_parameters=N
     if model_name not in ALGORITHMS:
         raise ValueError(f"Modèle {model_name} non valide")
 
-    try:
-        data = pd.read_csv(file)
-    except Exception as e:
-        raise ValueError(f"Erreur lors de la lecture du fichier CSV : {str(e)}")
+    # Un DataFrame déjà chargé (cache des datasets) est utilisé tel quel
+    if isinstance(file, pd.DataFrame):
+        data = file
+    else:
+        try:
+            data = pd.read_csv(file)
+        except Exception as e:
+            raise ValueError(f"Erreur lors de la lecture du fichier CSV : {str(e)}")
 
     # Sélection des features
     if selected_features:
@@ -181,7 +146,7 @@ def model_train(file, model_name, selected_features=None, algorithm_parameters=N
         X = data
     
     # Prétraitement des données selon les options sélectionnées
-    X_processed = preprocess_data(X, enable_preprocessing, preprocessing_options)
+    X_processed, preprocessor = preprocess_data(X, enable_preprocessing, preprocessing_options)
     
     # Conversion en numpy array pour les algorithmes
     X_scaled = X_processed.values
@@ -191,11 +156,7 @@ def model_train(file, model_name, selected_features=None, algorithm_parameters=N
         algorithm_parameters = {}
     
     # Initialisation du modèle avec les paramètres appropriés
-    if algorithm_parameters:
-        processed_parameters = convert_algorithm_parameters(algorithm_parameters)
-        model = ALGORITHMS[model_name](**processed_parameters)
-    else:
-        model = ALGORITHMS[model_name]()
+    model = build_model(model_name, algorithm_parameters)
     
     # Entraînement du modèle
     model.fit(X_scaled)
@@ -224,36 +185,383 @@ def model_train(file, model_name, selected_features=None, algorithm_parameters=N
     try:
         model_params = model.get_params()
     except:
-        model_params = processed_parameters
+        model_params = convert_algorithm_parameters(algorithm_parameters)
         
+    # Centroïdes calculés une seule fois, utilisés pour affecter les nouveaux points
+    centroid_labels, centroids = cluster_centroids(X_scaled, labels)
+
+    # Stratégie d'affectation des nouveaux points, sérialisée avec le modèle
+    assigner = ASSIGNMENT_STRATEGIES[model_name](model, X_scaled, labels, centroid_labels, centroids)
+    model = ClusterModel(model, assigner, preprocessor)
+
     params = {
         'X': X,
         'X_columns': X_columns,
         'X_scaled': X_scaled,
         'model_params': model_params,  # Also store model parameters
         'labels': labels,
+        'centroid_labels': centroid_labels,
+        'centroids': centroids,
         'algo': model_name,
         'n_clusters': len(set(labels)) - (1 if -1 in labels else 0)  # Ajouter les paramètres d'algorithme au dictionnaire
     }
     return model,params
 
-def predict_cluster(model, X_new, X_scaled=None, labels=None):
+def model_train_streaming(read_chunks, model_name, selected_features, algorithm_parameters=None, enable_preprocessing=False, preprocessing_options=None):
+    """
+    Entraîne un modèle de clustering par blocs avec partial_fit (MiniBatchKMeans, BIRCH).
+
+    Le prétraitement est ajusté sur un échantillon lu lors d'une première
+    passe, puis le modèle est entraîné bloc par bloc lors d'une seconde.
+    Les données conservées pour l'évaluation et les graphiques (X, X_scaled,
+    labels) sont celles de l'échantillon, de taille bornée.
+
+    Args:
+        read_chunks: Fonction sans argument retournant un itérateur de DataFrames
+            (colonnes selected_features)
+        model_name: Le nom de l'algorithme (doit supporter partial_fit)
+        selected_features: Les colonnes utilisées pour le clustering
+
+    Returns:
+        tuple: (modèle, params) au même format que model_train
+    """
+    if not supports_partial_fit(model_name, algorithm_parameters):
+        raise ValueError(f"Le modèle {model_name} ne supporte pas l'entraînement par blocs")
+    model = build_model(model_name, algorithm_parameters)
+
+    # Première lecture : échantillon pour le prétraitement et l'évaluation
+    sample = RowReservoir()
+    for chunk in read_chunks():
+        sample.add(chunk[selected_features])
+    if sample.rows_seen == 0:
+        raise ValueError("Le dataset est vide.")
+    X = sample.frame
+    X_processed, preprocessor = preprocess_data(X, enable_preprocessing, preprocessing_options)
+
+    def transform(chunk):
+        return preprocessor.transform(chunk) if preprocessor is not None else chunk
+
+    # Seconde lecture : entraînement incrémental
+    min_rows = getattr(model, 'n_clusters', None) if isinstance(model, MiniBatchKMeans) else None
+    for chunk in read_chunks():
+        # MiniBatchKMeans refuse un bloc plus petit que n_clusters (dernier bloc du fichier)
+        if min_rows and len(chunk) < min_rows:
+            continue
+        model.partial_fit(transform(chunk[selected_features]).values)
+
+    X_scaled = X_processed.values
+    labels = model.predict(X_scaled)
+    centroid_labels, centroids = cluster_centroids(X_scaled, labels)
+    assigner = ASSIGNMENT_STRATEGIES[model_name](model, X_scaled, labels, centroid_labels, centroids)
+    params = {
+        'X': X,
+        'X_columns': list(selected_features),
+        'X_scaled': X_scaled,
+        'model_params': model.get_params(),
+        'labels': labels,
+        'centroid_labels': centroid_labels,
+        'centroids': centroids,
+        'algo': model_name,
+        'n_clusters': len(set(labels)) - (1 if -1 in labels else 0),
+    }
+    return ClusterModel(model, assigner, preprocessor), params
+
+
+# Nombre maximal de points d'entraînement copiés dans l'index du plus proche voisin (voir neighbor_assigner)
+NEIGHBOR_INDEX_MAX_ROWS = int(os.environ.get('NEIGHBOR_INDEX_MAX_ROWS', 50000))
+
+
+class ClusterModel:
+    """
+    Modèle de clustering entraîné et sa stratégie d'affectation des nouveaux points.
+
+    Args:
+        estimator: L'estimateur scikit-learn entraîné
+        assigner: Objet exposant predict(X_new), construit à l'entraînement
+            (None : estimator.predict est utilisé)
+        preprocessor: Le Pipeline de prétraitement ajusté sur les données brutes (ou None)
+    """
+
+    def __init__(self, estimator, assigner=None, preprocessor=None):
+        self.estimator = estimator
+        self.assigner = assigner
+        self.preprocessor = preprocessor
+
+    def transform(self, X_new):
+        """Applique aux données brutes le prétraitement appris à l'entraînement."""
+        # Anciens modèles sérialisés sans l'attribut preprocessor
+        preprocessor = getattr(self, 'preprocessor', None)
+        if preprocessor is None:
+            return X_new
+        if not isinstance(X_new, pd.DataFrame):
+            X_new = pd.DataFrame(X_new, columns=preprocessor.feature_names_in_)
+        return preprocessor.transform(X_new)
+
+
+class NearestCentroidAssigner:
+    """Affecte chaque nouveau point au cluster du centroïde le plus proche."""
+
+    def __init__(self, centroid_labels, centroids):
+        self.centroid_labels = np.asarray(centroid_labels)
+        self.centroids = np.asarray(centroids, dtype=float)
+
+    def predict(self, X_new):
+        return assign_nearest_centroid(X_new, self.centroid_labels, self.centroids)
+
+
+class NoiseAssigner:
+    """Affecte tout nouveau point au bruit (-1) : clustering par densité sans aucun cluster."""
+
+    def predict(self, X_new):
+        return np.full(len(X_new), -1)
+
+
+class CoreSampleIndex:
+    """
+    Index spatial des points cœurs d'un clustering par densité.
+
+    Un nouveau point prend le label du point cœur le plus proche s'il est
+    à une distance inférieure au rayon de ce point cœur, sinon il est
+    considéré comme du bruit (-1), comme un point frontière de DBSCAN.
+    Avec un rayon infini, c'est une affectation au plus proche voisin.
+    L'index est un BallTree ; pour les métriques que BallTree ne supporte
+    pas (ex. cosine), la recherche du plus proche voisin est exhaustive.
+
+    Args:
+        points: Les points cœurs
+        labels: Les labels des points cœurs
+        radius: Le rayon de voisinage (un scalaire ou un rayon par point cœur)
+        metric: La métrique de distance
+        **metric_kwargs: Paramètres de la métrique (ex. p pour minkowski)
+    """
+
+    def __init__(self, points, labels, radius, metric='euclidean', **metric_kwargs):
+        points = np.asarray(points, dtype=float)
+        if isinstance(metric, str) and metric in BallTree.valid_metrics:
+            self.tree = BallTree(points, metric=metric, **metric_kwargs)
+        else:
+            self.tree = NearestNeighbors(
+                n_neighbors=1, metric=metric, algorithm='brute', metric_params=metric_kwargs or None
+            ).fit(points)
+        self.labels = np.asarray(labels)
+        self.radius = np.broadcast_to(np.asarray(radius, dtype=float), self.labels.shape).copy()
+
+    def predict(self, X_new):
+        X_new = np.asarray(X_new, dtype=float)
+        if isinstance(self.tree, BallTree):
+            distances, indices = self.tree.query(X_new, k=1)
+        else:
+            distances, indices = self.tree.kneighbors(X_new, n_neighbors=1)
+        distances, indices = distances[:, 0], indices[:, 0]
+        labels = np.where(self.labels[indices] < 0, -1, self.labels[indices])
+        return np.where(distances <= self.radius[indices], labels, -1)
+
+
+def build_core_sample_index(model, X_scaled, labels):
+    """
+    Construit l'index des points cœurs de DBSCAN, OPTICS et HDBSCAN.
+
+    Args:
+        model: L'estimateur entraîné
+        X_scaled: Les données d'entraînement
+        labels: Les labels des données d'entraînement
+
+    Returns:
+        CoreSampleIndex: L'index, ou None pour les autres algorithmes (ou sans point cœur dans un cluster)
+    """
+    X_scaled = np.asarray(X_scaled, dtype=float)
+    labels = np.asarray(labels)
+    metric = getattr(model, 'metric', 'euclidean')
+    metric_kwargs = {'p': getattr(model, 'p', None) or 2} if metric == 'minkowski' else {}
+
+    if isinstance(model, DBSCAN):
+        core = np.zeros(len(labels), dtype=bool)
+        core[model.core_sample_indices_] = True
+        radius = model.eps
+    elif isinstance(model, OPTICS):
+        core_distances = model.core_distances_
+        if model.cluster_method == 'dbscan':
+            eps = model.eps if model.eps is not None else model.max_eps
+            core = (labels != -1) & (core_distances <= eps)
+            radius = eps
+        else:
+            # Extraction xi : pas de eps global, rayon = distance cœur de chaque point.
+            # Les points de bruit sont indexés aussi (label -1) : un point proche du bruit reste du bruit
+            core = np.isfinite(core_distances)
+            radius = core_distances[core]
+    elif isinstance(model, HDBSCAN):
+        # Distance cœur : distance au min_samples-ième voisin (le point lui-même inclus)
+        min_samples = model.min_samples or model.min_cluster_size
+        n_neighbors = min(min_samples, len(X_scaled))
+        neighbors = NearestNeighbors(n_neighbors=n_neighbors, metric=metric, metric_params=metric_kwargs or None).fit(X_scaled)
+        distances, _ = neighbors.kneighbors(X_scaled)
+        # Même principe que pour OPTICS xi ; les labels négatifs (bruit, valeurs infinies) donnent -1
+        core = np.ones(len(labels), dtype=bool)
+        radius = distances[:, -1]
+    else:
+        return None
+
+    if not (labels[core] >= 0).any():
+        return None
+    return CoreSampleIndex(X_scaled[core], labels[core], radius, metric=metric, **metric_kwargs)
+
+
+def nearest_neighbor_index(X_scaled, labels, metric='euclidean', max_rows=None, random_state=42):
+    """
+    Index des points d'entraînement : chaque nouveau point prend le label de son plus proche voisin.
+
+    Au-delà de max_rows points, l'index est construit sur un échantillon
+    tiré dans chaque cluster proportionnellement à son effectif (au moins
+    un point par cluster), pour borner la taille du modèle sérialisé.
+
+    Args:
+        X_scaled: Les données d'entraînement
+        labels: Les labels des données d'entraînement
+        metric: La métrique de distance du modèle
+        max_rows: Le nombre maximal de points indexés (None : tous)
+
+    Returns:
+        CoreSampleIndex: L'index
+    """
+    X_scaled = np.asarray(X_scaled, dtype=float)
+    labels = np.asarray(labels)
+    if max_rows is not None and len(labels) > max_rows:
+        rng = np.random.default_rng(random_state)
+        _, inverse, counts = np.unique(labels, return_inverse=True, return_counts=True)
+        quotas = np.maximum(max_rows * counts // len(labels), 1)
+        keep = np.sort(np.concatenate([
+            rng.choice(np.flatnonzero(inverse == label), size=quota, replace=False)
+            for label, quota in enumerate(quotas)
+        ]))
+        X_scaled, labels = X_scaled[keep], labels[keep]
+    return CoreSampleIndex(X_scaled, labels, np.inf, metric=metric)
+
+
+def native_predict(model, X_scaled, labels, centroid_labels, centroids):
+    # L'estimateur a sa propre méthode predict (sans réentraînement)
+    return None
+
+
+def neighbor_assigner(model, X_scaled, labels, centroid_labels, centroids):
+    # SpectralClustering n'a pas d'attribut metric (affinité) : distance euclidienne
+    metric = getattr(model, 'metric', None) or 'euclidean'
+    return nearest_neighbor_index(X_scaled, labels, metric=metric, max_rows=NEIGHBOR_INDEX_MAX_ROWS)
+
+
+def density_assigner(model, X_scaled, labels, centroid_labels, centroids):
+    # Sans point cœur dans un cluster, tout nouveau point est du bruit
+    return build_core_sample_index(model, X_scaled, labels) or NoiseAssigner()
+
+
+# Stratégie d'affectation hors échantillon de chaque algorithme, construite à l'entraînement.
+# Aucune ne réentraîne le modèle au moment de la prédiction.
+# Coût en taille du modèle sérialisé : density_assigner y copie les points cœurs (jusqu'à tout
+# le jeu d'entraînement), neighbor_assigner au plus NEIGHBOR_INDEX_MAX_ROWS points.
+ASSIGNMENT_STRATEGIES = {
+    'KMeans': native_predict,  # centre le plus proche
+    'MiniBatchKMeans': native_predict,
+    'DBSCAN': density_assigner,
+    'HDBSCAN': density_assigner,
+    'OPTICS': density_assigner,
+    # Clusters hiérarchiques, éventuellement non convexes : plus proche voisin
+    'Agglomerative': neighbor_assigner,
+    'BIRCH': native_predict,  # sous-cluster le plus proche
+    'GMM': native_predict,  # composante la plus probable
+    # Clusters définis sur le graphe de similarité : plus proche voisin
+    'Spectral Clustering': neighbor_assigner,
+}
+
+
+def cluster_centroids(X_scaled, labels):
+    """
+    Calcule le centroïde de chaque cluster (points de bruit exclus).
+
+    Args:
+        X_scaled: Les données d'entraînement
+        labels: Les labels des données d'entraînement
+
+    Returns:
+        tuple: (labels des clusters, matrice des centroïdes de forme (k, n_features))
+    """
+    X_scaled = np.asarray(X_scaled, dtype=float)
+    labels = np.asarray(labels)
+    mask = labels != -1
+    centroid_labels, inverse = np.unique(labels[mask], return_inverse=True)
+    # Sommes par cluster en une seule passe sur les données
+    sums = np.zeros((len(centroid_labels), X_scaled.shape[1]))
+    np.add.at(sums, inverse, X_scaled[mask])
+    counts = np.bincount(inverse, minlength=len(centroid_labels))
+    return centroid_labels, sums / counts[:, None]
+
+
+def assign_nearest_centroid(X_new, centroid_labels, centroids, metric='euclidean', max_distance=None):
+    """
+    Affecte chaque point au cluster du centroïde le plus proche.
+
+    Le calcul des distances est vectorisé et découpé en blocs par scikit-learn
+    (mémoire bornée par sklearn.get_config()['working_memory']).
+
+    Args:
+        X_new: Les points à affecter
+        centroid_labels: Les labels des clusters
+        centroids: Les centroïdes des clusters
+        metric: La métrique de distance
+        max_distance: Distance au-delà de laquelle le point est considéré comme du bruit (-1)
+
+    Returns:
+        array: Les labels affectés
+    """
+    centroid_labels = np.asarray(centroid_labels)
+    if len(centroid_labels) == 0:
+        return np.full(X_new.shape[0], -1)
+    indices, distances = pairwise_distances_argmin_min(
+        np.asarray(X_new, dtype=float), np.asarray(centroids, dtype=float), metric=metric
+    )
+    predictions = centroid_labels[indices]
+    if max_distance is not None:
+        predictions = np.where(distances <= max_distance, predictions, -1)
+    return predictions
+
+
+def prediction_inputs(params):
+    """Arguments de predict_cluster tirés des train_parameters d'un projet."""
+    if 'centroids' in params:
+        return {'centroid_labels': params['centroid_labels'], 'centroids': params['centroids']}
+    # Anciens projets : les centroïdes sont recalculés à partir des données d'entraînement
+    return {'X_scaled': params.get('X_scaled'), 'labels': params.get('labels')}
+
+
+def predict_cluster(model, X_new, X_scaled=None, labels=None, centroid_labels=None, centroids=None, params=None):
     """
     Prédit le cluster pour de nouvelles données, même pour les algorithmes qui n'ont pas de méthode predict().
     
     Args:
         model: Le modèle de clustering entraîné
-        X_new: Les nouvelles données à prédire
-        X_scaled: Les données d'entraînement (nécessaires pour certains algorithmes)
-        labels: Les labels des données d'entraînement (nécessaires pour certains algorithmes)
+        X_new: Les nouvelles données à prédire (brutes : le prétraitement du modèle est appliqué)
+        X_scaled: Les données d'entraînement (si les centroïdes n'ont pas été calculés)
+        labels: Les labels des données d'entraînement (si les centroïdes n'ont pas été calculés)
+        centroid_labels: Les labels des clusters, calculés à l'entraînement
+        centroids: Les centroïdes des clusters, calculés à l'entraînement
+        params: Les train_parameters du projet (LazyArrays), à la place des quatre arguments
+            précédents : ils ne sont lus dans GridFS que si le modèle ne sait pas prédire seul
         
     Returns:
         array: Les labels prédits pour les nouvelles données
     """
+    if isinstance(model, ClusterModel):
+        X_new = model.transform(X_new)
+
     # Vérifier que X_new est bien formaté
     if isinstance(X_new, pd.DataFrame):
         X_new = X_new.values
     X_new = np.array(X_new) if not isinstance(X_new, np.ndarray) else X_new
+
+    # Stratégie d'affectation construite à l'entraînement (voir ASSIGNMENT_STRATEGIES) ;
+    # les modèles entraînés avant son introduction passent par les méthodes ci-dessous
+    if isinstance(model, ClusterModel):
+        if model.assigner is not None:
+            return model.assigner.predict(X_new)
+        model = model.estimator
     
     # Si le modèle a une méthode predict, l'utiliser directement
     if hasattr(model, 'predict'):
@@ -262,17 +570,17 @@ def predict_cluster(model, X_new, X_scaled=None, labels=None):
         except Exception as e:
             print(f"Erreur lors de l'utilisation de model.predict(): {str(e)}")
     
+    if params is not None:
+        inputs = prediction_inputs(params)
+        X_scaled = inputs.get('X_scaled')
+        labels = inputs.get('labels')
+        centroid_labels = inputs.get('centroid_labels')
+        centroids = inputs.get('centroids')
+
     # Si le modèle a des labels_ (attribut), les utiliser pour la prédiction
     if hasattr(model, 'labels_') and labels is None:
         labels = model.labels_
     
-    # Si le modèle a une méthode fit_predict, l'utiliser
-    if hasattr(model, 'fit_predict'):
-        try:
-            return model.fit_predict(X_new)
-        except Exception as e:
-            print(f"Erreur lors de l'utilisation de model.fit_predict(): {str(e)}")
-    
     # Pour DBSCAN, OPTICS, HDBSCAN qui n'ont pas de méthode predict
     # On peut assigner les points aux clusters existants en fonction de la distance
     from sklearn.cluster import HDBSCAN as SklearnHDBSCAN
@@ -285,55 +593,25 @@ def predict_cluster(model, X_new, X_scaled=None, labels=None):
         except Exception as e:
             print(f"Erreur lors de la prédiction pour HDBSCAN: {str(e)}")
 
+    # Centroïdes absents (anciens projets) : les calculer depuis les données d'entraînement
+    if centroids is None and X_scaled is not None and labels is not None:
+        centroid_labels, centroids = cluster_centroids(X_scaled, labels)
+
     # Fallback pour DBSCAN, OPTICS (sans méthode predict)
-    if isinstance(model, (DBSCAN, OPTICS)) and X_scaled is not None and labels is not None:
+    if isinstance(model, (DBSCAN, OPTICS)) and centroids is not None:
         try:
             eps = getattr(model, 'eps', 0.5)  # Valeur par défaut
+            if eps is None:
+                eps = getattr(model, 'max_eps', np.inf)
             metric = getattr(model, 'metric', 'euclidean')
-            from sklearn.metrics import pairwise_distances
-
-            unique_labels = np.unique(labels)
-            cluster_centers = {
-                label: np.mean(X_scaled[labels == label], axis=0)
-                for label in unique_labels if label != -1
-            }
-
-            predictions = np.full(X_new.shape[0], -1)
-            for i, point in enumerate(X_new):
-                min_dist = float('inf')
-                closest_label = -1
-                for label, center in cluster_centers.items():
-                    dist = pairwise_distances([point], [center], metric=metric)[0][0]
-                    if dist < min_dist:
-                        min_dist = dist
-                        closest_label = label
-                if min_dist <= eps:
-                    predictions[i] = closest_label
-            return predictions
+            return assign_nearest_centroid(X_new, centroid_labels, centroids, metric=metric, max_distance=eps)
         except Exception as e:
             print(f"Erreur lors de la prédiction pour DBSCAN/OPTICS: {str(e)}")
 
-    # Méthode générique pour tous les autres algorithmes si X_scaled et labels sont disponibles
-    if X_scaled is not None and labels is not None:
+    # Méthode générique pour tous les autres algorithmes si les centroïdes sont disponibles
+    if centroids is not None:
         try:
-            from sklearn.metrics import pairwise_distances
-            unique_labels = np.unique(labels)
-            cluster_centers = {
-                label: np.mean(X_scaled[labels == label], axis=0)
-                for label in unique_labels if label != -1
-            }
-            
-            predictions = np.full(X_new.shape[0], -1)
-            for i, point in enumerate(X_new):
-                min_dist = float('inf')
-                closest_label = -1
-                for label, center in cluster_centers.items():
-                    dist = pairwise_distances([point], [center], metric='euclidean')[0][0]
-                    if dist < min_dist:
-                        min_dist = dist
-                        closest_label = label
-                predictions[i] = closest_label
-            return predictions
+            return assign_nearest_centroid(X_new, centroid_labels, centroids)
         except Exception as e:
             print(f"Erreur lors de la prédiction générique: {str(e)}")
 
@@ -0,0 +1,224 @@
+import io
+from datetime import datetime
+import numpy as np
+import matplotlib
+matplotlib.use("Agg")  # Utiliser le backend non interactif (processus du pool sans affichage)
+import matplotlib.pyplot as plt
+import seaborn as sns
+from bson.binary import Binary
+from pymongo import ASCENDING
+import dataset_store
+from incremental import RowReservoir
+
+# Nombre de lignes tirées par dataset pour les graphiques (le coût du rendu ne dépend pas de la taille du dataset)
+VISUALIZATION_SAMPLE_ROWS = 5000
+# Taille des blocs lus pour tirer l'échantillon
+VISUALIZATION_CHUNK_ROWS = 100000
+# Champs du projet lus par le job de rendu
+VISUALIZATION_FIELDS = ["user_id", "project_name", "dataset_file_id", "parquet_file_id", "preprocessing_visualizations"]
+
+
+def visualization_specs(plan, pipeline, original_df, df):
+    """
+    Décrit les graphiques avant/après des étapes d'un prétraitement, sans les dessiner.
+
+    Seules les colonnes présentes avant et après le prétraitement sont
+    retenues (au plus 2 ou 3 par graphique, comme avant). Pour l'ACP, les
+    ratios de variance expliquée sont copiés depuis le pipeline ajusté.
+
+    Returns:
+        list: [{"step", "columns", "explained_variance_ratio" (ACP)}] dans l'ordre du plan
+    """
+    specs = []
+    for operation in plan:
+        step = operation["step"]
+        columns = [
+            column for column in operation["columns"]
+            if column in df.columns and column in original_df.columns
+        ]
+        if step in ["normalization", "standardization", "transformation"] and columns:
+            specs.append({"step": step, "columns": columns[:2]})
+        elif step == "outliers" and columns:
+            specs.append({"step": step, "columns": columns[:3]})
+        elif step == "feature_selection" and operation["method"] == "pca":
+            pca = pipeline.named_steps["feature_selection"].selector_
+            if pca is not None:
+                specs.append({
+                    "step": step,
+                    "columns": [],
+                    "explained_variance_ratio": [float(ratio) for ratio in pca.explained_variance_ratio_],
+                })
+    return specs
+
+
+def sample_dataset(fs, source, columns, rows=VISUALIZATION_SAMPLE_ROWS):
+    """
+    Tire un échantillon de taille fixe des colonnes d'un dataset, bloc par bloc.
+
+    Args:
+        fs: L'instance GridFS
+        source: {"dataset_file_id", "parquet_file_id"} du dataset
+        columns: Les colonnes à lire
+
+    Returns:
+        DataFrame: Au plus `rows` lignes tirées uniformément
+    """
+    parquet_file_id = source.get("parquet_file_id")
+    if parquet_file_id is not None:
+        chunks = dataset_store.iter_chunks(fs.get(parquet_file_id), "parquet", columns, VISUALIZATION_CHUNK_ROWS)
+    else:
+        chunks = dataset_store.iter_chunks(fs.get(source["dataset_file_id"]), "csv", columns, VISUALIZATION_CHUNK_ROWS)
+    reservoir = RowReservoir(max_rows=rows)
+    for chunk in chunks:
+        reservoir.add(chunk)
+    return reservoir.frame
+
+
+def render_step(spec, before, after):
+    """
+    Dessine le graphique avant/après d'une étape de prétraitement.
+
+    Args:
+        spec: La description du graphique (voir visualization_specs)
+        before: L'échantillon du dataset avant le prétraitement
+        after: L'échantillon du dataset prétraité
+
+    Returns:
+        bytes: L'image PNG
+    """
+    step = spec["step"]
+    columns = spec["columns"]
+    if step in ["normalization", "standardization"]:
+        title, suffix = ("Normalization", "normalisé") if step == "normalization" else ("standardization", "standarized")
+        plt.figure(figsize=(14, 6))
+        plt.subplot(1, 2, 1)
+        plt.title(f"Before {title}")
+        for col in columns:
+            sns.kdeplot(before[col], label=col)
+        plt.legend()
+        plt.subplot(1, 2, 2)
+        plt.title(f"After {title}")
+        for col in columns:
+            sns.kdeplot(after[col], label=f"{col} {suffix}")
+        plt.legend()
+        plt.tight_layout(pad=2.0)  # Augmenter l'espace entre les subplots
+    elif step == "outliers":
+        plt.figure(figsize=(14, 6))
+        plt.subplot(1, 2, 1)
+        plt.title("Before outliers treatement")
+        sns.boxplot(data=before[columns])
+        plt.subplot(1, 2, 2)
+        plt.title("After outliers treatement")
+        sns.boxplot(data=after[columns])
+        plt.tight_layout()
+    elif step == "feature_selection":
+        ratios = spec["explained_variance_ratio"]
+        plt.figure(figsize=(12, 6))
+        plt.bar(range(1, len(ratios) + 1), ratios, alpha=0.8)
+        plt.step(
+            range(1, len(ratios) + 1),
+            np.cumsum(ratios),
+            where="mid",
+            label="Variance expliquée cumulée",
+        )
+        plt.xlabel("Composantes principales")
+        plt.ylabel("Ratio de variance expliquée")
+        plt.title("Variance expliquée par composante principale")
+        plt.legend()
+        plt.tight_layout()
+    elif step == "transformation":
+        plt.figure(figsize=(16, 6))
+        for i, col in enumerate(columns):
+            plt.subplot(1, 2 * len(columns), 2 * i + 1)
+            plt.title(f"Before transformation - {col}")
+            sns.histplot(before[col], kde=True)
+            plt.subplot(1, 2 * len(columns), 2 * i + 2)
+            plt.title(f"After transformation - {col}")
+            sns.histplot(after[col], kde=True)
+        plt.tight_layout()
+    else:
+        raise ValueError(f"Pas de graphique pour l'étape {step}")
+    buf = io.BytesIO()
+    plt.savefig(buf, format="png")
+    plt.close()
+    return buf.getvalue()
+
+
+class VisualizationStore:
+    """
+    Graphiques de prétraitement rendus en arrière-plan et mis en cache dans MongoDB.
+
+    Un graphique est identifié par (dataset_file_id, step, columns), où
+    dataset_file_id est le dataset prétraité : tant que le dataset ne
+    change pas, un graphique n'est dessiné qu'une fois. Le rendu se fait
+    dans un job (voir jobs.run_job) sur un échantillon de
+    VISUALIZATION_SAMPLE_ROWS lignes de chaque dataset.
+
+    Args:
+        collection: La collection MongoDB des graphiques
+        fs: L'instance GridFS
+    """
+
+    def __init__(self, collection, fs):
+        self.collection = collection
+        self.fs = fs
+
+    def ensure_indexes(self):
+        self.collection.create_index(
+            [("dataset_file_id", ASCENDING), ("step", ASCENDING)], name="dataset_file_id_step"
+        )
+
+    @staticmethod
+    def key(dataset_file_id, spec):
+        return {"dataset_file_id": dataset_file_id, "step": spec["step"], "columns": spec["columns"]}
+
+    def get(self, dataset_file_id, spec):
+        """Retourne l'image PNG d'un graphique déjà rendu, ou None."""
+        doc = self.collection.find_one(self.key(dataset_file_id, spec), {"image": 1})
+        return bytes(doc["image"]) if doc is not None else None
+
+    def render_project(self, project, progress):
+        """
+        Rend les graphiques du dernier prétraitement d'un projet qui ne sont pas encore en cache.
+
+        Args:
+            project: Le document du projet (voir VISUALIZATION_FIELDS)
+            progress: Fonction progress(stage, percent) du job
+
+        Returns:
+            dict: {"rendered": [étapes dessinées]}
+        """
+        visualizations = project.get("preprocessing_visualizations") or {}
+        dataset_file_id = project["dataset_file_id"]
+        specs = [
+            spec for spec in visualizations.get("specs", [])
+            if self.collection.count_documents(self.key(dataset_file_id, spec), limit=1) == 0
+        ]
+        if not specs:
+            progress("done", 100)
+            return {"rendered": []}
+
+        # Un seul échantillon par dataset, limité aux colonnes des graphiques
+        columns = list(dict.fromkeys(column for spec in specs for column in spec["columns"]))
+        before = after = None
+        if columns:
+            progress("sampling", 5)
+            before = sample_dataset(self.fs, visualizations["source"], columns)
+            after = sample_dataset(self.fs, project, columns)
+
+        rendered = []
+        for index, spec in enumerate(specs):
+            progress("rendering", 10 + int(85 * index / len(specs)))
+            image = render_step(spec, before, after)
+            self.collection.replace_one(
+                self.key(dataset_file_id, spec),
+                {**self.key(dataset_file_id, spec), "image": Binary(image), "created_at": datetime.utcnow()},
+                upsert=True,
+            )
+            rendered.append(spec["step"])
+        progress("done", 100)
+        return {"rendered": rendered}
+
+    def delete_dataset(self, dataset_file_id):
+        """Supprime les graphiques d'un dataset (nouveau prétraitement ou suppression du projet)."""
+        self.collection.delete_many({"dataset_file_id": dataset_file_id})
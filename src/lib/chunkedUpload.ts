@@ -0,0 +1,118 @@
+const API_URL = "http://localhost:5000";
+
+// Au-delà de cette taille, le fichier est envoyé par morceaux (limite d'une requête /project : 16 MB)
+export const CHUNKED_UPLOAD_THRESHOLD = 16 * 1024 * 1024;
+
+interface UploadState {
+  upload_id: string;
+  filename: string;
+  size: number;
+  chunk_size: number;
+  received: number;
+  status: string;
+}
+
+const toHex = (buffer: ArrayBuffer) =>
+  Array.from(new Uint8Array(buffer))
+    .map((byte) => byte.toString(16).padStart(2, "0"))
+    .join("");
+
+const sha256 = async (data: ArrayBuffer) => toHex(await crypto.subtle.digest("SHA-256", data));
+
+const hexToBytes = (hex: string) =>
+  new Uint8Array(hex.match(/../g)!.map((byte) => parseInt(byte, 16)));
+
+// Clé de reprise : même fichier (nom, taille, date de modification) => même upload
+const resumeKey = (file: File) => `upload:${file.name}:${file.size}:${file.lastModified}`;
+
+async function request<T>(path: string, init: RequestInit = {}): Promise<T> {
+  const response = await fetch(`${API_URL}${path}`, { credentials: "include", ...init });
+  const data = await response.json();
+  if (!response.ok || !data.success) {
+    const error = new Error(data.error || `HTTP error! status: ${response.status}`) as Error & {
+      upload?: UploadState;
+    };
+    error.upload = data.upload;
+    throw error;
+  }
+  return data;
+}
+
+async function resumeOrInit(file: File): Promise<UploadState> {
+  const savedId = localStorage.getItem(resumeKey(file));
+  if (savedId) {
+    try {
+      const { upload } = await request<{ upload: UploadState }>(`/upload/${savedId}`);
+      return upload;
+    } catch {
+      localStorage.removeItem(resumeKey(file));
+    }
+  }
+  const { upload } = await request<{ upload: UploadState }>("/upload/init", {
+    method: "POST",
+    headers: { "Content-Type": "application/json" },
+    body: JSON.stringify({ filename: file.name, size: file.size, content_type: file.type }),
+  });
+  localStorage.setItem(resumeKey(file), upload.upload_id);
+  return upload;
+}
+
+/**
+ * Envoie un fichier par morceaux vers GridFS et retourne l'upload_id à passer à /project.
+ *
+ * Chaque morceau est envoyé avec son SHA-256 ; après une coupure, l'envoi
+ * reprend au nombre d'octets déjà reçus par le serveur. Le checksum final
+ * est le SHA-256 de la concaténation des SHA-256 des morceaux.
+ */
+export async function uploadInChunks(
+  file: File,
+  onProgress?: (received: number, size: number) => void,
+  maxRetries = 3,
+): Promise<string> {
+  let upload = await resumeOrInit(file);
+  const { chunk_size: chunkSize } = upload;
+  const checksums: string[] = [];
+
+  // Les morceaux déjà reçus sont relus localement pour le checksum final
+  for (let offset = 0; offset < upload.received; offset += chunkSize) {
+    checksums.push(await sha256(await file.slice(offset, offset + chunkSize).arrayBuffer()));
+  }
+
+  let retries = 0;
+  while (upload.received < upload.size) {
+    const offset = upload.received;
+    const chunk = await file.slice(offset, offset + chunkSize).arrayBuffer();
+    const checksum = await sha256(chunk);
+    try {
+      const { received } = await request<{ received: number }>(
+        `/upload/${upload.upload_id}/chunk?offset=${offset}`,
+        {
+          method: "PUT",
+          headers: { "Content-Type": "application/octet-stream", "X-Chunk-SHA256": checksum },
+          body: chunk,
+        },
+      );
+      checksums[offset / chunkSize] = checksum;
+      upload = { ...upload, received };
+      retries = 0;
+      onProgress?.(received, upload.size);
+    } catch (error) {
+      retries += 1;
+      if (retries > maxRetries) throw error;
+      // Le serveur indique où reprendre ; sinon on redemande l'état de l'upload
+      const serverState = (error as { upload?: UploadState }).upload;
+      upload = serverState ?? (await request<{ upload: UploadState }>(`/upload/${upload.upload_id}`)).upload;
+      checksums.length = Math.ceil(upload.received / chunkSize);
+    }
+  }
+
+  const combined = new Uint8Array(checksums.length * 32);
+  checksums.forEach((checksum, index) => combined.set(hexToBytes(checksum), index * 32));
+  await request(`/upload/${upload.upload_id}/finalize`, {
+    method: "POST",
+    headers: { "Content-Type": "application/json" },
+    body: JSON.stringify({ checksum: toHex(await crypto.subtle.digest("SHA-256", combined)) }),
+  });
+  localStorage.removeItem(resumeKey(file));
+  return upload.upload_id;
+}
@@ -20,8 +20,25 @@ interface Metrics {
   calinski_harabasz?: number;
   davies_bouldin?: number;
   n_clusters?: number;
+  // Supervised k-fold cross-validation (mean and std of each metric)
+  cross_validation?: {
+    folds: number;
+    [metric: string]: number | { mean: number; std: number; values: number[] };
+  };
 }
 
+// "mean ± std (k folds)" for a metric, when the model was cross-validated
+const crossValidationSummary = (metrics: Metrics, metric: string) => {
+  const cv = metrics.cross_validation;
+  const value = cv?.[metric];
+  if (!cv || !value || typeof value === "number") return null;
+  return (
+    <p className="text-gray-400 text-xs mt-1">
+      {value.mean.toFixed(4)} ± {value.std.toFixed(4)} ({cv.folds}-fold CV)
+    </p>
+  );
+};
+
 const Evaluation = () => {
   const [searchParams] = useSearchParams();
   const navigate = useNavigate();
@@ -73,22 +90,9 @@ const Evaluation = () => {
     }
   };
 
-  const handlePlotResults = async () => {
-    try {
-      const response = await fetch('http://localhost:5000/plot_results', {
-        method: 'POST',
-        credentials: 'include'
-      });
-      
-      if (!response.ok) throw new Error('Failed to generate plot');
-      const data = await response.json();
-      // Handle the plot response - this might redirect to a visualization page
-      if (data.redirect_url) {
-        window.location.href = data.redirect_url;
-      }
-    } catch (err) {
-      console.error('Error generating plot:', err);
-    }
+  const handlePlotResults = () => {
+    // La page de visualisation charge elle-même les données du graphique
+    navigate('/plot_results');
   };
 
   const handleBackToHome = () => {
@@ -192,14 +196,17 @@ const Evaluation = () => {
                       <div className="p-4 bg-white/5 rounded-lg border border-white/10">
                         <p className="text-gray-400 text-sm">Score</p>
                         <p className="text-white font-medium text-xl">{metrics.score?.toFixed(8)}</p>
+                        {crossValidationSummary(metrics, "score")}
                       </div>
                       <div className="p-4 bg-white/5 rounded-lg border border-white/10">
                         <p className="text-gray-400 text-sm">Mean Squared Error (MSE)</p>
                         <p className="text-white font-medium text-xl">{metrics.mse?.toFixed(8)}</p>
+                        {crossValidationSummary(metrics, "mse")}
                       </div>
                       <div className="p-4 bg-white/5 rounded-lg border border-white/10 md:col-span-2">
                         <p className="text-gray-400 text-sm">Mean Absolute Error (MAE)</p>
                         <p className="text-white font-medium text-xl">{metrics.mae?.toFixed(8)}</p>
+                        {crossValidationSummary(metrics, "mae")}
                       </div>
                     </>
                   ) : (
@@ -207,18 +214,22 @@ const Evaluation = () => {
                       <div className="p-4 bg-white/5 rounded-lg border border-white/10">
                         <p className="text-gray-400 text-sm">Accuracy</p>
                         <p className="text-white font-medium text-xl">{metrics.accuracy?.toFixed(8)}</p>
+                        {crossValidationSummary(metrics, "accuracy")}
                       </div>
                       <div className="p-4 bg-white/5 rounded-lg border border-white/10">
                         <p className="text-gray-400 text-sm">Precision</p>
                         <p className="text-white font-medium text-xl">{metrics.precision?.toFixed(8)}</p>
+                        {crossValidationSummary(metrics, "precision")}
                       </div>
                       <div className="p-4 bg-white/5 rounded-lg border border-white/10">
                         <p className="text-gray-400 text-sm">Recall</p>
                         <p className="text-white font-medium text-xl">{metrics.recall?.toFixed(8)}</p>
+                        {crossValidationSummary(metrics, "recall")}
                       </div>
                       <div className="p-4 bg-white/5 rounded-lg border border-white/10">
                         <p className="text-gray-400 text-sm">F1 Score</p>
                         <p className="text-white font-medium text-xl">{metrics.f1_score?.toFixed(8)}</p>
+                        {crossValidationSummary(metrics, "f1_score")}
                       </div>
                     </>
                   )
@@ -10,7 +10,8 @@ import Layout from "@/components/Layout";
 
 interface FeatureStats {
   mean: number;
-  std: number;
+  // null pour une colonne d'une seule valeur (écart-type non défini)
+  std: number | null;
   min: number;
   max: number;
 }
@@ -96,6 +97,8 @@ const FeatureSelection: React.FC = () => {
 
       if (!response.ok) {throw new Error('Failed to submit features');}
       else{
+        // Nouvelle sélection : la page des résultats soumet un nouvel entraînement
+        sessionStorage.removeItem('training_job_id');
         navigate("/results");
       }
       
@@ -151,7 +154,7 @@ const FeatureSelection: React.FC = () => {
                           {stats[feature] ? (
                             <>
                               <TableCell className="text-gray-300">{stats[feature].mean.toFixed(4)}</TableCell>
-                              <TableCell className="text-gray-300">{stats[feature].std.toFixed(4)}</TableCell>
+                              <TableCell className="text-gray-300">{stats[feature].std?.toFixed(4) ?? '-'}</TableCell>
                               <TableCell className="text-gray-300">{stats[feature].min.toFixed(4)}</TableCell>
                               <TableCell className="text-gray-300">{stats[feature].max.toFixed(4)}</TableCell>
                             </>
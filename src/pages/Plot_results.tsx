@@ -8,18 +8,42 @@ import Layout from '@/components/Layout';
 import type { Layout as PlotlyLayout } from 'plotly.js';
 
 
-interface PlotData {
+interface EncodedColumn {
+  dtype: 'int32' | 'float32';
+  // Valeurs petit-boutistes encodées en base64
+  data: string;
+}
+
+interface PlotPayload {
   type: 'regression' | 'classification' | 'clustering';
   title: string;
   xlabel: string;
   ylabel: string;
-  y_test?: number[];
-  predictions?: number[];
-  x_pca_0?: number[];
-  x_pca_1?: number[];
-  labels?: number[];
+  classes?: string[] | null;
+  sampling: 'lttb' | 'stratified' | 'none';
+  n_total: number;
+  n_points: number;
+  columns: Record<string, EncodedColumn>;
+}
+
+interface PlotData extends Omit<PlotPayload, 'columns'> {
+  columns: Record<string, Int32Array | Float32Array>;
 }
 
+const decodeColumn = (column: EncodedColumn) => {
+  const binary = atob(column.data);
+  const bytes = new Uint8Array(binary.length);
+  for (let i = 0; i < binary.length; i++) bytes[i] = binary.charCodeAt(i);
+  return column.dtype === 'int32' ? new Int32Array(bytes.buffer) : new Float32Array(bytes.buffer);
+};
+
+const decodePlotData = (payload: PlotPayload): PlotData => ({
+  ...payload,
+  columns: Object.fromEntries(
+    Object.entries(payload.columns).map(([name, column]) => [name, decodeColumn(column)])
+  ),
+});
+
 const Results = () => {
   const navigate = useNavigate();
   const [plotData, setPlotData] = useState<PlotData | null>(null);
@@ -43,12 +67,8 @@ const Results = () => {
       if (!response.ok) throw new Error('Failed to fetch plot data');
 
       const data = await response.json();
-      console.log(data); // Ajouté pour déboguer les données reçues
-      const parsedPlotData = typeof data.plot_data === "string"
-      ? JSON.parse(data.plot_data)
-      : data.plot_data;
-
-    setPlotData(parsedPlotData);
+      if (!data.success) throw new Error(data.error || 'Failed to fetch plot data');
+      setPlotData(decodePlotData(data.plot_data));
     } catch (err) {
       console.error(err);
       setError('Failed to fetch plot data');
@@ -65,24 +85,30 @@ const Results = () => {
     navigate('/home');
   };
 
+  const handleExportPng = () => {
+    // Image statique dessinée côté serveur, seulement à la demande
+    window.open('http://localhost:5000/plot_results?export=png', '_blank');
+  };
+
   const renderPlot = () => {
     if (!plotData) return null;
 
     let traces: any[] = [];
 
+    const columns = plotData.columns;
     if (plotData.type === 'regression') {
       traces = [
         {
-          x: Array.from({ length: plotData.y_test?.length || 0 }, (_, i) => i),
-          y: plotData.y_test,
+          x: columns.index,
+          y: columns.y_test,
           type: 'scatter',
           mode: 'markers',
           name: 'y_test',
           marker: { color: 'blue', size: 8 },
         },
         {
-          x: Array.from({ length: plotData.predictions?.length || 0 }, (_, i) => i),
-          y: plotData.predictions,
+          x: columns.index,
+          y: columns.predictions,
           type: 'scatter',
           mode: 'markers',
           name: 'y_pred',
@@ -90,14 +116,16 @@ const Results = () => {
         },
       ];
     } else {
+      const labels = Array.from(columns.labels);
       traces = [
         {
-          x: plotData.x_pca_0,
-          y: plotData.x_pca_1,
+          x: columns.x_pca_0,
+          y: columns.x_pca_1,
           type: 'scatter',
           mode: 'markers',
+          text: plotData.classes ? labels.map((label) => plotData.classes![label]) : labels,
           marker: {
-            color: plotData.labels,
+            color: labels,
             colorscale: 'Viridis',
             size: 10,
           },
@@ -183,6 +211,14 @@ const Results = () => {
                   <p className="text-gray-400 text-sm">Titre</p>
                   <p className="text-white font-medium">{plotData.title}</p>
                 </div>
+                {plotData.sampling !== 'none' && (
+                  <div className="p-4 bg-white/5 rounded-lg border border-white/10 md:col-span-2">
+                    <p className="text-gray-400 text-sm">Displayed points</p>
+                    <p className="text-white font-medium">
+                      {plotData.n_points} / {plotData.n_total} ({plotData.sampling} sampling)
+                    </p>
+                  </div>
+                )}
               </div>
             </CustomCardBody>
           </CustomCard>
@@ -211,6 +247,10 @@ const Results = () => {
                   <ArrowLeft className="w-5 h-5" />
                   <span>Back to evaluation</span>
                 </CustomButton>
+                <CustomButton onClick={handleExportPng} variant="outline" size="lg">
+                  <BarChart3 className="w-5 h-5" />
+                  <span>Export PNG</span>
+                </CustomButton>
                 <CustomButton onClick={handleBackToHome} variant="outline" size="lg">
                   <ArrowLeft className="w-5 h-5" />
                   <span>Back to homepage</span>
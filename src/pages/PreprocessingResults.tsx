@@ -1,4 +1,4 @@
-import React, { useState, useEffect } from 'react';
+import React, { useState, useEffect, useRef } from 'react';
 import { useSearchParams, useNavigate } from 'react-router-dom';
 import Layout from '@/components/Layout';
 import { CustomCard, CustomCardHeader, CustomCardBody } from '@/components/ui/custom-card';
@@ -25,19 +25,96 @@ interface PreprocessingApiResponse {
     memory_usage: string;
   };
   applied_methods: PreprocessingResult[];
-  visualizations?: Array<{
-    title: string;
-    image_path: string;
-  }>;
+  visualizations?: PreprocessingVisualization[];
   preview_data?: DatasetPreview;
 }
 
+interface PreprocessingVisualization {
+  name: string;
+  columns?: string[];
+  // Graphique rendu en arrière-plan, chargé à l'ouverture
+  url?: string;
+  // Anciens résultats : image PNG en base64
+  data?: string;
+}
+
+// Intervalle entre deux interrogations d'un graphique en cours de rendu
+const VISUALIZATION_POLL_MS = 2000;
+
+const VisualizationPanel = ({ viz }: { viz: PreprocessingVisualization }) => {
+  const [open, setOpen] = useState(false);
+  const [imageUrl, setImageUrl] = useState<string | null>(viz.data ? `data:image/png;base64,${viz.data}` : null);
+  const [error, setError] = useState<string | null>(null);
+  const timer = useRef<number | null>(null);
+
+  useEffect(() => {
+    if (!open || imageUrl || error || !viz.url) return;
+    let cancelled = false;
+    const load = async () => {
+      try {
+        const response = await fetch(`http://localhost:5000${viz.url}`, { credentials: 'include' });
+        if (cancelled) return;
+        if (response.status === 202) {
+          timer.current = window.setTimeout(load, VISUALIZATION_POLL_MS);
+          return;
+        }
+        if (!response.ok) {
+          const data = await response.json().catch(() => ({}));
+          throw new Error(data.error || 'Failed to load plot');
+        }
+        const blob = await response.blob();
+        if (!cancelled) setImageUrl(URL.createObjectURL(blob));
+      } catch (e) {
+        if (!cancelled) setError(e instanceof Error ? e.message : String(e));
+      }
+    };
+    load();
+    return () => {
+      cancelled = true;
+      if (timer.current) window.clearTimeout(timer.current);
+    };
+  }, [open, imageUrl, error, viz.url]);
+
+  useEffect(() => () => {
+    if (imageUrl && imageUrl.startsWith('blob:')) URL.revokeObjectURL(imageUrl);
+  }, [imageUrl]);
+
+  return (
+    <div className="bg-white/5 rounded-lg p-4">
+      <button
+        type="button"
+        onClick={() => setOpen(!open)}
+        className="w-full flex items-center justify-between text-left"
+      >
+        <h3 className="text-lg font-medium text-white">
+          {viz.name}
+          {viz.columns && viz.columns.length > 0 && (
+            <span className="text-sm text-gray-400 ml-2">({viz.columns.join(', ')})</span>
+          )}
+        </h3>
+        <span className="text-sm text-purple-300">{open ? 'Hide' : 'Show'}</span>
+      </button>
+      {open && (
+        <div className="mt-3">
+          {imageUrl ? (
+            <img src={imageUrl} alt={viz.name} className="w-full h-auto rounded-lg" />
+          ) : error ? (
+            <p className="text-red-400 text-sm">{error}</p>
+          ) : (
+            <p className="text-gray-400 text-sm">Rendering plot...</p>
+          )}
+        </div>
+      )}
+    </div>
+  );
+};
+
 const PreprocessingResults = () => {
   const navigate = useNavigate();
   const [loading, setLoading] = useState(true);
   const [results, setResults] = useState<PreprocessingResult[]>([]);
   const [stats, setStats] = useState<PreprocessingApiResponse['stats'] | null>(null);
-  const [visualizations, setVisualizations] = useState<Array<{title: string; image_path: string}>>([]);
+  const [visualizations, setVisualizations] = useState<PreprocessingVisualization[]>([]);
   const [previewData, setPreviewData] = useState<DatasetPreview | null>(null);
 
 
@@ -262,14 +339,7 @@ const PreprocessingResults = () => {
               <CustomCardBody>
                 <div className="grid grid-cols-1 md:grid-cols-2 gap-6">
                   {visualizations.map((viz, index) => (
-                    <div key={index} className="bg-white/5 rounded-lg p-4">
-                      <h3 className="text-lg font-medium text-white mb-3">{viz.title}</h3>
-                      <img 
-                        src={viz.image_path} 
-                        alt={viz.title}
-                        className="w-full h-auto rounded-lg"
-                      />
-                    </div>
+                    <VisualizationPanel key={`${viz.name}-${index}`} viz={viz} />
                   ))}
                 </div>
               </CustomCardBody>
@@ -153,7 +153,7 @@ const ProjectDetails = () => {
 
   const filteredParams = project?.params ? 
     Object.entries(project.params).filter(([key]) => 
-      !['X_scaled', 'X_train', 'X_test', 'X_test_columns', 'y_train', 'y_test'].includes(key)
+      !['X_scaled', 'X_train', 'X_test', 'X_test_columns', 'y_train', 'y_test', 'arrays'].includes(key)
     ) : [];
   if (loading) return <p className="text-white">Chargement...</p>;
   if (error) return <p className="text-red-500">{error}</p>;
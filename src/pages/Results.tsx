@@ -6,58 +6,100 @@ import { CustomButton } from '../components/ui/custom-button';
 import { Table, TableBody, TableCell, TableHead, TableHeader, TableRow } from '../components/ui/table';
 
 
+const API_URL = 'http://localhost:5000';
+const POLL_INTERVAL_MS = 2000;
+
 const Results: React.FC = () => {
   const [modelInfo, setModelInfo] = useState<any>(null);
   const [error, setError] = useState<string>('');
+  const [job, setJob] = useState<any>(null);
   const navigate = useNavigate();
   useEffect(() => {
-    const fetchModelInfo = async () => {
+    let cancelled = false;
+    let timer: ReturnType<typeof setTimeout>;
+
+    const showModelInfo = (data: any) => {
+      // À faire juste après le fetch
+      const parsedPredictions = data.model_info.predictions_values.map((val: any) => {
+        // Si déjà un tableau (ex: [1, 0] ou ['Male', 'Female'])
+        if (Array.isArray(val) && val.length === 2) {
+          return val;
+        }
+
+        // Si chaîne "(1, 0)" ou "('Male', 'Female')"
+        if (typeof val === 'string' && val.startsWith('(') && val.endsWith(')')) {
+          const cleaned = val.slice(1, -1); // Enlève les parenthèses
+          const parts = cleaned.split(/,(.+)/).map(s =>
+            s.trim().replace(/^['"]|['"]$/g, '') // Enlève les quotes
+          );
+          return parts;
+        }
+
+        // Fallback si valeur inattendue
+        return [val, null];
+      });
+      data.model_info.predictions_values = parsedPredictions;
+      setModelInfo(data.model_info);
+    };
+
+    const pollJob = async (jobId: string) => {
       try {
-        const response = await fetch('http://localhost:5000/train_model', {
-          method: 'GET',
-          headers: {
-            'Content-Type': 'application/json',
-          },
-          credentials: 'include'
-        });
-        if (!response.ok) throw new Error('Failed to fetch model info');
+        const response = await fetch(`${API_URL}/jobs/${jobId}`, { credentials: 'include' });
+        if (!response.ok) throw new Error('Failed to fetch training status');
         const data = await response.json();
-        if (data.success && data.model_info) {
-          // À faire juste après le fetch
-          console.log(data.model_info);
-          const parsedPredictions = data.model_info.predictions_values.map((val: any) => {
-            // Si déjà un tableau (ex: [1, 0] ou ['Male', 'Female'])
-            if (Array.isArray(val) && val.length === 2) {
-              return val;
-            }
-          
-            // Si chaîne "(1, 0)" ou "('Male', 'Female')"
-            if (typeof val === 'string' && val.startsWith('(') && val.endsWith(')')) {
-              const cleaned = val.slice(1, -1); // Enlève les parenthèses
-              const parts = cleaned.split(/,(.+)/).map(s =>
-                s.trim().replace(/^['"]|['"]$/g, '') // Enlève les quotes
-              );
-              return parts;
-            }
-          
-            // Fallback si valeur inattendue
-            return [val, null];
-          });
-          data.model_info.predictions_values = parsedPredictions;
-          
-
-          console.log(data.model_info.predictions_values);
-          setModelInfo(data.model_info);
+        if (cancelled) return;
+        setJob(data.job);
+        if (data.job.status === 'queued' || data.job.status === 'running') {
+          timer = setTimeout(() => pollJob(jobId), POLL_INTERVAL_MS);
+          return;
+        }
+        if (data.job.status !== 'succeeded') {
+          setError(data.job.error || `Training ${data.job.status}`);
+          return;
+        }
+        const resultResponse = await fetch(`${API_URL}/jobs/${jobId}/result`, { credentials: 'include' });
+        const result = await resultResponse.json();
+        if (result.success && result.model_info) {
+          showModelInfo(result);
         } else {
-          setError('No model info returned');
+          setError(result.error || 'No model info returned');
         }
       } catch (err: any) {
         setError(err.message || 'Error fetching model info');
       }
     };
-    fetchModelInfo();
+
+    const startTraining = async () => {
+      try {
+        // Le job en cours est repris après un rechargement de la page
+        let jobId = sessionStorage.getItem('training_job_id');
+        if (!jobId) {
+          const response = await fetch(`${API_URL}/train_model/jobs`, {
+            method: 'POST',
+            credentials: 'include'
+          });
+          if (!response.ok) throw new Error('Failed to start training');
+          const data = await response.json();
+          jobId = data.job_id as string;
+          sessionStorage.setItem('training_job_id', jobId);
+        }
+        pollJob(jobId);
+      } catch (err: any) {
+        setError(err.message || 'Error fetching model info');
+      }
+    };
+    startTraining();
+    return () => {
+      cancelled = true;
+      clearTimeout(timer);
+    };
   }, []);
 
+  const cancelTraining = async () => {
+    if (!job) return;
+    await fetch(`${API_URL}/jobs/${job.job_id}/cancel`, { method: 'POST', credentials: 'include' });
+  };
+
   if (!modelInfo) {
     return (
       <Layout>
@@ -67,7 +109,16 @@ const Results: React.FC = () => {
               <h1 className="text-3xl font-bold text-white">Results</h1>
             </CustomCardHeader>
             <CustomCardBody>
-              <p className="text-gray-400 text-center py-8">{error || 'Loading model info...'}</p>
+              <p className="text-gray-400 text-center py-8">
+                {error || (job ? `Training ${job.status}${job.stage ? ` (${job.stage})` : ''}: ${job.progress}%` : 'Loading model info...')}
+              </p>
+              {!error && job && (job.status === 'queued' || job.status === 'running') && (
+                <div className="flex justify-center">
+                  <CustomButton onClick={cancelTraining} variant="secondary">
+                    Annuler l'entraînement
+                  </CustomButton>
+                </div>
+              )}
             </CustomCardBody>
           </CustomCard>
         </div>
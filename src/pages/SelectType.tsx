@@ -19,6 +19,7 @@ const CLASSIFICATION_ALGORITHMS = {
   "AdaBoost Classifier": "AdaBoost Classifier",
   "Bagging Classifier": "Bagging Classifier",
   "Gaussian NB": "Gaussian NB",
+  "SGD Classifier": "SGD Classifier",
   "MLP Classifier": "MLP Classifier",
 };
 
@@ -29,6 +30,7 @@ const REGRESSION_ALGORITHMS = {
   Ridge: "Ridge",
   Lasso: "Lasso",
   "Elastic Net": "Elastic Net",
+  "SGD Regressor": "SGD Regressor",
   "Random Forest Regressor": "Random Forest Regressor",
   "Gradient Boosting Regressor": "Gradient Boosting Regressor",
   "AdaBoost Regressor": "AdaBoost Regressor",
@@ -38,7 +40,7 @@ const REGRESSION_ALGORITHMS = {
 };
 
 const CLUSTERING_ALGORITHMS: { [key: string]: { [key: string]: string } } = {
-  partition: { "KMeans": "K-Means" },
+  partition: { "KMeans": "K-Means", "MiniBatchKMeans": "Mini-Batch K-Means" },
   density: { DBSCAN: "DBSCAN", OPTICS: "OPTICS", HDBSCAN: "HDBSCAN" },
   hierarchical: { Agglomerative: "Agglomerative", BIRCH: "BIRCH" },
   model: { GMM: "GMM" },
@@ -219,6 +221,21 @@ const CLASSIFICATION_MODEL_CONFIGS:any = {
     }
   },
 
+  "SGD Classifier": {
+    module: "sklearn.linear_model",
+    class: "SGDClassifier",
+    parameters: {
+      loss: { type: "select", options: ["hinge", "log_loss", "modified_huber", "squared_hinge", "perceptron"], default: "hinge" },
+      penalty: { type: "select", options: ["l2", "l1", "elasticnet"], default: "l2" },
+      alpha: { type: "float", default: 0.0001 },
+      l1_ratio: { type: "float", default: 0.15 },
+      fit_intercept: { type: "bool", default: true },
+      learning_rate: { type: "select", options: ["optimal", "constant", "invscaling", "adaptive"], default: "optimal" },
+      eta0: { type: "float", default: 0.0 },
+      random_state: { type: "int", default: null, optional: true }
+    }
+  },
+
   "MLP Classifier": {
     module: "sklearn.neural_network",
     class: "MLPClassifier",
@@ -259,6 +276,19 @@ const CLUSTERING_MODEL_CONFIGS:any = {
     }
   },
 
+  "MiniBatchKMeans": {
+    module: "sklearn.cluster",
+    class: "MiniBatchKMeans",
+    parameters: {
+      n_clusters: { type: "int", default: 8, min: 1 },
+      init: { type: "select", options: ["k-means++", "random"], default: "k-means++" },
+      batch_size: { type: "int", default: 1024, min: 1 },
+      max_iter: { type: "int", default: 100, min: 1 },
+      tol: { type: "float", default: 0.0, step: 1e-4 },
+      random_state: { type: "int", default: null, optional: true },
+    }
+  },
+
   "DBSCAN": {
     module: "sklearn.cluster",
     class: "DBSCAN",
@@ -458,6 +488,20 @@ const REGRESSION_MODEL_CONFIGS:any = {
       random_state: { type: "int", default: null, optional: true }
     }
   },
+  "SGD Regressor": {
+    module: "sklearn.linear_model",
+    class: "SGDRegressor",
+    parameters: {
+      loss: { type: "select", options: ["squared_error", "huber", "epsilon_insensitive", "squared_epsilon_insensitive"], default: "squared_error" },
+      penalty: { type: "select", options: ["l2", "l1", "elasticnet"], default: "l2" },
+      alpha: { type: "float", default: 0.0001 },
+      l1_ratio: { type: "float", default: 0.15 },
+      fit_intercept: { type: "bool", default: true },
+      learning_rate: { type: "select", options: ["constant", "optimal", "invscaling", "adaptive"], default: "invscaling" },
+      eta0: { type: "float", default: 0.01 },
+      random_state: { type: "int", default: null, optional: true }
+    }
+  },
   "Random Forest Regressor": {
     module: "sklearn.ensemble",
     class: "RandomForestRegressor",
@@ -595,6 +639,9 @@ const AlgorithmSelection: React.FC = () => {
   const [parameters, setParameters] = useState<{ [key: string]: ParameterConfig }>({});
   const [selectedParams, setSelectedParams] = useState<{ [key: string]: any }>({});
   const [showParams, setShowParams] = useState(false);
+  const [searchStrategy, setSearchStrategy] = useState<string>("none");
+  const [searchIterations, setSearchIterations] = useState<number>(20);
+  const [cvFolds, setCvFolds] = useState<number>(0);
 
   const modelTypes = [
     { value: "classification", label: "Classification" },
@@ -702,7 +749,11 @@ const AlgorithmSelection: React.FC = () => {
     const payload = {
       model_type: modelType,
       algo: algorithm,
-      algorithm_parameters: JSON.stringify({ parameters: selectedParams })
+      algorithm_parameters: JSON.stringify({ parameters: selectedParams }),
+      hyperparameter_search: learningType === 'supervised' && searchStrategy !== "none"
+        ? { strategy: searchStrategy, n_iter: searchIterations }
+        : null,
+      cross_validation: learningType === 'supervised' && cvFolds > 0 ? { folds: cvFolds } : null
     };
     try {
       const response = await fetch("http://localhost:5000/select_type", {
@@ -957,6 +1008,63 @@ const AlgorithmSelection: React.FC = () => {
             </CustomCard>
           )}
 
+          {/* Hyperparameter Search & Cross-Validation */}
+          {learningType === 'supervised' && algorithm && (
+            <CustomCard className="mb-8">
+              <CustomCardHeader>
+                <div className="flex items-center space-x-2">
+                  <Settings className="w-6 h-6 text-purple-400" />
+                  <h2 className="text-2xl font-semibold text-white">Search & Validation</h2>
+                </div>
+                <p className="text-gray-300 mt-2">Search the parameters you did not set above and validate on k folds (optional)</p>
+              </CustomCardHeader>
+              <CustomCardBody>
+                <div className="grid grid-cols-1 md:grid-cols-2 gap-4">
+                  <FormGroup>
+                    <FormLabel htmlFor="search_strategy">Strategy</FormLabel>
+                    <select
+                      id="search_strategy"
+                      value={searchStrategy}
+                      onChange={(e) => setSearchStrategy(e.target.value)}
+                      className="w-full px-4 py-3 bg-white/10 border border-white/20 rounded-lg text-white focus:outline-none focus:ring-2 focus:ring-purple-500 focus:border-transparent transition-all duration-200"
+                    >
+                      <option value="none" className="bg-slate-800">None</option>
+                      <option value="random" className="bg-slate-800">Randomized search</option>
+                      <option value="halving" className="bg-slate-800">Successive halving</option>
+                    </select>
+                  </FormGroup>
+                  {searchStrategy !== "none" && (
+                    <FormGroup>
+                      <FormLabel htmlFor="search_iterations">Configurations to try</FormLabel>
+                      <FormInput
+                        type="number"
+                        id="search_iterations"
+                        min={1}
+                        max={200}
+                        value={searchIterations}
+                        onChange={(e) => setSearchIterations(parseInt(e.target.value, 10) || 1)}
+                      />
+                    </FormGroup>
+                  )}
+                  <FormGroup>
+                    <FormLabel htmlFor="cv_folds">Cross-validation</FormLabel>
+                    <select
+                      id="cv_folds"
+                      value={cvFolds}
+                      onChange={(e) => setCvFolds(parseInt(e.target.value, 10))}
+                      className="w-full px-4 py-3 bg-white/10 border border-white/20 rounded-lg text-white focus:outline-none focus:ring-2 focus:ring-purple-500 focus:border-transparent transition-all duration-200"
+                    >
+                      <option value={0} className="bg-slate-800">None (single 80/20 split)</option>
+                      <option value={3} className="bg-slate-800">3 folds</option>
+                      <option value={5} className="bg-slate-800">5 folds</option>
+                      <option value={10} className="bg-slate-800">10 folds</option>
+                    </select>
+                  </FormGroup>
+                </div>
+              </CustomCardBody>
+            </CustomCard>
+          )}
+
           {/* Submit Button */}
           <div className="flex justify-center">
             <CustomButton
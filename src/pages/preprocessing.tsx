@@ -66,6 +66,7 @@ const Preprocessing = () => {
       parameters: {
         method: 'zscore',
         treatment: 'remove',
+        multivariate: false,
         columns: []
       }
     },
@@ -404,6 +405,18 @@ const Preprocessing = () => {
                                 </SelectContent>
                               </Select>
                             </div>
+                            {method.parameters.method === 'isolation_forest' && (
+                              <div className="flex items-center space-x-2">
+                                <Checkbox
+                                  id="outliers-multivariate"
+                                  checked={method.parameters.multivariate}
+                                  onCheckedChange={(checked) => updateMethodParameter(method.id, 'multivariate', checked === true)}
+                                />
+                                <Label htmlFor="outliers-multivariate" className="text-white">
+                                  One model on all selected columns (multivariate)
+                                </Label>
+                              </div>
+                            )}
                             <div>
                               <Label className="text-white">Columns to process:</Label>
                               <div className="grid grid-cols-2 gap-2 mt-2">
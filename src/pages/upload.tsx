@@ -16,6 +16,10 @@ import {
   FormCheckbox,
 } from "@/components/ui/custom-form";
 import { CustomButton } from "@/components/ui/custom-button";
+import { CHUNKED_UPLOAD_THRESHOLD, uploadInChunks } from "@/lib/chunkedUpload";
+
+// Octets lus au maximum par le serveur pour l'aperçu d'un CSV (dataset_store.PREVIEW_MAX_BYTES)
+const PREVIEW_MAX_BYTES = 4 * 1024 * 1024;
 
 interface DatasetPreview {
   columns: string[];
@@ -151,8 +155,14 @@ const UploadPage: React.FC = () => {
     setIsLoading(true);
     
     // Créer un FormData pour envoyer le fichier
+    // (CSV : seul le début du fichier est envoyé, l'aperçu n'en lit pas plus)
     const formData = new FormData();
-    formData.append("dataset", file);
+    if (file.name.endsWith(".csv") && file.size > PREVIEW_MAX_BYTES) {
+      formData.append("dataset", file.slice(0, PREVIEW_MAX_BYTES), file.name);
+      formData.append("partial", "true");
+    } else {
+      formData.append("dataset", file);
+    }
     
     // Envoyer le fichier au backend pour prévisualisation
     
@@ -353,7 +363,27 @@ const UploadPage: React.FC = () => {
         formData.append(`param_${key}`, value.toString());
       });
     } else if (datasetType === "custom" && selectedFile) {
-      formData.append("dataset", selectedFile);
+      if (selectedFile.size > CHUNKED_UPLOAD_THRESHOLD) {
+        // Gros fichier : envoi reprenable par morceaux, puis référence à l'upload
+        try {
+          const uploadId = await uploadInChunks(selectedFile, (received, size) =>
+            setFlashMessage({
+              type: "warning",
+              message: `Uploading dataset... ${Math.round((received / size) * 100)}%`,
+            }),
+          );
+          formData.append("upload_id", uploadId);
+        } catch (error) {
+          setFlashMessage({
+            type: "error",
+            message: `Upload failed: ${error instanceof Error ? error.message : String(error)}`,
+          });
+          setIsLoading(false);
+          return;
+        }
+      } else {
+        formData.append("dataset", selectedFile);
+      }
     }
 
     // Add preprocessing options